@@ -11,8 +11,7 @@ from alembic import context
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 
 # Import app components
-from app.database import Base
-from app.config import settings
+from app.database import Base, SQLALCHEMY_DATABASE_URL
 from app.models import Todo  # Import để đảm bảo models được load
 
 # this is the Alembic Config object, which provides
@@ -20,7 +19,9 @@ from app.models import Todo  # Import để đảm bảo models được load
 config = context.config
 
 # Override sqlalchemy.url với settings từ app
-config.set_main_option("sqlalchemy.url", settings.DATABASE_URL.replace("+aiosqlite", ""))
+# URL truyền qua config.attributes (test) được ưu tiên hơn DATABASE_URL
+url = config.attributes.get("url", SQLALCHEMY_DATABASE_URL)
+config.set_main_option("sqlalchemy.url", url.replace("%", "%%"))
 
 # Interpret the config file for Python logging.
 # This line sets up loggers basically.
@@ -68,6 +69,14 @@ def run_migrations_online() -> None:
     and associate a connection with the context.
 
     """
+    # Test truyền sẵn kết nối qua config.attributes để chạy migration trên database riêng
+    connection = config.attributes.get("connection")
+    if connection is not None:
+        context.configure(connection=connection, target_metadata=target_metadata)
+        with context.begin_transaction():
+            context.run_migrations()
+        return
+
     connectable = engine_from_config(
         config.get_section(config.config_ini_section, {}),
         prefix="sqlalchemy.",
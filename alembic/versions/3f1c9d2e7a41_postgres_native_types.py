@@ -0,0 +1,53 @@
+"""Use native UUID/ARRAY types and GIN tag index on PostgreSQL
+
+Revision ID: 3f1c9d2e7a41
+Revises: ba800f22605b
+Create Date: 2026-10-19 09:12:31.402118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f1c9d2e7a41'
+down_revision: Union[str, None] = 'ba800f22605b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # SQLite giữ nguyên schema (String + JSON)
+    if op.get_bind().dialect.name != "postgresql":
+        return
+
+    op.execute("ALTER TABLE todos ALTER COLUMN id TYPE UUID USING id::uuid")
+
+    # PostgreSQL không cho phép subquery trong USING nên chuyển tags qua cột tạm
+    op.add_column('todos', sa.Column('tags_array', sa.ARRAY(sa.Text()), nullable=True))
+    op.execute(
+        "UPDATE todos SET tags_array = ARRAY("
+        "SELECT jsonb_array_elements_text(tags::jsonb)) WHERE tags IS NOT NULL"
+    )
+    op.drop_column('todos', 'tags')
+    op.alter_column('todos', 'tags_array', new_column_name='tags')
+
+    op.create_index('ix_todos_tags_gin', 'todos', ['tags'], unique=False, postgresql_using='gin')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != "postgresql":
+        return
+
+    op.drop_index('ix_todos_tags_gin', table_name='todos')
+
+    op.add_column('todos', sa.Column('tags_json', sa.JSON(), nullable=True))
+    op.execute("UPDATE todos SET tags_json = to_json(tags) WHERE tags IS NOT NULL")
+    op.drop_column('todos', 'tags')
+    op.alter_column('todos', 'tags_json', new_column_name='tags')
+
+    op.execute("ALTER TABLE todos ALTER COLUMN id TYPE VARCHAR USING id::text")
@@ -0,0 +1,92 @@
+"""Create todos archive tables
+
+Revision ID: 5d9b7e2f4a18
+Revises: e81f3a6c2d57
+Create Date: 2026-10-19 17:20:41.388452
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d9b7e2f4a18'
+down_revision: Union[str, None] = 'e81f3a6c2d57'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+STATUS_NAMES = ('PENDING', 'IN_PROGRESS', 'COMPLETED')
+PRIORITY_NAMES = ('LOW', 'MEDIUM', 'HIGH')
+
+
+def _column_types(compact: bool, is_postgresql: bool) -> dict:
+    """Kiểu cột id/status/priority/tags của bảng todos tại revision này"""
+    if is_postgresql:
+        id_type = postgresql.UUID(as_uuid=False)
+        tags_type = postgresql.ARRAY(sa.Text())
+    else:
+        id_type = sa.LargeBinary(16) if compact else sa.String(36)
+        tags_type = sa.JSON()
+    if compact:
+        status_type = priority_type = sa.SmallInteger()
+    elif is_postgresql:
+        # Enum type đã được tạo cùng bảng todos, không tạo lại
+        status_type = postgresql.ENUM(*STATUS_NAMES, name='todostatus', create_type=False)
+        priority_type = postgresql.ENUM(*PRIORITY_NAMES, name='todopriority', create_type=False)
+    else:
+        status_type = sa.Enum(*STATUS_NAMES, name='todostatus')
+        priority_type = sa.Enum(*PRIORITY_NAMES, name='todopriority')
+    return {'id': id_type, 'status': status_type, 'priority': priority_type, 'tags': tags_type}
+
+
+def _is_compact() -> bool:
+    """Bảng todos đang dùng layout compact không (status lưu dạng số nguyên)"""
+    if op.get_context().as_sql:
+        # Sinh SQL offline không đọc được schema; revision 8b2e4f6a1c93 chỉ chuyển sang
+        # layout compact khi chạy online
+        return False
+    status = next(column for column in sa.inspect(op.get_bind()).get_columns('todos') if column['name'] == 'status')
+    return isinstance(status['type'], sa.Integer)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Cùng layout lưu trữ với bảng todos (đọc từ database, không theo cấu hình hiện tại)
+    column_types = _column_types(_is_compact(), op.get_context().dialect.name == 'postgresql')
+    op.create_table('todos_archive',
+    sa.Column('id', column_types['id'], nullable=False),
+    sa.Column('owner_id', sa.String(length=64), nullable=False),
+    sa.Column('title', sa.String(length=200), nullable=False),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('status', column_types['status'], nullable=False),
+    sa.Column('priority', column_types['priority'], nullable=False),
+    sa.Column('due_date', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('tags', column_types['tags'], nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('archived_at', sa.DateTime(timezone=True), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_todos_archive_owner_created_at', 'todos_archive', ['owner_id', 'created_at'], unique=False)
+    op.create_index('ix_todos_archive_owner_priority', 'todos_archive', ['owner_id', 'priority', 'created_at'], unique=False)
+    op.create_index('ix_todos_archive_owner_due_date', 'todos_archive', ['owner_id', 'due_date'], unique=False)
+    op.create_table('todos_archive_stats',
+    sa.Column('owner_id', sa.String(length=64), nullable=False),
+    sa.Column('kind', sa.String(length=16), nullable=False),
+    sa.Column('value', sa.Text(), nullable=False),
+    sa.Column('count', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('owner_id', 'kind', 'value')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('todos_archive_stats')
+    op.drop_index('ix_todos_archive_owner_due_date', table_name='todos_archive')
+    op.drop_index('ix_todos_archive_owner_priority', table_name='todos_archive')
+    op.drop_index('ix_todos_archive_owner_created_at', table_name='todos_archive')
+    op.drop_table('todos_archive')
@@ -0,0 +1,128 @@
+"""Drop duplicate id index and convert to compact storage layout
+
+Revision ID: 8b2e4f6a1c93
+Revises: 3f1c9d2e7a41
+Create Date: 2026-10-19 10:41:07.218530
+
+"""
+from typing import Sequence, Union
+import uuid
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from app.config import settings
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8b2e4f6a1c93'
+down_revision: Union[str, None] = '3f1c9d2e7a41'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COPY_BATCH_SIZE = 5000
+
+# Kiểu và mã số cố định tại revision này (không dùng model của app: model thay đổi theo thời gian)
+STATUS_CODES = {'PENDING': 0, 'IN_PROGRESS': 1, 'COMPLETED': 2}
+PRIORITY_CODES = {'LOW': 0, 'MEDIUM': 1, 'HIGH': 2}
+
+
+def _todos_table(name: str, compact: bool, is_postgresql: bool) -> sa.Table:
+    """Định nghĩa bảng todos theo layout lưu trữ"""
+    if is_postgresql:
+        id_type = postgresql.UUID(as_uuid=False)
+        tags_type = postgresql.ARRAY(sa.Text())
+    else:
+        id_type = sa.LargeBinary(16) if compact else sa.String(36)
+        tags_type = sa.JSON()
+    if compact:
+        status_type = priority_type = sa.SmallInteger()
+    else:
+        status_type = sa.Enum(*STATUS_CODES, name='todostatus')
+        priority_type = sa.Enum(*PRIORITY_CODES, name='todopriority')
+    return sa.Table(
+        name,
+        sa.MetaData(),
+        sa.Column('id', id_type, nullable=False),
+        sa.Column('title', sa.String(length=200), nullable=False),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.Column('status', status_type, nullable=False),
+        sa.Column('priority', priority_type, nullable=False),
+        sa.Column('due_date', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('tags', tags_type, nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+    )
+
+
+def _convert_row(row: dict, compact: bool, is_postgresql: bool) -> dict:
+    """Chuyển giá trị id/status/priority của một dòng sang layout `compact`"""
+    if compact:
+        row['status'] = STATUS_CODES[row['status']]
+        row['priority'] = PRIORITY_CODES[row['priority']]
+    else:
+        row['status'] = {code: name for name, code in STATUS_CODES.items()}[row['status']]
+        row['priority'] = {code: name for name, code in PRIORITY_CODES.items()}[row['priority']]
+    if not is_postgresql:
+        # SQLite: chuỗi 36 ký tự <-> 16 byte; PostgreSQL giữ kiểu UUID native ở cả hai layout
+        row['id'] = uuid.UUID(row['id']).bytes if compact else str(uuid.UUID(bytes=row['id']))
+    return row
+
+
+def _is_compact(bind) -> bool:
+    """Bảng todos hiện có đang dùng layout compact không (status lưu dạng số nguyên)"""
+    status = next(column for column in sa.inspect(bind).get_columns('todos') if column['name'] == 'status')
+    return isinstance(status['type'], sa.Integer)
+
+
+def _rebuild_todos(compact: bool) -> None:
+    """Tạo lại bảng todos theo layout mới và chuyển đổi dữ liệu theo từng batch"""
+    bind = op.get_bind()
+    is_postgresql = bind.dialect.name == 'postgresql'
+    source = _todos_table('todos', not compact, is_postgresql)
+    target = _todos_table('todos_new', compact, is_postgresql)
+    target.create(bind)
+
+    # yield_per đặt trên câu SELECT: Connection.execution_options() đổi luôn kết nối,
+    # khi đó cả INSERT cũng chạy qua server-side cursor (lỗi trên PostgreSQL)
+    result = bind.execute(sa.select(source).execution_options(yield_per=COPY_BATCH_SIZE))
+    for rows in result.partitions():
+        bind.execute(target.insert(), [_convert_row(row._asdict(), compact, is_postgresql) for row in rows])
+
+    for index_name in ('ix_todos_title', 'ix_todos_status', 'ix_todos_priority', 'ix_todos_due_date'):
+        op.drop_index(index_name, table_name='todos')
+    if is_postgresql:
+        op.drop_index('ix_todos_tags_gin', table_name='todos')
+    op.drop_table('todos')
+    if is_postgresql and compact:
+        op.execute('DROP TYPE IF EXISTS todostatus')
+        op.execute('DROP TYPE IF EXISTS todopriority')
+    op.rename_table('todos_new', 'todos')
+    if is_postgresql:
+        op.execute('ALTER TABLE todos RENAME CONSTRAINT todos_new_pkey TO todos_pkey')
+
+    op.create_index(op.f('ix_todos_due_date'), 'todos', ['due_date'], unique=False)
+    op.create_index(op.f('ix_todos_priority'), 'todos', ['priority'], unique=False)
+    op.create_index(op.f('ix_todos_status'), 'todos', ['status'], unique=False)
+    op.create_index(op.f('ix_todos_title'), 'todos', ['title'], unique=False)
+    if is_postgresql:
+        op.create_index('ix_todos_tags_gin', 'todos', ['tags'], unique=False, postgresql_using='gin')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Khóa chính đã có index, ix_todos_id là bản trùng lặp
+    op.drop_index(op.f('ix_todos_id'), table_name='todos')
+    # Layout được chọn một lần tại đây; các revision sau và app đọc layout từ database
+    if settings.COMPACT_STORAGE:
+        _rebuild_todos(compact=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Chuyển ngược theo layout thực tế của database, không theo cấu hình hiện tại
+    if _is_compact(op.get_bind()):
+        _rebuild_todos(compact=False)
+    op.create_index(op.f('ix_todos_id'), 'todos', ['id'], unique=False)
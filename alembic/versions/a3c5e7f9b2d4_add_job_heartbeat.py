@@ -0,0 +1,31 @@
+"""Add heartbeat to jobs
+
+Revision ID: a3c5e7f9b2d4
+Revises: 9e4c1b7d3f62
+Create Date: 2026-10-19 20:05:48.117342
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3c5e7f9b2d4'
+down_revision: Union[str, None] = '9e4c1b7d3f62'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('jobs', sa.Column('heartbeat_at', sa.DateTime(timezone=True), nullable=True))
+    # Job đang chạy khi nâng cấp: lấy mốc từ started_at để vẫn được phát hiện nếu bị gián đoạn
+    op.execute("UPDATE jobs SET heartbeat_at = started_at WHERE status = 'RUNNING'")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('jobs') as batch_op:
+        batch_op.drop_column('heartbeat_at')
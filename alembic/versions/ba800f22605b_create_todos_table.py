@@ -50,4 +50,7 @@ def downgrade() -> None:
     op.drop_index(op.f('ix_todos_id'), table_name='todos')
     op.drop_index(op.f('ix_todos_due_date'), table_name='todos')
     op.drop_table('todos')
+    # PostgreSQL: enum type không tự xóa cùng bảng
+    sa.Enum(name='todopriority').drop(op.get_bind(), checkfirst=True)
+    sa.Enum(name='todostatus').drop(op.get_bind(), checkfirst=True)
     # ### end Alembic commands ###
@@ -0,0 +1,84 @@
+"""Partition todos and idempotency keys by owner
+
+Revision ID: e81f3a6c2d57
+Revises: c47d1e9b5f28
+Create Date: 2026-10-19 16:02:33.915207
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.config import settings
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e81f3a6c2d57'
+down_revision: Union[str, None] = 'c47d1e9b5f28'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SINGLE_COLUMN_INDEXES = {
+    'ix_todos_title': ['title'],
+    'ix_todos_status': ['status'],
+    'ix_todos_priority': ['priority'],
+    'ix_todos_due_date': ['due_date'],
+}
+OWNER_INDEXES = {
+    'ix_todos_owner_created_at': ['owner_id', 'created_at'],
+    'ix_todos_owner_status': ['owner_id', 'status', 'created_at'],
+    'ix_todos_owner_priority': ['owner_id', 'priority', 'created_at'],
+    'ix_todos_owner_due_date': ['owner_id', 'due_date'],
+    'ix_todos_owner_title': ['owner_id', 'title'],
+}
+
+
+def _create_idempotency_keys(with_owner: bool) -> None:
+    columns = [sa.Column('owner_id', sa.String(length=64), nullable=False)] if with_owner else []
+    primary_key = ['owner_id', 'key'] if with_owner else ['key']
+    op.create_table('idempotency_keys',
+    *columns,
+    sa.Column('key', sa.String(length=255), nullable=False),
+    sa.Column('request_fingerprint', sa.String(length=64), nullable=False),
+    sa.Column('status_code', sa.Integer(), nullable=False),
+    sa.Column('response_body', sa.JSON(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+    sa.PrimaryKeyConstraint(*primary_key)
+    )
+    op.create_index(op.f('ix_idempotency_keys_created_at'), 'idempotency_keys', ['created_at'], unique=False)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Dữ liệu hiện có thuộc về owner mặc định
+    op.add_column('todos', sa.Column(
+        'owner_id', sa.String(length=64), nullable=False, server_default=settings.DEFAULT_OWNER_ID
+    ))
+    # server_default chỉ dùng để backfill: sau đó insert phải ghi rõ owner
+    with op.batch_alter_table('todos') as batch_op:
+        batch_op.alter_column('owner_id', server_default=None)
+    for name in SINGLE_COLUMN_INDEXES:
+        op.drop_index(name, table_name='todos')
+    for name, columns in OWNER_INDEXES.items():
+        op.create_index(name, 'todos', columns, unique=False)
+    
+    # Bảng chỉ giữ response tạm thời (TTL) nên tạo lại với khóa chính (owner_id, key)
+    # thay vì copy dữ liệu
+    op.drop_index(op.f('ix_idempotency_keys_created_at'), table_name='idempotency_keys')
+    op.drop_table('idempotency_keys')
+    _create_idempotency_keys(with_owner=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_idempotency_keys_created_at'), table_name='idempotency_keys')
+    op.drop_table('idempotency_keys')
+    _create_idempotency_keys(with_owner=False)
+    
+    for name in OWNER_INDEXES:
+        op.drop_index(name, table_name='todos')
+    for name, columns in SINGLE_COLUMN_INDEXES.items():
+        op.create_index(name, 'todos', columns, unique=False)
+    with op.batch_alter_table('todos') as batch_op:
+        batch_op.drop_column('owner_id')
@@ -2,6 +2,9 @@ from pydantic_settings import BaseSettings
 from typing import List
 import os
 
+# SECRET_KEY mẫu (công khai trong repo và env.example)
+DEFAULT_SECRET_KEY = "your-secret-key-here-change-in-production"
+
 
 class Settings(BaseSettings):
     """Cấu hình ứng dụng"""
@@ -9,6 +12,36 @@ class Settings(BaseSettings):
     # Database
     DATABASE_URL: str = "sqlite+aiosqlite:///./app.db"
     
+    # Connection pool (chỉ áp dụng cho backend có pool như PostgreSQL)
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_RECYCLE: int = 1800  # giây, tránh dùng lại kết nối đã bị server đóng
+    DB_POOL_TIMEOUT: int = 30  # giây chờ khi pool đã hết kết nối
+    DB_POOL_PRE_PING: bool = True
+    # Số kết nối mở sẵn cho mỗi engine khi khởi động (/ready trả về 200 sau khi xong)
+    DB_POOL_WARM_CONNECTIONS: int = 2
+    
+    # Tạo bảng bằng create_all khi khởi động (tắt trong production, dùng `alembic upgrade head`)
+    AUTO_CREATE_TABLES: bool = True
+    
+    # Layout lưu trữ compact: id 16 byte, status/priority dạng số nguyên nhỏ
+    # (bật trước khi chạy `alembic upgrade head` để migration chuyển đổi dữ liệu;
+    # giá trị khác layout của database: /ready trả về 503)
+    COMPACT_STORAGE: bool = False
+    
+    # Thuật toán sinh id: "uuid7" (tăng theo thời gian, insert tuần tự vào B-tree) hoặc "uuid4"
+    ID_STRATEGY: str = "uuid7"
+    
+    # SQLite journal mode (WAL cho phép đọc song song với ghi)
+    SQLITE_JOURNAL_MODE: str = "WAL"
+    
+    # Read replicas cho các endpoint chỉ đọc (để trống: đọc từ database chính)
+    READ_REPLICA_URLS: List[str] = []
+    # Sau khi client ghi, đọc từ database chính trong khoảng thời gian này (giây)
+    READ_YOUR_WRITES_SECONDS: float = 5.0
+    # Cookie mang thời điểm ghi gần nhất của client (dùng chung giữa các worker)
+    READ_YOUR_WRITES_COOKIE: str = "last_write_at"
+    
     # CORS
     # ALLOWED_ORIGINS: List[str] = [
     #     "http://localhost:3000",  # React development server
@@ -18,8 +51,67 @@ class Settings(BaseSettings):
     # ]
     ALLOWED_ORIGINS: List[str] = ["*"]
     
+    # Nén response (brotli cần cài thêm package `brotli`)
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_MINIMUM_SIZE: int = 1024  # bytes, response nhỏ hơn không nén
+    COMPRESSION_LEVEL: int = 6  # gzip 1-9
+    COMPRESSION_BROTLI_QUALITY: int = 4  # brotli 0-11
+    
+    # Rate limit (token bucket theo client + route) và admission control
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_PER_SECOND: float = 20
+    RATE_LIMIT_BURST: int = 40
+    # Endpoint tốn tài nguyên: rate riêng thấp hơn và giới hạn số request đồng thời mỗi worker
+    EXPENSIVE_ROUTES: List[str] = [
+        "GET /todos/stats",
+        "POST /todos/search",
+        "POST /todos/bulk",
+        "PUT /todos/bulk",
+        "POST /todos/archive",
+    ]
+    RATE_LIMIT_EXPENSIVE_PER_SECOND: float = 2
+    RATE_LIMIT_EXPENSIVE_BURST: int = 5
+    EXPENSIVE_CONCURRENCY_LIMIT: int = 4
+    BUSY_RETRY_AFTER_SECONDS: int = 1
+    RATE_LIMIT_EXEMPT_PATHS: List[str] = ["/", "/health", "/health/deep", "/ready", "/metrics", "/docs", "/redoc", "/openapi.json"]
+    
+    # POST /todos/batch-get: số id tối đa mỗi request
+    BATCH_GET_MAX_IDS: int = 100
+    
+    # Idempotency-Key cho POST /todos và POST /todos/bulk
+    IDEMPOTENCY_TTL_SECONDS: int = 86400
+    IDEMPOTENCY_MAX_KEYS: int = 100000
+    IDEMPOTENCY_PURGE_INTERVAL_SECONDS: int = 60
+    
+    # Archive: chuyển todo completed không thay đổi sau ARCHIVE_AFTER_DAYS ngày sang todos_archive
+    ARCHIVE_ENABLED: bool = False  # chạy job archive định kỳ trong process
+    ARCHIVE_AFTER_DAYS: int = 30
+    ARCHIVE_INTERVAL_SECONDS: int = 3600
+    ARCHIVE_BATCH_SIZE: int = 1000
+    
+    # Job queue chạy nền (bảng jobs trong database)
+    JOB_WORKERS: int = 2  # số job chạy đồng thời mỗi process
+    JOB_POLL_INTERVAL_SECONDS: float = 5.0
+    JOB_HEARTBEAT_SECONDS: float = 15.0  # chu kỳ cập nhật heartbeat của job đang chạy
+    JOB_STALE_SECONDS: int = 120  # job running không có heartbeat lâu hơn được coi là bị gián đoạn
+    JOB_MAX_ATTEMPTS: int = 3  # job bị gián đoạn quá số lần này bị đánh dấu failed
+    JOB_RETENTION_SECONDS: int = 604800
+    JOB_PURGE_INTERVAL_SECONDS: int = 300
+    
+    # GET /health/deep: trả về 503 khi vượt một trong các ngưỡng dưới đây
+    DIAGNOSTICS_DB_TIMEOUT_SECONDS: float = 1.0
+    DIAGNOSTICS_MAX_DB_LATENCY_SECONDS: float = 0.5
+    DIAGNOSTICS_MAX_LOOP_LAG_SECONDS: float = 0.2
+    DIAGNOSTICS_LOOP_INTERVAL_SECONDS: float = 0.5  # chu kỳ đo độ trễ event loop
+    
+    # Multi-tenant: mỗi todo thuộc về một owner (user/workspace) lấy từ JWT
+    AUTH_REQUIRED: bool = False  # False: request không có token dùng DEFAULT_OWNER_ID
+    DEFAULT_OWNER_ID: str = "default"
+    OWNER_CLAIM: str = "sub"  # claim trong JWT chứa owner id
+    
     # Security
-    SECRET_KEY: str = "your-secret-key-here-change-in-production"
+    # Giá trị mặc định là công khai: khi chưa đổi, app không tạo và không chấp nhận bearer token
+    SECRET_KEY: str = DEFAULT_SECRET_KEY
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     
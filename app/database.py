@@ -1,59 +1,210 @@
-from sqlalchemy import create_engine, MetaData
-from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
-from databases import Database
+from fastapi import Request
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import URL, Engine, make_url
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import declarative_base, sessionmaker
+from sqlalchemy.pool import QueuePool
+from typing import Callable, Dict, Optional
+import asyncio
+import itertools
 import logging
+import math
+import time
 
 from app.config import settings
+from app.middleware.read_your_writes import WRITE_STATE_KEY
 
 logger = logging.getLogger(__name__)
 
-# SQLite database URL
-SQLALCHEMY_DATABASE_URL = settings.DATABASE_URL.replace("+aiosqlite", "")
+# Driver async (DATABASE_URL dạng cũ) -> driver sync tương ứng cho SQLAlchemy
+SYNC_DRIVERS = {
+    "sqlite+aiosqlite": "sqlite",
+    "postgresql+asyncpg": "postgresql+psycopg2",
+}
+
+
+def get_sync_url(database_url: str) -> URL:
+    """Chuyển DATABASE_URL sang URL dùng driver sync"""
+    url = make_url(database_url)
+    drivername = SYNC_DRIVERS.get(url.drivername)
+    if drivername:
+        url = url.set(drivername=drivername)
+    return url
+
+
+def get_engine_options(url: URL) -> dict:
+    """Tham số tạo engine theo từng backend"""
+    options = {"echo": settings.DEBUG}  # Log SQL queries khi debug
+    if url.get_backend_name() == "sqlite":
+        # SQLite là file cục bộ, không cần pool size; chỉ cần cho phép dùng đa luồng
+        options["connect_args"] = {"check_same_thread": False}
+    else:
+        options.update(
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_recycle=settings.DB_POOL_RECYCLE,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+            pool_pre_ping=settings.DB_POOL_PRE_PING,
+        )
+    return options
+
+
+# Database URL (SQLite mặc định, PostgreSQL khi cấu hình DATABASE_URL tương ứng)
+SYNC_DATABASE_URL = get_sync_url(settings.DATABASE_URL)
+SQLALCHEMY_DATABASE_URL = SYNC_DATABASE_URL.render_as_string(hide_password=False)
 DATABASE_URL = settings.DATABASE_URL
+DB_BACKEND = SYNC_DATABASE_URL.get_backend_name()
+
+
+
+def set_sqlite_pragmas(dbapi_connection, connection_record):
+    """Thiết lập PRAGMA cho mỗi kết nối SQLite mới"""
+    cursor = dbapi_connection.cursor()
+    cursor.execute(f"PRAGMA journal_mode={settings.SQLITE_JOURNAL_MODE}")
+    cursor.close()
+
+
+def create_read_engine(database_url: str):
+    """Tạo engine chỉ đọc cho một read replica"""
+    url = get_sync_url(database_url)
+    if url.get_backend_name() == "sqlite" and url.database:
+        # Mở file SQLite ở chế độ read-only (mode=ro qua URI)
+        url = url.set(database=f"file:{url.database}", query={"mode": "ro", "uri": "true"})
+    return create_engine(url, **get_engine_options(url))
+
 
 # Tạo engine cho SQLAlchemy
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL,
-    connect_args={"check_same_thread": False},  # Cần thiết cho SQLite
-    echo=settings.DEBUG  # Log SQL queries khi debug
-)
+engine = create_engine(SYNC_DATABASE_URL, **get_engine_options(SYNC_DATABASE_URL))
+if DB_BACKEND == "sqlite":
+    event.listen(engine, "connect", set_sqlite_pragmas)
 
 # Tạo session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Engines và session factories cho read replicas (round-robin)
+read_engines = [create_read_engine(url) for url in settings.READ_REPLICA_URLS]
+ReadSessionLocals = [
+    sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
+    for read_engine in read_engines
+]
+_read_session_cycle = itertools.cycle(ReadSessionLocals)
+
 # Tạo base class cho models
 Base = declarative_base()
 
-# Tạo database instance cho async operations
-database = Database(DATABASE_URL)
-
-# Metadata cho async database operations
-metadata = MetaData()
+# Pool đã mở sẵn kết nối chưa (/ready)
+_pools_warmed = False
+# Lỗi khiến app không thể phục vụ (kiểm tra sau khi kết nối được database), /ready trả về 503
+_startup_error: Optional[str] = None
+_WARM_UP_RETRY_SECONDS = 2.0
 
 
 async def init_db():
-    """Khởi tạo database"""
+    """Tạo các bảng khi AUTO_CREATE_TABLES (production dùng `alembic upgrade head`)"""
+    if not settings.AUTO_CREATE_TABLES:
+        return
     try:
-        await database.connect()
-        logger.info("Database connected successfully")
-        
-        # Tạo các bảng
-        Base.metadata.create_all(bind=engine)
+        # create_all kiểm tra từng bảng bằng query đồng bộ, chạy ngoài event loop
+        await asyncio.to_thread(Base.metadata.create_all, bind=engine)
         logger.info("Database tables created successfully")
-        
     except Exception as e:
         logger.error(f"Error initializing database: {e}")
         raise
 
 
 async def close_db():
-    """Đóng kết nối database"""
+    """Đóng toàn bộ kết nối trong pool"""
+    for db_engine in [engine, *read_engines, *_probe_engines.values()]:
+        db_engine.dispose()
+    logger.info("Database connections closed")
+
+
+def pool_status(db_engine: Engine) -> dict:
+    """Số kết nối trong pool của engine"""
+    pool = db_engine.pool
+    if not isinstance(pool, QueuePool):
+        return {"pool": type(pool).__name__}
+    return {
+        "size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": pool.overflow(),
+        "max_overflow": pool._max_overflow,  # SQLAlchemy không có API public cho giá trị này
+    }
+
+
+# Engine riêng cho probe của /health/deep, theo engine của app
+_probe_engines: Dict[Engine, Engine] = {}
+
+
+def probe_engine(db_engine: Engine, timeout: float) -> Engine:
+    """Engine một kết nối cho probe chẩn đoán của `db_engine`, chờ kết nối tối đa `timeout` giây.
+
+    Probe không lấy kết nối từ pool của app: khi pool đó cạn (đã báo qua pool_status), probe không
+    phải chờ DB_POOL_TIMEOUT.
+    """
+    if db_engine not in _probe_engines:
+        url = db_engine.url
+        options = get_engine_options(url)
+        if isinstance(db_engine.pool, QueuePool):
+            options.update(pool_size=1, max_overflow=0, pool_timeout=timeout)
+        if url.get_backend_name() == "postgresql":
+            # psycopg2 chỉ nhận số giây nguyên
+            options["connect_args"] = {"connect_timeout": max(1, math.ceil(timeout))}
+        _probe_engines[db_engine] = create_engine(url, **options)
+    return _probe_engines[db_engine]
+
+
+def _warm_engine(db_engine: Engine, connections: int) -> None:
+    """Mở đồng thời `connections` kết nối rồi trả về pool để request đầu tiên không phải chờ kết nối"""
+    pool = db_engine.pool
+    if isinstance(pool, QueuePool):
+        # Kết nối overflow bị đóng khi trả về pool, không cần mở quá pool size
+        connections = min(connections, pool.size())
+    opened = []
     try:
-        await database.disconnect()
-        logger.info("Database disconnected successfully")
-    except Exception as e:
-        logger.error(f"Error closing database: {e}")
+        for _ in range(connections):
+            conn = db_engine.connect()
+            opened.append(conn)
+            conn.exec_driver_sql("SELECT 1")
+    finally:
+        for conn in opened:
+            conn.close()
+
+
+async def warm_up_pools(check: Optional[Callable[[Engine], None]] = None) -> None:
+    """Mở sẵn kết nối cho database chính và read replicas, thử lại đến khi thành công.
+
+    `check(engine)` chạy sau khi kết nối được database chính; lỗi của check (không phải lỗi kết nối)
+    là lỗi cấu hình: không thử lại, /ready trả về 503 kèm lỗi.
+    """
+    global _pools_warmed, _startup_error
+    while True:
+        try:
+            for db_engine in [engine, *read_engines]:
+                await asyncio.to_thread(_warm_engine, db_engine, settings.DB_POOL_WARM_CONNECTIONS)
+            if check is not None:
+                await asyncio.to_thread(check, engine)
+        except SQLAlchemyError as e:
+            # Database chưa sẵn sàng hoặc mất kết nối giữa chừng: thử lại
+            logger.warning(f"Error warming up database pools: {e}")
+            await asyncio.sleep(_WARM_UP_RETRY_SECONDS)
+            continue
+        except Exception as e:
+            _startup_error = str(e)
+            logger.error(f"Database check failed, not ready: {e}")
+            return
+        _pools_warmed = True
+        logger.info("Database pools warmed up")
+        return
+
+
+def pools_warmed() -> bool:
+    return _pools_warmed
+
+
+def startup_error() -> Optional[str]:
+    return _startup_error
 
 
 def get_db():
@@ -65,6 +216,37 @@ def get_db():
         db.close()
 
 
-async def get_async_db():
-    """Dependency để lấy async database connection"""
-    return database 
\ No newline at end of file
+def has_recent_write(request: Request) -> bool:
+    """Client có ghi trong khoảng READ_YOUR_WRITES_SECONDS gần đây không.
+
+    Thời điểm ghi do ReadYourWritesMiddleware gửi cho client qua cookie, nên mọi worker đều thấy.
+    """
+    try:
+        written_at = float(request.cookies.get(settings.READ_YOUR_WRITES_COOKIE, ""))
+    except ValueError:
+        return False
+    # Cookie do client gửi: thời điểm trong tương lai (kể cả inf) không kéo dài được việc đọc từ database chính
+    return 0 <= time.time() - written_at <= settings.READ_YOUR_WRITES_SECONDS
+
+
+def get_write_db(request: Request):
+    """Dependency lấy session ghi và đánh dấu request để client đọc lại từ database chính"""
+    setattr(request.state, WRITE_STATE_KEY, True)
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def get_read_db(request: Request):
+    """Dependency lấy session đọc, ưu tiên read replica"""
+    if ReadSessionLocals and not has_recent_write(request):
+        db = next(_read_session_cycle)()
+    else:
+        db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+ 
@@ -1,13 +1,36 @@
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
+import asyncio
 import logging
 import sys
 from contextlib import asynccontextmanager
 
-from app.database import init_db
+from app.database import (
+    close_db,
+    engine,
+    init_db,
+    pool_status,
+    pools_warmed,
+    read_engines,
+    startup_error,
+    warm_up_pools
+)
 from app.config import settings
-from app.routers import todo_router
+from app.metrics import metrics
+from app.middleware import (
+    CompressionMiddleware,
+    ConcurrencyLimiter,
+    InMemoryRateLimitStore,
+    RateLimitMiddleware,
+    ReadYourWritesMiddleware
+)
+from app.models.todo import check_storage_layout
+from app.routers import jobs_router, todo_router
+from app.services.archive import run_archive_loop
+from app.services.auth import secret_key_configured
+from app.services.diagnostics import collect_diagnostics, loop_monitor
+from app.services.jobs import job_queue
 
 
 # Cấu hình logging
@@ -27,9 +50,23 @@ logger = logging.getLogger(__name__)
 async def lifespan(app: FastAPI):
     """Lifecycle manager cho FastAPI app"""
     logger.info("Starting up application...")
+    if not secret_key_configured():
+        logger.warning("SECRET_KEY is not configured: bearer tokens are rejected")
     await init_db()
+    # Mở sẵn kết nối database trong nền: server nhận request ngay, /ready báo khi pool sẵn sàng.
+    # Sau khi kết nối được, layout lưu trữ của database phải khớp COMPACT_STORAGE (không khớp: /ready 503)
+    warm_up_task = asyncio.create_task(warm_up_pools(check=check_storage_layout))
+    loop_monitor.start()
+    job_queue.start(settings.JOB_WORKERS)
+    archive_task = asyncio.create_task(run_archive_loop()) if settings.ARCHIVE_ENABLED else None
     yield
     logger.info("Shutting down application...")
+    warm_up_task.cancel()
+    if archive_task:
+        archive_task.cancel()
+    await job_queue.stop()
+    await loop_monitor.stop()
+    await close_db()
 
 
 # Khởi tạo FastAPI app
@@ -40,6 +77,24 @@ app = FastAPI(
     lifespan=lifespan
 )
 
+# Giới hạn số request đồng thời cho các endpoint nặng (mỗi worker)
+expensive_limiter = ConcurrencyLimiter(settings.EXPENSIVE_CONCURRENCY_LIMIT)
+
+# Rate limit + admission control (đăng ký trước CORS để response 429/503 vẫn có header CORS)
+if settings.RATE_LIMIT_ENABLED:
+    app.add_middleware(
+        RateLimitMiddleware,
+        store=InMemoryRateLimitStore(),
+        rate=settings.RATE_LIMIT_PER_SECOND,
+        burst=settings.RATE_LIMIT_BURST,
+        expensive_routes=settings.EXPENSIVE_ROUTES,
+        expensive_rate=settings.RATE_LIMIT_EXPENSIVE_PER_SECOND,
+        expensive_burst=settings.RATE_LIMIT_EXPENSIVE_BURST,
+        concurrency_limiter=expensive_limiter,
+        busy_retry_after=settings.BUSY_RETRY_AFTER_SECONDS,
+        exempt_paths=settings.RATE_LIMIT_EXEMPT_PATHS,
+    )
+
 # Cấu hình CORS để cho phép React frontend kết nối
 app.add_middleware(
     CORSMiddleware,
@@ -49,6 +104,23 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Read-your-writes khi có read replica: gửi thời điểm ghi gần nhất cho client qua cookie
+if settings.READ_REPLICA_URLS:
+    app.add_middleware(
+        ReadYourWritesMiddleware,
+        cookie_name=settings.READ_YOUR_WRITES_COOKIE,
+        max_age=settings.READ_YOUR_WRITES_SECONDS,
+    )
+
+# Nén response theo Accept-Encoding (brotli/gzip)
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.COMPRESSION_MINIMUM_SIZE,
+        gzip_level=settings.COMPRESSION_LEVEL,
+        brotli_quality=settings.COMPRESSION_BROTLI_QUALITY,
+    )
+
 
 # Global exception handler
 @app.exception_handler(Exception)
@@ -65,7 +137,8 @@ async def http_exception_handler(request, exc: HTTPException):
     logger.warning(f"HTTP exception: {exc.detail}")
     return JSONResponse(
         status_code=exc.status_code,
-        content={"detail": exc.detail}
+        content={"detail": exc.detail},
+        headers=getattr(exc, "headers", None)
     )
 
 
@@ -76,6 +149,37 @@ async def health_check():
     return {"status": "healthy", "message": "API is running"}
 
 
+@app.get("/ready")
+async def readiness_check():
+    """Readiness: 200 khi pool kết nối database đã được mở sẵn, 503 khi đang khởi động hoặc cấu hình sai"""
+    error = startup_error()
+    if error:
+        return JSONResponse(status_code=503, content={"status": "error", "detail": error})
+    if not pools_warmed():
+        return JSONResponse(status_code=503, content={"status": "starting"})
+    return {
+        "status": "ready",
+        "pools": {
+            "primary": pool_status(engine),
+            "replicas": [pool_status(read_engine) for read_engine in read_engines],
+        },
+    }
+
+
+@app.get("/health/deep")
+async def deep_health_check():
+    """Độ trễ database, pool kết nối, độ trễ event loop và độ dài queue; 503 khi worker quá tải"""
+    diagnostics = await collect_diagnostics(expensive_limiter)
+    status_code = 503 if diagnostics["reasons"] else 200
+    return JSONResponse(status_code=status_code, content=diagnostics)
+
+
+@app.get("/metrics")
+async def get_metrics():
+    """Metrics trong process (nén response, ...)"""
+    return metrics.snapshot()
+
+
 @app.get("/")
 async def root():
     """Root endpoint"""
@@ -84,6 +188,7 @@ async def root():
 
 # Include routers
 app.include_router(todo_router)
+app.include_router(jobs_router)
 
 # Import và include routers (sẽ được thêm sau)
 # from app.routers import users, items
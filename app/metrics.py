@@ -0,0 +1,50 @@
+from collections import defaultdict
+from typing import Dict
+import threading
+
+
+class Metrics:
+    """Bộ đếm và thống kê đơn giản trong process (counter, gauge, summary)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: Dict[str, float] = defaultdict(float)
+        self._gauges: Dict[str, float] = {}
+        self._summaries: Dict[str, Dict[str, float]] = {}
+
+    def increment(self, name: str, value: float = 1) -> None:
+        """Tăng counter"""
+        with self._lock:
+            self._counters[name] += value
+
+    def set_gauge(self, name: str, value: float) -> None:
+        """Đặt giá trị hiện tại của gauge"""
+        with self._lock:
+            self._gauges[name] = value
+
+    def observe(self, name: str, value: float) -> None:
+        """Ghi nhận một giá trị đo (thời gian, kích thước...)"""
+        with self._lock:
+            summary = self._summaries.get(name)
+            if summary is None:
+                self._summaries[name] = {"count": 1, "sum": value, "min": value, "max": value}
+                return
+            summary["count"] += 1
+            summary["sum"] += value
+            summary["min"] = min(summary["min"], value)
+            summary["max"] = max(summary["max"], value)
+
+    def snapshot(self) -> dict:
+        """Trạng thái hiện tại của tất cả metrics"""
+        with self._lock:
+            return {
+                "counters": dict(self._counters),
+                "gauges": dict(self._gauges),
+                "summaries": {
+                    name: {**summary, "avg": summary["sum"] / summary["count"]}
+                    for name, summary in self._summaries.items()
+                },
+            }
+
+
+metrics = Metrics()
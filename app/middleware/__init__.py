@@ -0,0 +1,19 @@
+# ASGI Middleware Package
+from .compression import CompressionMiddleware
+from .rate_limit import (
+    ConcurrencyLimiter,
+    InMemoryRateLimitStore,
+    RateLimitMiddleware,
+    RateLimitStore
+)
+from .read_your_writes import ReadYourWritesMiddleware, WRITE_STATE_KEY
+
+__all__ = [
+    "CompressionMiddleware",
+    "ConcurrencyLimiter",
+    "InMemoryRateLimitStore",
+    "RateLimitMiddleware",
+    "RateLimitStore",
+    "ReadYourWritesMiddleware",
+    "WRITE_STATE_KEY"
+]
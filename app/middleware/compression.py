@@ -0,0 +1,142 @@
+from typing import Optional
+import gzip
+import time
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.metrics import metrics
+
+try:
+    import brotli
+except ImportError:  # brotli là dependency tùy chọn
+    brotli = None
+
+# Chỉ nén các content-type dạng text; ảnh/file nén sẵn không được lợi gì
+COMPRESSIBLE_TYPES = ("application/json", "text/", "application/javascript", "application/xml")
+
+
+def parse_accept_encoding(header: str) -> dict:
+    """Phân tích header Accept-Encoding thành {encoding: q}"""
+    encodings = {}
+    for part in header.split(","):
+        name, _, params = part.strip().partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        encodings[name] = q
+    return encodings
+
+
+class CompressionMiddleware:
+    """Nén response bằng brotli/gzip theo Accept-Encoding của client.
+
+    Chỉ nén response không streaming, lớn hơn `minimum_size`, có content-type dạng text
+    và khi kết quả nén thực sự nhỏ hơn. Tỉ lệ nén và CPU time được ghi vào app.metrics.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        gzip_level: int = 6,
+        brotli_quality: int = 4,
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    def choose_encoding(self, accept_encoding: str) -> Optional[str]:
+        """Chọn encoding tốt nhất mà client chấp nhận (ưu tiên brotli khi q bằng nhau)"""
+        accepted = parse_accept_encoding(accept_encoding)
+        wildcard = accepted.get("*", 0.0)
+        candidates = ["br", "gzip"] if brotli is not None else ["gzip"]
+        best, best_q = None, 0.0
+        for encoding in candidates:
+            q = accepted.get(encoding, wildcard)
+            if q > best_q:
+                best, best_q = encoding, q
+        return best
+
+    def compress(self, body: bytes, encoding: str) -> bytes:
+        if encoding == "br":
+            return brotli.compress(body, quality=self.brotli_quality)
+        return gzip.compress(body, compresslevel=self.gzip_level, mtime=0)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = self.choose_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message: Optional[Message] = None
+        passthrough = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal start_message, passthrough
+            if passthrough:
+                await send(message)
+                return
+            if message["type"] == "http.response.start":
+                start_message = message
+                return
+            if message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            if message.get("more_body", False):
+                # Response streaming: gửi nguyên bản
+                passthrough = True
+                await send(start_message)
+                await send(message)
+                return
+
+            await self._send_response(start_message, body, encoding, send)
+
+        await self.app(scope, receive, send_wrapper)
+
+    async def _send_response(self, start_message: Message, body: bytes, encoding: str, send: Send) -> None:
+        headers = MutableHeaders(scope=start_message)
+        content_type = headers.get("content-type", "")
+        skip_reason = None
+        if "content-encoding" in headers:
+            skip_reason = "encoded"
+        elif len(body) < self.minimum_size:
+            skip_reason = "small"
+        elif not content_type.startswith(COMPRESSIBLE_TYPES):
+            skip_reason = "content_type"
+
+        if skip_reason is None:
+            started = time.thread_time()
+            compressed = self.compress(body, encoding)
+            cpu_seconds = time.thread_time() - started
+            metrics.observe(f"compression.{encoding}.cpu_seconds", cpu_seconds)
+            if len(compressed) < len(body):
+                metrics.increment(f"compression.{encoding}.responses")
+                metrics.increment(f"compression.{encoding}.bytes_in", len(body))
+                metrics.increment(f"compression.{encoding}.bytes_out", len(compressed))
+                metrics.observe(f"compression.{encoding}.ratio", len(compressed) / len(body))
+                body = compressed
+                headers["Content-Encoding"] = encoding
+                headers["Content-Length"] = str(len(body))
+            else:
+                skip_reason = "no_gain"
+
+        if skip_reason is not None:
+            metrics.increment(f"compression.skipped.{skip_reason}")
+        headers.add_vary_header("Accept-Encoding")
+        await send(start_message)
+        await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,188 @@
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Iterable, Optional, Tuple
+import json
+import math
+import time
+
+from fastapi import HTTPException
+from starlette.datastructures import Headers
+from starlette.routing import Match
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.metrics import metrics
+from app.services.auth import decode_access_token
+
+
+class RateLimitStore(ABC):
+    """Nơi lưu trạng thái token bucket (in-memory mặc định, có thể thay bằng Redis...)"""
+
+    @abstractmethod
+    async def consume(self, key: str, rate: float, burst: int) -> float:
+        """Lấy một token từ bucket `key`.
+
+        Trả về 0 nếu được phép, ngược lại là số giây cần chờ đến khi có token.
+        """
+
+
+class InMemoryRateLimitStore(RateLimitStore):
+    """Token bucket trong bộ nhớ của process, tối đa `max_keys` bucket (bỏ bucket ít dùng nhất)"""
+
+    def __init__(self, max_keys: int = 100_000):
+        self.max_keys = max_keys
+        # key -> (tokens, updated_at, full_at), thứ tự từ bucket dùng lâu nhất đến gần nhất;
+        # full_at là lúc bucket đầy lại theo rate/burst của chính nó
+        self._buckets: OrderedDict[str, Tuple[float, float, float]] = OrderedDict()
+
+    async def consume(self, key: str, rate: float, burst: int) -> float:
+        now = time.monotonic()
+        self._evict_full(now)
+        bucket = self._buckets.pop(key, None)
+        if bucket is None:
+            tokens = float(burst)
+            if len(self._buckets) >= self.max_keys:
+                self._buckets.popitem(last=False)
+        else:
+            tokens, updated_at, _ = bucket
+            tokens = min(float(burst), tokens + (now - updated_at) * rate)
+
+        retry_after = 0.0
+        if tokens >= 1:
+            tokens -= 1
+        else:
+            retry_after = (1 - tokens) / rate
+        self._buckets[key] = (tokens, now, now + (burst - tokens) / rate)
+        return retry_after
+
+    def _evict_full(self, now: float) -> None:
+        # Bucket đã đầy lại hoàn toàn tương đương với chưa có: bỏ dần từ đầu (ít dùng nhất),
+        # dừng ở bucket đầu tiên chưa đầy để mỗi request chỉ tốn O(1) trung bình
+        while self._buckets:
+            key, (_, _, full_at) = next(iter(self._buckets.items()))
+            if full_at > now:
+                return
+            del self._buckets[key]
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+
+class ConcurrencyLimiter:
+    """Giới hạn số request đồng thời cho các endpoint tốn tài nguyên (trong một worker)"""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.in_flight = 0
+
+    def try_acquire(self) -> bool:
+        if self.in_flight >= self.limit:
+            return False
+        self.in_flight += 1
+        return True
+
+    def release(self) -> None:
+        self.in_flight -= 1
+
+
+class RateLimitMiddleware:
+    """Rate limit theo client/route bằng token bucket và admission control cho endpoint nặng.
+
+    - Vượt quá rate: 429 kèm Retry-After
+    - Endpoint nặng đã đủ số request đồng thời: 503 kèm Retry-After (shed load thay vì xếp hàng)
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        store: RateLimitStore,
+        rate: float,
+        burst: int,
+        expensive_routes: Iterable[str] = (),
+        expensive_rate: Optional[float] = None,
+        expensive_burst: Optional[int] = None,
+        concurrency_limiter: Optional[ConcurrencyLimiter] = None,
+        busy_retry_after: int = 1,
+        exempt_paths: Iterable[str] = (),
+    ):
+        self.app = app
+        self.store = store
+        self.rate = rate
+        self.burst = burst
+        self.expensive_routes = set(expensive_routes)
+        self.expensive_rate = expensive_rate or rate
+        self.expensive_burst = expensive_burst or burst
+        self.concurrency_limiter = concurrency_limiter
+        self.busy_retry_after = busy_retry_after
+        self.exempt_paths = set(exempt_paths)
+
+    def route_key(self, scope: Scope) -> Optional[str]:
+        """"METHOD /path/template" của route khớp với request, None nếu không có route nào khớp"""
+        router = scope["app"].router
+        for route in router.routes:
+            match, _ = route.matches(scope)
+            if match == Match.FULL:
+                return f"{scope['method']} {route.path}"
+        return None
+
+    @staticmethod
+    def client_key(scope: Scope) -> str:
+        """Owner của JWT hợp lệ, nếu không có thì địa chỉ peer.
+
+        Không dùng header do client tự đặt (ví dụ X-Client-Id): đổi giá trị mỗi request sẽ
+        vượt qua giới hạn. Sau reverse proxy, chạy uvicorn với --proxy-headers để peer là IP client.
+        """
+        scheme, _, token = Headers(scope=scope).get("authorization", "").partition(" ")
+        if scheme.lower() == "bearer" and token:
+            try:
+                return f"owner:{decode_access_token(token)}"
+            except HTTPException:
+                # Token không hợp lệ: request sẽ bị từ chối 401, vẫn tính theo peer
+                pass
+        client = scope.get("client")
+        return f"ip:{client[0]}" if client else "anonymous"
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] in self.exempt_paths:
+            await self.app(scope, receive, send)
+            return
+
+        route = self.route_key(scope)
+        if route is None:
+            await self.app(scope, receive, send)
+            return
+
+        expensive = route in self.expensive_routes
+        rate = self.expensive_rate if expensive else self.rate
+        burst = self.expensive_burst if expensive else self.burst
+        retry_after = await self.store.consume(f"{self.client_key(scope)}:{route}", rate, burst)
+        if retry_after > 0:
+            metrics.increment("rate_limit.rejected")
+            await self._reject(send, 429, "Too many requests", retry_after)
+            return
+
+        if not expensive or self.concurrency_limiter is None:
+            await self.app(scope, receive, send)
+            return
+
+        if not self.concurrency_limiter.try_acquire():
+            metrics.increment("admission.rejected")
+            await self._reject(send, 503, "Server busy, please retry", self.busy_retry_after)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.concurrency_limiter.release()
+
+    @staticmethod
+    async def _reject(send: Send, status_code: int, detail: str, retry_after: float) -> None:
+        body = json.dumps({"detail": detail}).encode()
+        await send({
+            "type": "http.response.start",
+            "status": status_code,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", str(max(1, math.ceil(retry_after))).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,40 @@
+import math
+import time
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Key trong request.state: request đã dùng session ghi (get_write_db)
+WRITE_STATE_KEY = "wrote_to_primary"
+
+
+class ReadYourWritesMiddleware:
+    """Gửi cho client thời điểm ghi gần nhất qua cookie.
+
+    Request đọc sau đó mang theo cookie nên worker nào nhận request cũng biết client vừa ghi và
+    đọc từ database chính thay vì replica (trạng thái không nằm trong bộ nhớ của một process).
+    """
+
+    def __init__(self, app: ASGIApp, cookie_name: str, max_age: float):
+        self.app = app
+        self.cookie_name = cookie_name
+        self.max_age = max(1, math.ceil(max_age))
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        # Cùng dict với request.state của endpoint/dependency
+        state = scope.setdefault("state", {})
+
+        async def send_with_cookie(message: Message) -> None:
+            if message["type"] == "http.response.start" and state.get(WRITE_STATE_KEY) and message["status"] < 400:
+                # Thời điểm gửi response: sau khi request ghi đã commit
+                MutableHeaders(scope=message).append(
+                    "set-cookie",
+                    f"{self.cookie_name}={time.time():.3f}; Max-Age={self.max_age}; Path=/; HttpOnly; SameSite=Lax"
+                )
+            await send(message)
+
+        await self.app(scope, receive, send_with_cookie)
@@ -1,4 +1,16 @@
 # Database Models Package
 from .todo import Todo, TodoStatus, TodoPriority
+from .archive import TodoArchive, TodoArchiveStat
+from .idempotency import IdempotencyKey
+from .job import Job, JobStatus
 
-__all__ = ["Todo", "TodoStatus", "TodoPriority"] 
\ No newline at end of file
+__all__ = [
+    "Todo",
+    "TodoStatus",
+    "TodoPriority",
+    "TodoArchive",
+    "TodoArchiveStat",
+    "IdempotencyKey",
+    "Job",
+    "JobStatus"
+]
@@ -0,0 +1,55 @@
+from sqlalchemy import Column, String, Text, DateTime, Integer, Index
+from datetime import datetime, timezone
+from app.config import settings
+from app.database import Base
+from app.models.todo import todo_column_types
+from app.models.types import TagList
+
+
+_column_types = todo_column_types(settings.COMPACT_STORAGE)
+
+
+class TodoArchive(Base):
+    """Todo đã hoàn thành lâu, chuyển khỏi bảng todos (chỉ đọc)"""
+    __tablename__ = "todos_archive"
+
+    # Cùng cột và kiểu dữ liệu với bảng todos
+    id = Column(_column_types["id"], primary_key=True)
+    owner_id = Column(String(64), nullable=False)
+    title = Column(String(200), nullable=False)
+    description = Column(Text, nullable=True)
+    status = Column(_column_types["status"], nullable=False)
+    priority = Column(_column_types["priority"], nullable=False)
+    due_date = Column(DateTime(timezone=True), nullable=True)
+    tags = Column(TagList, nullable=True)
+    created_at = Column(DateTime(timezone=True), nullable=False)
+    updated_at = Column(DateTime(timezone=True), nullable=False)
+    
+    # Thời điểm chuyển vào archive
+    archived_at = Column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+        nullable=False
+    )
+
+    __table_args__ = (
+        Index("ix_todos_archive_owner_created_at", "owner_id", "created_at"),
+        Index("ix_todos_archive_owner_priority", "owner_id", "priority", "created_at"),
+        Index("ix_todos_archive_owner_due_date", "owner_id", "due_date"),
+    )
+
+    def __repr__(self):
+        return f"<TodoArchive(id={self.id}, title={self.title})>"
+
+
+class TodoArchiveStat(Base):
+    """Số todo đã lưu trữ của mỗi owner theo priority/tag, cập nhật khi archive"""
+    __tablename__ = "todos_archive_stats"
+
+    owner_id = Column(String(64), primary_key=True)
+    kind = Column(String(16), primary_key=True)  # "priority" hoặc "tag"
+    value = Column(Text, primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<TodoArchiveStat(owner_id={self.owner_id}, {self.kind}={self.value}, count={self.count})>"
@@ -0,0 +1,30 @@
+from sqlalchemy import Column, String, Integer, DateTime, JSON
+from datetime import datetime, timezone
+from app.database import Base
+
+
+class IdempotencyKey(Base):
+    """Response đã lưu cho một Idempotency-Key, dùng để trả lại khi client retry"""
+    __tablename__ = "idempotency_keys"
+
+    # Key chỉ có nghĩa trong phạm vi một owner
+    owner_id = Column(String(64), primary_key=True)
+    key = Column(String(255), primary_key=True)
+    
+    # Hash của method + path + body, phát hiện key bị dùng lại cho request khác
+    request_fingerprint = Column(String(64), nullable=False)
+    
+    # Response đã trả về lần đầu
+    status_code = Column(Integer, nullable=False)
+    response_body = Column(JSON, nullable=False)
+    
+    # Dùng để xóa các key hết hạn (TTL)
+    created_at = Column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+        nullable=False,
+        index=True
+    )
+
+    def __repr__(self):
+        return f"<IdempotencyKey(owner_id={self.owner_id}, key={self.key}, status_code={self.status_code})>"
@@ -0,0 +1,61 @@
+import os
+import threading
+import time
+import uuid
+
+from app.config import settings
+
+_lock = threading.Lock()
+_last_ms = 0
+_counter = 0
+
+_COUNTER_MAX = 0xFFF
+_RAND_B_MASK = (1 << 62) - 1
+
+
+def uuid7() -> uuid.UUID:
+    """Sinh UUIDv7 (RFC 9562): 48 bit timestamp ms + bộ đếm 12 bit + 62 bit ngẫu nhiên.
+
+    Các ID sinh ra trong cùng một process luôn tăng dần, kể cả trong cùng một millisecond.
+    """
+    global _last_ms, _counter
+    with _lock:
+        now_ms = time.time_ns() // 1_000_000
+        if now_ms > _last_ms:
+            _last_ms = now_ms
+            # Khởi tạo ngẫu nhiên ở nửa dưới để còn chỗ tăng bộ đếm
+            _counter = int.from_bytes(os.urandom(2), "big") & 0x7FF
+        else:
+            _counter += 1
+            if _counter > _COUNTER_MAX:
+                # Hết bộ đếm trong millisecond hiện tại: mượn millisecond kế tiếp
+                _last_ms += 1
+                _counter = 0
+        timestamp_ms, counter = _last_ms, _counter
+
+    rand_b = int.from_bytes(os.urandom(8), "big") & _RAND_B_MASK
+    value = (timestamp_ms << 80) | (0x7 << 76) | (counter << 64) | (0b10 << 62) | rand_b
+    return uuid.UUID(int=value)
+
+
+ID_GENERATORS = {
+    "uuid4": uuid.uuid4,
+    "uuid7": uuid7,
+}
+
+
+def new_id() -> str:
+    """Sinh id (todo, job) theo cấu hình ID_STRATEGY"""
+    return str(ID_GENERATORS[settings.ID_STRATEGY]())
+
+
+def canonical_id(value: str) -> str:
+    """Dạng chuẩn (chữ thường, có gạch nối) của id UUID; chuỗi không phải UUID giữ nguyên.
+
+    Database so khớp UUID không phân biệt hoa thường, nên id do client gửi phải được
+    chuẩn hóa trước khi bỏ trùng hoặc tra theo id trả về từ database.
+    """
+    try:
+        return str(uuid.UUID(value))
+    except ValueError:
+        return value
@@ -0,0 +1,52 @@
+from sqlalchemy import Column, String, Text, DateTime, Integer, Enum, JSON, Index
+from datetime import datetime, timezone
+import enum
+from app.database import Base
+from app.models.ids import new_id
+
+
+class JobStatus(enum.Enum):
+    """Enum cho trạng thái của Job"""
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+class Job(Base):
+    """Tác vụ nặng chạy nền (lưu trong database để không mất khi restart)"""
+    __tablename__ = "jobs"
+
+    # UUIDv7: job mới luôn nằm cuối index, thứ tự id gần với thứ tự tạo
+    id = Column(String(36), primary_key=True, default=new_id)
+    owner_id = Column(String(64), nullable=False)
+    
+    # Loại job (key trong JOB_HANDLERS) và tham số
+    kind = Column(String(64), nullable=False)
+    payload = Column(JSON, nullable=True)
+    
+    status = Column(Enum(JobStatus), default=JobStatus.QUEUED, nullable=False)
+    attempts = Column(Integer, default=0, nullable=False)
+    
+    # Kết quả hoặc lỗi khi chạy xong
+    result = Column(JSON, nullable=True)
+    error = Column(Text, nullable=True)
+    
+    # Timestamps
+    created_at = Column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+        nullable=False
+    )
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    # Worker đang chạy job cập nhật định kỳ; không cập nhật quá JOB_STALE_SECONDS: job bị gián đoạn
+    heartbeat_at = Column(DateTime(timezone=True), nullable=True)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        # Worker lấy job theo thứ tự tạo trong các job đang chờ
+        Index("ix_jobs_status_created_at", "status", "created_at"),
+    )
+
+    def __repr__(self):
+        return f"<Job(id={self.id}, kind={self.kind}, status={self.status.value})>"
@@ -1,9 +1,13 @@
-from sqlalchemy import Column, String, Text, DateTime, Enum, JSON
-from sqlalchemy.dialects.postgresql import UUID
+from typing import Optional
+from sqlalchemy import Column, String, Text, DateTime, Enum, Index, Integer, inspect
+from sqlalchemy.engine import Engine
 from sqlalchemy.sql import func
+from datetime import datetime, timezone
 import enum
-import uuid
+from app.config import settings
 from app.database import Base
+from app.models.ids import new_id
+from app.models.types import CompactUUID, SmallIntEnum, TagList, UUIDString
 
 
 class TodoStatus(enum.Enum):
@@ -20,30 +24,118 @@ class TodoPriority(enum.Enum):
     HIGH = "high"
 
 
+# Mã số nguyên cho layout lưu trữ compact - không được thay đổi các giá trị đã dùng
+TODO_STATUS_CODES = {
+    TodoStatus.PENDING: 0,
+    TodoStatus.IN_PROGRESS: 1,
+    TodoStatus.COMPLETED: 2,
+}
+TODO_PRIORITY_CODES = {
+    TodoPriority.LOW: 0,
+    TodoPriority.MEDIUM: 1,
+    TodoPriority.HIGH: 2,
+}
+
+
+def todo_column_types(compact: bool) -> dict:
+    """Kiểu cột id/status/priority theo layout lưu trữ (mặc định hoặc compact)"""
+    if compact:
+        return {
+            "id": CompactUUID(),
+            "status": SmallIntEnum(TodoStatus, TODO_STATUS_CODES),
+            "priority": SmallIntEnum(TodoPriority, TODO_PRIORITY_CODES),
+        }
+    return {
+        # Chuỗi 36 ký tự trên SQLite, kiểu UUID native trên PostgreSQL
+        "id": UUIDString(),
+        "status": Enum(TodoStatus),
+        "priority": Enum(TodoPriority),
+    }
+
+
+def detect_compact_storage(bind: Engine) -> Optional[bool]:
+    """Layout lưu trữ của bảng todos trong database (theo kiểu cột status), None nếu chưa có bảng"""
+    inspector = inspect(bind)
+    if not inspector.has_table("todos"):
+        return None
+    status = next(column for column in inspector.get_columns("todos") if column["name"] == "status")
+    return isinstance(status["type"], Integer)
+
+
+def check_storage_layout(bind: Engine) -> None:
+    """Dừng khởi động nếu COMPACT_STORAGE khác layout đã migrate.
+
+    Models chọn kiểu cột theo COMPACT_STORAGE lúc import, đọc dữ liệu của layout khác sẽ lỗi.
+    """
+    compact = detect_compact_storage(bind)
+    if compact is not None and compact != settings.COMPACT_STORAGE:
+        raise RuntimeError(
+            f"Database uses the {'compact' if compact else 'default'} storage layout "
+            f"but COMPACT_STORAGE={settings.COMPACT_STORAGE}; set COMPACT_STORAGE={compact} "
+            "or migrate the database with the matching setting"
+        )
+
+
+_column_types = todo_column_types(settings.COMPACT_STORAGE)
+
+
 class Todo(Base):
     """Model cho Todo"""
     __tablename__ = "todos"
 
-    # UUID primary key
-    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()), index=True)
+    # UUID primary key (khóa chính đã có index, không cần index riêng).
+    # Mặc định UUIDv7 để insert mới luôn nằm cuối B-tree thay vì vị trí ngẫu nhiên
+    id = Column(_column_types["id"], primary_key=True, default=new_id)
+    
+    # Owner (user/workspace) - mọi truy vấn đều lọc theo cột này.
+    # Không có giá trị mặc định: mọi insert phải ghi rõ owner
+    owner_id = Column(String(64), nullable=False)
     
     # Basic info
-    title = Column(String(200), nullable=False, index=True)
+    title = Column(String(200), nullable=False)
     description = Column(Text, nullable=True)
     
     # Status and priority
-    status = Column(Enum(TodoStatus), default=TodoStatus.PENDING, nullable=False, index=True)
-    priority = Column(Enum(TodoPriority), default=TodoPriority.MEDIUM, nullable=False, index=True)
+    status = Column(_column_types["status"], default=TodoStatus.PENDING, nullable=False)
+    priority = Column(_column_types["priority"], default=TodoPriority.MEDIUM, nullable=False)
     
     # Due date
-    due_date = Column(DateTime(timezone=True), nullable=True, index=True)
+    due_date = Column(DateTime(timezone=True), nullable=True)
     
-    # Tags (stored as JSON for SQLite compatibility)
-    tags = Column(JSON, nullable=True, default=list)
+    # Tags (JSON trên SQLite, ARRAY native + GIN index trên PostgreSQL)
+    tags = Column(TagList, nullable=True, default=list)
     
-    # Timestamps
-    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
-    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+    # Timestamps: giá trị mặc định sinh phía Python để insert nhiều todo không cần RETURNING
+    # (SQLAlchemy không khớp được id UUID trả về từ psycopg2 khi insert nhiều dòng có RETURNING);
+    # server_default giữ lại cho insert bằng SQL trực tiếp
+    created_at = Column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+        server_default=func.now(),
+        nullable=False
+    )
+    updated_at = Column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+        server_default=func.now(),
+        onupdate=func.now(),
+        nullable=False
+    )
+
+    __table_args__ = (
+        # Các index đều bắt đầu bằng owner_id: truy vấn của một owner chỉ quét phần dữ liệu
+        # của owner đó, không phụ thuộc tổng số dòng của mọi owner.
+        # created_at ở cuối để lọc + ORDER BY created_at DESC dùng luôn thứ tự của index
+        Index("ix_todos_owner_created_at", "owner_id", "created_at"),
+        Index("ix_todos_owner_status", "owner_id", "status", "created_at"),
+        Index("ix_todos_owner_priority", "owner_id", "priority", "created_at"),
+        Index("ix_todos_owner_due_date", "owner_id", "due_date"),
+        Index("ix_todos_owner_title", "owner_id", "title"),
+        # GIN index cho truy vấn `tags @> ARRAY[...]`, chỉ tạo trên PostgreSQL.
+        # Không dẫn đầu bằng owner_id (GIN trên cột text cần extension btree_gin),
+        # PostgreSQL kết hợp với ix_todos_owner_* bằng BitmapAnd
+        Index("ix_todos_tags_gin", "tags", postgresql_using="gin").ddl_if(dialect="postgresql"),
+    )
 
     def __repr__(self):
         return f"<Todo(id={self.id}, title={self.title}, status={self.status.value})>" 
\ No newline at end of file
@@ -0,0 +1,140 @@
+import uuid
+
+from sqlalchemy import Boolean, JSON, LargeBinary, SmallInteger, String, Text, func, literal
+from sqlalchemy.dialects.postgresql import ARRAY, UUID
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import FunctionElement
+from sqlalchemy.types import TypeDecorator
+
+
+class tags_contain(FunctionElement):
+    """Điều kiện cột tags chứa tất cả các tag cho trước"""
+    type = Boolean()
+    name = "tags_contain"
+    inherit_cache = True
+
+
+@compiles(tags_contain)
+def _compile_tags_contain(element, compiler, **kw):
+    # SQLite: tags lưu dạng JSON array, duyệt bằng json_each
+    column, *tags = [compiler.process(arg, **kw) for arg in element.clauses]
+    return " AND ".join(
+        f"EXISTS (SELECT 1 FROM json_each({column}) WHERE json_each.value = {tag})"
+        for tag in tags
+    )
+
+
+@compiles(tags_contain, "postgresql")
+def _compile_tags_contain_postgresql(element, compiler, **kw):
+    # PostgreSQL: toán tử @> trên ARRAY, dùng được GIN index
+    column, *tags = [compiler.process(arg, **kw) for arg in element.clauses]
+    return f"{column} @> CAST(ARRAY[{', '.join(tags)}] AS TEXT[])"
+
+
+def tag_elements(column, dialect_name: str):
+    """Bảng mỗi tag một dòng (cột `value`) của cột TagList, dùng để đếm theo tag trong SQL"""
+    if dialect_name == "postgresql":
+        # unnest trả về một cột không tên: cần alias dạng `AS anon_1(value)` để đặt tên cột
+        return func.unnest(column).table_valued("value").render_derived()
+    return func.json_each(column).table_valued("value")
+
+
+class TagList(TypeDecorator):
+    """Danh sách tags: JSON trên SQLite, TEXT[] native trên PostgreSQL"""
+    impl = JSON
+    cache_ok = True
+
+    class comparator_factory(TypeDecorator.Comparator):
+        def contains(self, other, **kwargs):
+            tags = [other] if isinstance(other, str) else list(other)
+            return tags_contain(self.expr, *[literal(tag, Text) for tag in tags])
+
+    def load_dialect_impl(self, dialect):
+        if dialect.name == "postgresql":
+            return dialect.type_descriptor(ARRAY(Text))
+        return dialect.type_descriptor(JSON())
+
+
+def _parse_uuid(value):
+    """uuid.UUID từ giá trị bất kỳ, None nếu không phải UUID hợp lệ"""
+    try:
+        return uuid.UUID(str(value))
+    except ValueError:
+        return None
+
+
+class UUIDString(TypeDecorator):
+    """UUID dạng chuỗi 36 ký tự: String(36) trên SQLite, UUID native trên PostgreSQL"""
+    impl = String(36)
+    cache_ok = True
+
+    def load_dialect_impl(self, dialect):
+        if dialect.name == "postgresql":
+            return dialect.type_descriptor(UUID(as_uuid=False))
+        return dialect.type_descriptor(String(36))
+
+    def process_bind_param(self, value, dialect):
+        if value is None or dialect.name != "postgresql":
+            return value
+        # PostgreSQL báo lỗi khi ép chuỗi không phải UUID sang kiểu uuid;
+        # chuỗi đó không thể khớp bản ghi nào nên so sánh với NULL
+        parsed = _parse_uuid(value)
+        return str(parsed) if parsed else None
+
+    def process_result_value(self, value, dialect):
+        return None if value is None else str(value)
+
+
+class CompactUUID(TypeDecorator):
+    """UUID lưu dạng 16 byte (BLOB trên SQLite, UUID native trên PostgreSQL), giá trị Python là chuỗi"""
+    impl = LargeBinary(16)
+    cache_ok = True
+
+    def load_dialect_impl(self, dialect):
+        if dialect.name == "postgresql":
+            return dialect.type_descriptor(UUID(as_uuid=False))
+        return dialect.type_descriptor(LargeBinary(16))
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        value = _parse_uuid(value)
+        if value is None:
+            # Chuỗi không phải UUID không thể khớp bản ghi nào (so sánh với NULL)
+            return None
+        return str(value) if dialect.name == "postgresql" else value.bytes
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        if isinstance(value, bytes):
+            # Định dạng trực tiếp từ hex, nhanh hơn đáng kể so với uuid.UUID(bytes=...)
+            h = value.hex()
+            return f"{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}"
+        return str(value)
+
+
+class SmallIntEnum(TypeDecorator):
+    """Enum lưu dạng số nguyên nhỏ theo bảng mã cố định"""
+    impl = SmallInteger
+    cache_ok = True
+
+    def __init__(self, enum_class, codes):
+        super().__init__()
+        self.enum_class = enum_class
+        # Lưu dạng tuple để type có cache key (dict không hash được)
+        self.codes = tuple(codes.items())
+        self._code_by_member = dict(self.codes)
+        self._member_by_code = {code: member for member, code in self.codes}
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        if not isinstance(value, self.enum_class):
+            value = self.enum_class(value)
+        return self._code_by_member[value]
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        return self._member_by_code[value]
@@ -1,4 +1,5 @@
 # API Routers Package
 from .todo import router as todo_router
+from .jobs import router as jobs_router
 
-__all__ = ["todo_router"] 
\ No newline at end of file
+__all__ = ["todo_router", "jobs_router"] 
\ No newline at end of file
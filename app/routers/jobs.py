@@ -0,0 +1,25 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+
+from app.database import get_db
+from app.models import Job
+from app.schemas import JobResponse
+from app.services.auth import get_current_owner
+
+router = APIRouter(
+    prefix="/jobs",
+    tags=["jobs"]
+)
+
+
+@router.get("/{job_id}", response_model=JobResponse)
+async def get_job(
+    job_id: str,
+    db: Session = Depends(get_db),  # database chính: trạng thái job do worker cập nhật liên tục
+    owner_id: str = Depends(get_current_owner)
+):
+    """Lấy trạng thái và kết quả của một job"""
+    job = db.query(Job).filter(Job.owner_id == owner_id, Job.id == job_id).first()
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
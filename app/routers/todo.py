@@ -1,11 +1,14 @@
 from typing import Optional, List
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response
+from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session
-from sqlalchemy import or_, func, case
+from sqlalchemy import or_, func, case, select, true, union_all
 from datetime import datetime, timezone
 
-from app.database import get_db
-from app.models import Todo, TodoStatus, TodoPriority
+from app.database import get_read_db, get_write_db
+from app.models import Todo, TodoArchive, TodoStatus, TodoPriority
+from app.models.ids import canonical_id, new_id
+from app.models.types import tag_elements
 from app.schemas import (
     TodoCreate,
     TodoUpdate,
@@ -15,8 +18,19 @@ from app.schemas import (
     TodoStatsResponse,
     TodoSearchParams,
     TodoBulkCreate,
-    TodoBulkUpdate
+    TodoBulkUpdate,
+    TodoBatchGet,
+    TodoBatchGetResponse,
+    JobResponse
 )
+from app.services.archive import get_archive_totals
+from app.services.auth import get_current_owner
+from app.services.idempotency import (
+    commit_with_response,
+    get_stored_response,
+    request_fingerprint
+)
+from app.services.jobs import add_job, enqueue_job, job_queue
 
 router = APIRouter(
     prefix="/todos",
@@ -24,9 +38,66 @@ router = APIRouter(
 )
 
 
+def _todo_filters(
+    model,
+    owner_id: str,
+    status: Optional[TodoStatus] = None,
+    priority: Optional[TodoPriority] = None,
+    search: Optional[str] = None,
+    tags: Optional[List[str]] = None,
+    due_before: Optional[datetime] = None,
+    due_after: Optional[datetime] = None
+) -> list:
+    """Điều kiện lọc dùng chung cho bảng todos và todos_archive"""
+    filters = [model.owner_id == owner_id]
+    if status:
+        filters.append(model.status == status)
+    if priority:
+        filters.append(model.priority == priority)
+    if search:
+        filters.append(or_(
+            model.title.ilike(f"%{search}%"),
+            model.description.ilike(f"%{search}%")
+        ))
+    for tag in tags or []:
+        filters.append(model.tags.contains([tag]))
+    if due_before:
+        filters.append(model.due_date <= due_before)
+    if due_after:
+        filters.append(model.due_date >= due_after)
+    return filters
+
+
+def _paginate(db: Session, filters_for, include_archived: bool, page: int, size: int) -> TodoListResponse:
+    """Phân trang theo created_at giảm dần, gộp cả todos_archive nếu include_archived"""
+    if not include_archived:
+        query = db.query(Todo).filter(*filters_for(Todo))
+        total = query.count()
+        todos = query.order_by(Todo.created_at.desc()).offset((page - 1) * size).limit(size).all()
+    else:
+        columns = list(TodoResponse.model_fields)
+        combined = union_all(
+            select(*[Todo.__table__.c[name] for name in columns]).where(*filters_for(Todo)),
+            select(*[TodoArchive.__table__.c[name] for name in columns]).where(*filters_for(TodoArchive))
+        ).subquery()
+        total = db.scalar(select(func.count()).select_from(combined))
+        todos = db.execute(
+            select(combined).order_by(combined.c.created_at.desc()).offset((page - 1) * size).limit(size)
+        ).all()
+    
+    return TodoListResponse(
+        todos=todos,
+        total=total,
+        page=page,
+        size=size,
+        total_pages=(total + size - 1) // size
+    )
+
+
 @router.get("", response_model=TodoListResponse)
 async def list_todos(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
+    owner_id: str = Depends(get_current_owner),
     page: int = Query(1, ge=1, description="Số trang"),
     size: int = Query(10, ge=1, le=100, description="Số lượng items mỗi trang"),
     status: Optional[TodoStatus] = Query(None, description="Lọc theo trạng thái"),
@@ -34,182 +105,117 @@ async def list_todos(
     search: Optional[str] = Query(None, description="Tìm kiếm theo title hoặc description"),
     tag: Optional[str] = Query(None, description="Lọc theo tag"),
     due_before: Optional[datetime] = Query(None, description="Lọc các todo đến hạn trước ngày"),
-    due_after: Optional[datetime] = Query(None, description="Lọc các todo đến hạn sau ngày")
+    due_after: Optional[datetime] = Query(None, description="Lọc các todo đến hạn sau ngày"),
+    include_archived: bool = Query(False, description="Gồm cả các todo đã lưu trữ")
 ):
     """Lấy danh sách todos với filter và pagination"""
-    # Base query
-    query = db.query(Todo)
-    
-    # Apply filters
-    if status:
-        query = query.filter(Todo.status == status)
-    if priority:
-        query = query.filter(Todo.priority == priority)
-    if search:
-        search_filter = or_(
-            Todo.title.ilike(f"%{search}%"),
-            Todo.description.ilike(f"%{search}%")
+    def filters_for(model):
+        return _todo_filters(
+            model, owner_id, status, priority, search, [tag] if tag else None, due_before, due_after
         )
-        query = query.filter(search_filter)
-    if tag:
-        query = query.filter(Todo.tags.contains([tag]))
-    if due_before:
-        query = query.filter(Todo.due_date <= due_before)
-    if due_after:
-        query = query.filter(Todo.due_date >= due_after)
-    
-    # Get total count for pagination
-    total = query.count()
-    total_pages = (total + size - 1) // size
     
-    # Apply pagination
-    query = query.order_by(Todo.created_at.desc())
-    query = query.offset((page - 1) * size).limit(size)
-    
-    return TodoListResponse(
-        todos=query.all(),
-        total=total,
-        page=page,
-        size=size,
-        total_pages=total_pages
-    )
+    return _paginate(db, filters_for, include_archived, page, size)
 
 
 @router.post("", response_model=TodoResponse, status_code=201)
 async def create_todo(
     todo: TodoCreate,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_write_db),
+    owner_id: str = Depends(get_current_owner),
+    idempotency_key: Optional[str] = Header(
+        None, max_length=255, description="Retry với cùng key sẽ nhận lại response cũ thay vì tạo trùng"
+    )
 ):
     """Tạo todo mới"""
-    db_todo = Todo(**todo.model_dump())
-    db.add(db_todo)
-    db.commit()
-    db.refresh(db_todo)
-    return db_todo
-
-
-@router.get("/{todo_id}", response_model=TodoResponse)
-async def get_todo(
-    todo_id: str,
-    db: Session = Depends(get_db)
-):
-    """Lấy chi tiết một todo"""
-    todo = db.query(Todo).filter(Todo.id == todo_id).first()
-    if not todo:
-        raise HTTPException(status_code=404, detail="Todo not found")
-    return todo
-
-
-@router.put("/{todo_id}", response_model=TodoResponse)
-async def update_todo(
-    todo_id: str,
-    todo_update: TodoUpdate,
-    db: Session = Depends(get_db)
-):
-    """Cập nhật toàn bộ thông tin của một todo"""
-    db_todo = db.query(Todo).filter(Todo.id == todo_id).first()
-    if not db_todo:
-        raise HTTPException(status_code=404, detail="Todo not found")
+    if idempotency_key:
+        fingerprint = request_fingerprint("POST", "/todos", todo.model_dump(mode="json"))
+        stored = get_stored_response(db, owner_id, idempotency_key, fingerprint)
+        if stored:
+            return stored
     
-    # Update fields
-    update_data = todo_update.model_dump(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(db_todo, field, value)
-    
-    db.commit()
-    db.refresh(db_todo)
-    return db_todo
-
-
-@router.patch("/{todo_id}/status", response_model=TodoResponse)
-async def update_todo_status(
-    todo_id: str,
-    status_update: TodoStatusUpdate,
-    db: Session = Depends(get_db)
-):
-    """Cập nhật trạng thái của một todo"""
-    db_todo = db.query(Todo).filter(Todo.id == todo_id).first()
-    if not db_todo:
-        raise HTTPException(status_code=404, detail="Todo not found")
+    db_todo = Todo(owner_id=owner_id, **todo.model_dump())
+    db.add(db_todo)
+    if not idempotency_key:
+        db.commit()
+        db.refresh(db_todo)
+        return db_todo
     
-    db_todo.status = status_update.status
-    db.commit()
+    # Lưu response cùng transaction với todo để retry không bao giờ tạo bản ghi trùng
+    db.flush()
     db.refresh(db_todo)
-    return db_todo
-
-
-@router.delete("/{todo_id}", status_code=204)
-async def delete_todo(
-    todo_id: str,
-    db: Session = Depends(get_db)
-):
-    """Xóa một todo"""
-    db_todo = db.query(Todo).filter(Todo.id == todo_id).first()
-    if not db_todo:
-        raise HTTPException(status_code=404, detail="Todo not found")
-    
-    db.delete(db_todo)
-    db.commit()
-    return None
+    body = TodoResponse.model_validate(db_todo).model_dump(mode="json")
+    replayed = commit_with_response(db, owner_id, idempotency_key, fingerprint, 201, body)
+    return replayed or JSONResponse(status_code=201, content=body)
 
 
 @router.post("/search", response_model=TodoListResponse)
 async def search_todos(
     search_params: TodoSearchParams,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
+    owner_id: str = Depends(get_current_owner),
     page: int = Query(1, ge=1, description="Số trang"),
-    size: int = Query(10, ge=1, le=100, description="Số lượng items mỗi trang")
+    size: int = Query(10, ge=1, le=100, description="Số lượng items mỗi trang"),
+    include_archived: bool = Query(False, description="Gồm cả các todo đã lưu trữ")
 ):
     """Tìm kiếm nâng cao todos"""
-    # Base query
-    query = db.query(Todo)
-    
-    # Full text search
-    search_filter = or_(
-        Todo.title.ilike(f"%{search_params.query}%"),
-        Todo.description.ilike(f"%{search_params.query}%")
-    )
-    query = query.filter(search_filter)
-    
-    # Apply additional filters
-    if search_params.status:
-        query = query.filter(Todo.status == search_params.status)
-    if search_params.priority:
-        query = query.filter(Todo.priority == search_params.priority)
-    if search_params.tags:
-        for tag in search_params.tags:
-            query = query.filter(Todo.tags.contains([tag]))
-    if search_params.due_before:
-        query = query.filter(Todo.due_date <= search_params.due_before)
-    if search_params.due_after:
-        query = query.filter(Todo.due_date >= search_params.due_after)
-    
-    # Get total count for pagination
-    total = query.count()
-    total_pages = (total + size - 1) // size
+    def filters_for(model):
+        return _todo_filters(
+            model,
+            owner_id,
+            search_params.status,
+            search_params.priority,
+            search_params.query,
+            search_params.tags,
+            search_params.due_before,
+            search_params.due_after
+        )
     
-    # Apply pagination
-    query = query.order_by(Todo.created_at.desc())
-    query = query.offset((page - 1) * size).limit(size)
+    return _paginate(db, filters_for, include_archived, page, size)
+
+
+@router.post("/batch-get", response_model=TodoBatchGetResponse)
+async def batch_get_todos(
+    batch_get: TodoBatchGet,
+    db: Session = Depends(get_read_db),
+    owner_id: str = Depends(get_current_owner)
+):
+    """Lấy nhiều todo theo id bằng một query IN, giữ thứ tự id yêu cầu"""
+    # Chuẩn hóa id rồi bỏ id trùng, giữ thứ tự; missing_ids trả lại id như client đã gửi
+    requested = {}
+    for todo_id in batch_get.ids:
+        requested.setdefault(canonical_id(todo_id), todo_id)
+    todo_ids = list(requested)
+    todo_map = {
+        todo.id: todo
+        for todo in db.query(Todo).filter(Todo.owner_id == owner_id, Todo.id.in_(todo_ids))
+    }
+    not_found = [todo_id for todo_id in todo_ids if todo_id not in todo_map]
+    if not_found:
+        # Giống GET /todos/{id}: todo đã lưu trữ vẫn đọc được
+        todo_map.update(
+            (todo.id, todo)
+            for todo in db.query(TodoArchive).filter(
+                TodoArchive.owner_id == owner_id, TodoArchive.id.in_(not_found)
+            )
+        )
     
-    return TodoListResponse(
-        todos=query.all(),
-        total=total,
-        page=page,
-        size=size,
-        total_pages=total_pages
+    return TodoBatchGetResponse(
+        todos=[todo_map[todo_id] for todo_id in todo_ids if todo_id in todo_map],
+        missing_ids=[requested[todo_id] for todo_id in todo_ids if todo_id not in todo_map]
     )
 
 
 @router.get("/stats", response_model=TodoStatsResponse)
 async def get_todo_stats(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
+    owner_id: str = Depends(get_current_owner),
     start_date: Optional[datetime] = Query(None, description="Ngày bắt đầu thống kê"),
-    end_date: Optional[datetime] = Query(None, description="Ngày kết thúc thống kê")
+    end_date: Optional[datetime] = Query(None, description="Ngày kết thúc thống kê"),
+    include_archived: bool = Query(True, description="Cộng cả các todo đã lưu trữ")
 ):
     """Lấy thống kê về todos"""
-    # Base query for todos, potentially filtered by date
-    base_todos_query = db.query(Todo)
+    # Base query for todos of the owner, potentially filtered by date
+    base_todos_query = db.query(Todo).filter(Todo.owner_id == owner_id)
     if start_date:
         base_todos_query = base_todos_query.filter(Todo.created_at >= start_date)
     if end_date:
@@ -230,14 +236,11 @@ async def get_todo_stats(
     )
     overdue_todos = overdue_todos_query_base.count()
     
-    # Calculate completion rate
-    completion_rate = (completed_todos / total_todos * 100) if total_todos > 0 else 0
-    
     # Get todos by priority, applying date filters
     priority_query = db.query(
         Todo.priority,
-        func.count(Todo.id).label("count")
-    )
+        func.count().label("count")
+    ).filter(Todo.owner_id == owner_id)
     if start_date:
         priority_query = priority_query.filter(Todo.created_at >= start_date)
     if end_date:
@@ -248,8 +251,8 @@ async def get_todo_stats(
     # Get todos by status, applying date filters
     status_query = db.query(
         Todo.status,
-        func.count(Todo.id).label("count")
-    )
+        func.count().label("count")
+    ).filter(Todo.owner_id == owner_id)
     if start_date:
         status_query = status_query.filter(Todo.created_at >= start_date)
     if end_date:
@@ -257,18 +260,23 @@ async def get_todo_stats(
     status_stats = status_query.group_by(Todo.status).all()
     todos_by_status = {s.status.value: s.count for s in status_stats if s.status}
     
-    # Get todos by tag using the date-filtered query results
-    tag_stats = {}
-    all_filtered_todos = base_todos_query.all() # Use already filtered todos
-    for todo in all_filtered_todos:
-        for tag in (todo.tags or []):
-            tag_stats[tag] = tag_stats.get(tag, 0) + 1
+    # Get todos by tag, counted in SQL (one row per tag) instead of loading every todo
+    tags = tag_elements(Todo.tags, db.get_bind().dialect.name)
+    tag_query = select(tags.c.value, func.count()).select_from(Todo).join(tags, true()).where(
+        Todo.owner_id == owner_id
+    )
+    if start_date:
+        tag_query = tag_query.where(Todo.created_at >= start_date)
+    if end_date:
+        tag_query = tag_query.where(Todo.created_at <= end_date)
+    tag_stats = dict(db.execute(tag_query.group_by(tags.c.value)).all())
     
     # Get overdue todos by priority, applying date filters
     overdue_priority_query = db.query(
         Todo.priority,
-        func.count(Todo.id).label("count")
+        func.count().label("count")
     ).filter(
+        Todo.owner_id == owner_id,
         Todo.due_date < now,
         Todo.status != TodoStatus.COMPLETED
     )
@@ -280,6 +288,24 @@ async def get_todo_stats(
     overdue_priority_stats = overdue_priority_query.group_by(Todo.priority).all()
     overdue_by_priority = {p.priority.value: p.count for p in overdue_priority_stats if p.priority}
     
+    # Todo đã lưu trữ đều completed và không quá hạn: chỉ cộng vào tổng, completed, priority, tag
+    if include_archived:
+        archived = get_archive_totals(db, owner_id, start_date, end_date)
+        total_todos += archived.total
+        completed_todos += archived.total
+        high_priority_todos += archived.by_priority.get(TodoPriority.HIGH.value, 0)
+        if archived.total:
+            todos_by_status[TodoStatus.COMPLETED.value] = (
+                todos_by_status.get(TodoStatus.COMPLETED.value, 0) + archived.total
+            )
+        for priority, count in archived.by_priority.items():
+            todos_by_priority[priority] = todos_by_priority.get(priority, 0) + count
+        for tag, count in archived.by_tag.items():
+            tag_stats[tag] = tag_stats.get(tag, 0) + count
+    
+    # Calculate completion rate
+    completion_rate = (completed_todos / total_todos * 100) if total_todos > 0 else 0
+    
     return TodoStatsResponse(
         total_todos=total_todos,
         completed_todos=completed_todos,
@@ -298,39 +324,74 @@ async def get_todo_stats(
 @router.post("/bulk", response_model=List[TodoResponse], status_code=201)
 async def create_bulk_todos(
     bulk_create: TodoBulkCreate,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_write_db),
+    owner_id: str = Depends(get_current_owner),
+    idempotency_key: Optional[str] = Header(
+        None, max_length=255, description="Retry với cùng key sẽ nhận lại response cũ thay vì tạo trùng"
+    ),
+    background: bool = Query(False, description="Tạo nền: trả về 202 kèm job, theo dõi qua GET /jobs/{id}")
 ):
     """Tạo nhiều todos cùng lúc"""
+    if idempotency_key:
+        path = "/todos/bulk?background=true" if background else "/todos/bulk"
+        fingerprint = request_fingerprint("POST", path, bulk_create.model_dump(mode="json"))
+        stored = get_stored_response(db, owner_id, idempotency_key, fingerprint)
+        if stored:
+            return stored
+    
+    if background:
+        job = add_job(db, owner_id, "bulk_create_todos", bulk_create.model_dump(mode="json"))
+        body = JobResponse.model_validate(job).model_dump(mode="json")
+        if idempotency_key:
+            replayed = commit_with_response(db, owner_id, idempotency_key, fingerprint, 202, body)
+            if replayed:
+                return replayed
+        else:
+            db.commit()
+        job_queue.notify()
+        return JSONResponse(status_code=202, content=body, headers={"Location": f"/jobs/{job.id}"})
+    
+    # Gán id (tăng theo thời gian) ngay khi tạo để cả batch được insert theo thứ tự khóa
     todos = []
     for todo_data in bulk_create.todos:
-        db_todo = Todo(**todo_data.model_dump())
+        db_todo = Todo(id=new_id(), owner_id=owner_id, **todo_data.model_dump())
         todos.append(db_todo)
     
     db.add_all(todos)
-    db.commit()
+    if not idempotency_key:
+        db.commit()
+        
+        # Refresh all todos to get their generated IDs
+        for todo in todos:
+            db.refresh(todo)
+        
+        return todos
     
-    # Refresh all todos to get their generated IDs
+    # Lưu response cùng transaction với các todo
+    db.flush()
     for todo in todos:
         db.refresh(todo)
-    
-    return todos
+    body = [TodoResponse.model_validate(todo).model_dump(mode="json") for todo in todos]
+    replayed = commit_with_response(db, owner_id, idempotency_key, fingerprint, 201, body)
+    return replayed or JSONResponse(status_code=201, content=body)
 
 
 @router.put("/bulk", response_model=List[TodoResponse])
 async def update_bulk_todos(
     bulk_update: TodoBulkUpdate,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_write_db),
+    owner_id: str = Depends(get_current_owner)
 ):
     """Cập nhật nhiều todos cùng lúc"""
-    # Get all todos that need to be updated
-    todo_ids = list(bulk_update.updates.keys())
-    todos = db.query(Todo).filter(Todo.id.in_(todo_ids)).all()
+    # Get all todos that need to be updated (id chuẩn hóa để khớp id trả về từ database)
+    updates = {canonical_id(todo_id): update_data for todo_id, update_data in bulk_update.updates.items()}
+    todos = db.query(Todo).filter(Todo.owner_id == owner_id, Todo.id.in_(list(updates))).all()
     
     # Create a map of id to todo for easy access
     todo_map = {todo.id: todo for todo in todos}
     
     # Check if all todos exist
-    missing_ids = set(todo_ids) - set(todo_map.keys())
+    missing_ids = set(updates) - set(todo_map.keys())
     if missing_ids:
         raise HTTPException(
             status_code=404,
@@ -338,7 +399,7 @@ async def update_bulk_todos(
         )
     
     # Update each todo
-    for todo_id, update_data in bulk_update.updates.items():
+    for todo_id, update_data in updates.items():
         todo = todo_map[todo_id]
         update_dict = update_data.model_dump(exclude_unset=True)
         for field, value in update_dict.items():
@@ -350,4 +411,92 @@ async def update_bulk_todos(
     for todo in todos:
         db.refresh(todo)
     
-    return todos 
\ No newline at end of file
+    return todos 
+
+
+@router.post("/archive", response_model=JobResponse, status_code=202)
+async def archive_todos(
+    response: Response,
+    db: Session = Depends(get_write_db),
+    owner_id: str = Depends(get_current_owner),
+    older_than_days: Optional[int] = Query(
+        None, ge=0, description="Số ngày từ lần cập nhật cuối (mặc định ARCHIVE_AFTER_DAYS)"
+    )
+):
+    """Chuyển các todo completed lâu ngày của owner sang archive (chạy nền, theo dõi qua GET /jobs/{id})"""
+    job = enqueue_job(db, owner_id, "archive", {"older_than_days": older_than_days})
+    response.headers["Location"] = f"/jobs/{job.id}"
+    return job
+
+
+# Các route có path parameter đặt sau cùng để không che các route tĩnh (/stats, /bulk)
+@router.get("/{todo_id}", response_model=TodoResponse)
+async def get_todo(
+    todo_id: str,
+    db: Session = Depends(get_read_db),
+    owner_id: str = Depends(get_current_owner)
+):
+    """Lấy chi tiết một todo"""
+    todo = db.query(Todo).filter(Todo.owner_id == owner_id, Todo.id == todo_id).first()
+    if not todo:
+        # Todo đã lưu trữ vẫn đọc được (chỉ đọc)
+        todo = db.query(TodoArchive).filter(TodoArchive.owner_id == owner_id, TodoArchive.id == todo_id).first()
+    if not todo:
+        raise HTTPException(status_code=404, detail="Todo not found")
+    return todo
+
+
+@router.put("/{todo_id}", response_model=TodoResponse)
+async def update_todo(
+    todo_id: str,
+    todo_update: TodoUpdate,
+    db: Session = Depends(get_write_db),
+    owner_id: str = Depends(get_current_owner)
+):
+    """Cập nhật toàn bộ thông tin của một todo"""
+    db_todo = db.query(Todo).filter(Todo.owner_id == owner_id, Todo.id == todo_id).first()
+    if not db_todo:
+        raise HTTPException(status_code=404, detail="Todo not found")
+    
+    # Update fields
+    update_data = todo_update.model_dump(exclude_unset=True)
+    for field, value in update_data.items():
+        setattr(db_todo, field, value)
+    
+    db.commit()
+    db.refresh(db_todo)
+    return db_todo
+
+
+@router.patch("/{todo_id}/status", response_model=TodoResponse)
+async def update_todo_status(
+    todo_id: str,
+    status_update: TodoStatusUpdate,
+    db: Session = Depends(get_write_db),
+    owner_id: str = Depends(get_current_owner)
+):
+    """Cập nhật trạng thái của một todo"""
+    db_todo = db.query(Todo).filter(Todo.owner_id == owner_id, Todo.id == todo_id).first()
+    if not db_todo:
+        raise HTTPException(status_code=404, detail="Todo not found")
+    
+    db_todo.status = status_update.status
+    db.commit()
+    db.refresh(db_todo)
+    return db_todo
+
+
+@router.delete("/{todo_id}", status_code=204)
+async def delete_todo(
+    todo_id: str,
+    db: Session = Depends(get_write_db),
+    owner_id: str = Depends(get_current_owner)
+):
+    """Xóa một todo"""
+    db_todo = db.query(Todo).filter(Todo.owner_id == owner_id, Todo.id == todo_id).first()
+    if not db_todo:
+        raise HTTPException(status_code=404, detail="Todo not found")
+    
+    db.delete(db_todo)
+    db.commit()
+    return None
@@ -9,8 +9,11 @@ from .todo import (
     TodoStatsResponse,
     TodoSearchParams,
     TodoBulkCreate,
-    TodoBulkUpdate
+    TodoBulkUpdate,
+    TodoBatchGet,
+    TodoBatchGetResponse
 )
+from .job import JobResponse
 
 __all__ = [
     "TodoBase",
@@ -22,5 +25,8 @@ __all__ = [
     "TodoStatsResponse",
     "TodoSearchParams",
     "TodoBulkCreate",
-    "TodoBulkUpdate"
+    "TodoBulkUpdate",
+    "TodoBatchGet",
+    "TodoBatchGetResponse",
+    "JobResponse"
 ] 
\ No newline at end of file
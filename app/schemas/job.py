@@ -0,0 +1,18 @@
+from pydantic import BaseModel, Field, ConfigDict
+from typing import Optional, Any
+from datetime import datetime
+from app.models.job import JobStatus
+
+
+class JobResponse(BaseModel):
+    """Schema cho response Job"""
+    id: str
+    kind: str = Field(..., description="Loại job")
+    status: JobStatus
+    result: Optional[Any] = Field(None, description="Kết quả khi job chạy xong")
+    error: Optional[str] = Field(None, description="Lỗi khi job thất bại")
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    
+    model_config = ConfigDict(from_attributes=True)
@@ -1,6 +1,7 @@
-from pydantic import BaseModel, Field, ConfigDict
+from pydantic import BaseModel, Field, ConfigDict, field_validator
 from typing import Optional, List, Dict
 from datetime import datetime
+from app.config import settings
 from app.models.todo import TodoStatus, TodoPriority
 
 
@@ -87,4 +88,22 @@ class TodoBulkUpdate(BaseModel):
     updates: Dict[str, TodoUpdate] = Field(
         ...,
         description="Dict với key là todo_id và value là thông tin cập nhật"
-    ) 
\ No newline at end of file
+    ) 
+
+
+class TodoBatchGet(BaseModel):
+    """Schema cho lấy nhiều todos theo id"""
+    ids: List[str] = Field(..., min_length=1, description="Danh sách todo_id (tối đa BATCH_GET_MAX_IDS)")
+
+    @field_validator("ids")
+    @classmethod
+    def check_max_ids(cls, ids: List[str]) -> List[str]:
+        if len(ids) > settings.BATCH_GET_MAX_IDS:
+            raise ValueError(f"At most {settings.BATCH_GET_MAX_IDS} ids per request")
+        return ids
+
+
+class TodoBatchGetResponse(BaseModel):
+    """Schema cho response lấy nhiều todos: theo thứ tự id yêu cầu, kèm các id không tìm thấy"""
+    todos: List[TodoResponse]
+    missing_ids: List[str]
@@ -1,12 +1,13 @@
 """
 Script để tạo sample data cho development
+
+Cần dữ liệu lớn cho đo hiệu năng: python -m benchmarks.seed --database-url <url> --rows 1000000
 """
-import asyncio
 from datetime import datetime, timedelta
-from sqlalchemy.orm import sessionmaker
-from sqlalchemy import create_engine
+from sqlalchemy import func
 
-from app.database import SQLALCHEMY_DATABASE_URL
+from app.config import settings
+from app.database import Base, SessionLocal, engine
 from app.models import Todo, TodoStatus, TodoPriority
 
 
@@ -97,9 +98,7 @@ SAMPLE_TODOS = [
 
 def create_sample_todos():
     """Tạo sample todos trong database"""
-    # Create engine and session
-    engine = create_engine(SQLALCHEMY_DATABASE_URL, echo=True)
-    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    Base.metadata.create_all(bind=engine)
     
     db = SessionLocal()
     try:
@@ -112,7 +111,7 @@ def create_sample_todos():
         # Create sample todos
         todos = []
         for todo_data in SAMPLE_TODOS:
-            todo = Todo(**todo_data)
+            todo = Todo(owner_id=settings.DEFAULT_OWNER_ID, **todo_data)
             todos.append(todo)
         
         # Add all todos to database
@@ -121,10 +120,10 @@ def create_sample_todos():
         
         print(f"Successfully created {len(todos)} sample todos!")
         
-        # Print summary
+        # Print summary (một truy vấn GROUP BY thay vì count() cho từng trạng thái)
+        counts = dict(db.query(Todo.status, func.count(Todo.id)).group_by(Todo.status).all())
         for status in TodoStatus:
-            count = db.query(Todo).filter(Todo.status == status).count()
-            print(f"- {status.value}: {count} todos")
+            print(f"- {status.value}: {counts.get(status, 0)} todos")
             
     except Exception as e:
         print(f"Error creating sample todos: {e}")
@@ -0,0 +1,181 @@
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional
+import asyncio
+import logging
+import time
+
+from sqlalchemy import delete, func, insert, select, true
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import SessionLocal
+from app.metrics import metrics
+from app.models import Todo, TodoArchive, TodoArchiveStat, TodoStatus
+from app.models.types import tag_elements
+
+logger = logging.getLogger(__name__)
+
+# Số lần thử lại một batch khi xung đột với lần archive khác chạy đồng thời
+MAX_BATCH_RETRIES = 3
+
+
+@dataclass
+class ArchiveTotals:
+    """Số todo đã lưu trữ (đều ở trạng thái completed) của một owner"""
+    total: int = 0
+    by_priority: Dict[str, int] = field(default_factory=dict)
+    by_tag: Dict[str, int] = field(default_factory=dict)
+
+
+def archive_completed_todos(
+    db: Session,
+    owner_id: Optional[str] = None,
+    older_than_days: Optional[int] = None,
+    batch_size: Optional[int] = None,
+) -> int:
+    """Chuyển các todo completed không thay đổi trong `older_than_days` ngày sang todos_archive.
+
+    Mỗi batch là một transaction: copy sang archive, cộng vào todos_archive_stats rồi xóa khỏi todos.
+    Trả về số todo đã chuyển.
+    """
+    if older_than_days is None:
+        older_than_days = settings.ARCHIVE_AFTER_DAYS
+    batch_size = batch_size or settings.ARCHIVE_BATCH_SIZE
+    cutoff = datetime.now(timezone.utc) - timedelta(days=older_than_days)
+    
+    todos = Todo.__table__
+    eligible = [todos.c.status == TodoStatus.COMPLETED, todos.c.updated_at < cutoff]
+    if owner_id is not None:
+        eligible.append(todos.c.owner_id == owner_id)
+    
+    started = time.perf_counter()
+    archived = 0
+    retries = 0
+    while True:
+        rows = db.execute(select(todos).where(*eligible).limit(batch_size)).mappings().all()
+        if not rows:
+            break
+        if _archive_batch(db, rows, eligible):
+            archived += len(rows)
+            continue
+        retries += 1
+        if retries > MAX_BATCH_RETRIES:
+            logger.warning("Archive stopped after repeated conflicts")
+            break
+    
+    if archived:
+        metrics.increment("archive.archived", archived)
+    metrics.observe("archive.run_seconds", time.perf_counter() - started)
+    return archived
+
+
+def _archive_batch(db: Session, rows, eligible: list) -> bool:
+    """Chuyển một batch trong một transaction, False nếu xung đột với thay đổi đồng thời"""
+    todos = Todo.__table__
+    archived_at = datetime.now(timezone.utc)
+    try:
+        db.execute(insert(TodoArchive.__table__), [{**row, "archived_at": archived_at} for row in rows])
+        deleted = db.execute(
+            delete(todos).where(todos.c.id.in_([row["id"] for row in rows]), *eligible)
+        ).rowcount
+        if deleted != len(rows):
+            # Có todo vừa bị sửa, không còn đủ điều kiện archive
+            db.rollback()
+            return False
+        _add_archive_stats(db, rows)
+        db.commit()
+    except IntegrityError:
+        # Lần archive khác (worker khác) đã chuyển batch này trước
+        db.rollback()
+        return False
+    return True
+
+
+def _add_archive_stats(db: Session, rows) -> None:
+    """Cộng số todo vừa archive vào thống kê tính sẵn theo owner/priority/tag"""
+    counts = Counter()
+    for row in rows:
+        counts[(row["owner_id"], "priority", row["priority"].value)] += 1
+        for tag in row["tags"] or []:
+            counts[(row["owner_id"], "tag", tag)] += 1
+    
+    if not counts:
+        return
+    
+    # Cộng trong SQL (upsert) thay vì đọc rồi ghi lại: hai lần archive đồng thời của cùng owner
+    # không ghi đè lên nhau. Sắp xếp key để các transaction khóa dòng theo cùng thứ tự
+    dialect_insert = postgresql.insert if db.get_bind().dialect.name == "postgresql" else sqlite.insert
+    stmt = dialect_insert(TodoArchiveStat)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["owner_id", "kind", "value"],
+        set_={"count": TodoArchiveStat.count + stmt.excluded.count}
+    )
+    db.execute(stmt, [
+        {"owner_id": owner_id, "kind": kind, "value": value, "count": count}
+        for (owner_id, kind, value), count in sorted(counts.items())
+    ])
+
+
+def get_archive_totals(
+    db: Session,
+    owner_id: str,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+) -> ArchiveTotals:
+    """Số todo đã lưu trữ của owner.
+
+    Không lọc theo ngày: đọc từ todos_archive_stats (tính sẵn khi archive).
+    Có lọc theo ngày tạo: đếm trên todos_archive (index owner_id, created_at).
+    """
+    totals = ArchiveTotals()
+    if start_date is None and end_date is None:
+        stats = db.query(TodoArchiveStat).filter(TodoArchiveStat.owner_id == owner_id).all()
+        for stat in stats:
+            if stat.kind == "priority":
+                totals.by_priority[stat.value] = stat.count
+            else:
+                totals.by_tag[stat.value] = stat.count
+        totals.total = sum(totals.by_priority.values())
+        return totals
+    
+    filters = [TodoArchive.owner_id == owner_id]
+    if start_date:
+        filters.append(TodoArchive.created_at >= start_date)
+    if end_date:
+        filters.append(TodoArchive.created_at <= end_date)
+    
+    priority_stats = db.query(
+        TodoArchive.priority,
+        func.count().label("count")
+    ).filter(*filters).group_by(TodoArchive.priority).all()
+    totals.by_priority = {p.priority.value: p.count for p in priority_stats}
+    totals.total = sum(totals.by_priority.values())
+    
+    tags = tag_elements(TodoArchive.tags, db.get_bind().dialect.name)
+    tag_stats = db.execute(
+        select(tags.c.value, func.count()).select_from(TodoArchive).join(tags, true())
+        .where(*filters).group_by(tags.c.value)
+    ).all()
+    totals.by_tag = {tag: count for tag, count in tag_stats}
+    return totals
+
+
+def _archive_once() -> int:
+    with SessionLocal() as db:
+        return archive_completed_todos(db)
+
+
+async def run_archive_loop() -> None:
+    """Archive định kỳ mỗi ARCHIVE_INTERVAL_SECONDS (chạy trong thread riêng để không chặn event loop)"""
+    while True:
+        try:
+            archived = await asyncio.to_thread(_archive_once)
+            if archived:
+                logger.info(f"Archived {archived} completed todos")
+        except Exception as e:
+            logger.error(f"Error archiving todos: {e}")
+        await asyncio.sleep(settings.ARCHIVE_INTERVAL_SECONDS)
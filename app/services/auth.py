@@ -0,0 +1,68 @@
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+import jwt
+from fastapi import Depends, HTTPException
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+
+from app.config import DEFAULT_SECRET_KEY, settings
+
+# Độ dài tối đa của owner id (cột todos.owner_id)
+OWNER_ID_MAX_LENGTH = 64
+
+bearer_scheme = HTTPBearer(auto_error=False)
+
+
+def secret_key_configured() -> bool:
+    """SECRET_KEY đã được đổi khỏi giá trị mẫu công khai chưa"""
+    return bool(settings.SECRET_KEY) and settings.SECRET_KEY != DEFAULT_SECRET_KEY
+
+
+def create_access_token(owner_id: str, expires_delta: Optional[timedelta] = None) -> str:
+    """Tạo JWT cho owner (user/workspace)"""
+    if not secret_key_configured():
+        raise RuntimeError("SECRET_KEY is not configured; refusing to issue tokens")
+    expire = datetime.now(timezone.utc) + (
+        expires_delta or timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+    )
+    payload = {settings.OWNER_CLAIM: owner_id, "exp": expire}
+    return jwt.encode(payload, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+
+
+def _unauthorized(detail: str) -> HTTPException:
+    return HTTPException(status_code=401, detail=detail, headers={"WWW-Authenticate": "Bearer"})
+
+
+def decode_access_token(token: str) -> str:
+    """Kiểm tra JWT và trả về owner id"""
+    if not secret_key_configured():
+        # Ai cũng ký được token với key mẫu: không tin token nào
+        raise _unauthorized("Token authentication is not configured")
+    try:
+        # Token không có hạn hoặc không có owner bị từ chối
+        payload = jwt.decode(
+            token,
+            settings.SECRET_KEY,
+            algorithms=[settings.ALGORITHM],
+            options={"require": ["exp", settings.OWNER_CLAIM]}
+        )
+    except jwt.ExpiredSignatureError:
+        raise _unauthorized("Token has expired")
+    except jwt.InvalidTokenError:
+        raise _unauthorized("Invalid token")
+    
+    owner_id = payload.get(settings.OWNER_CLAIM)
+    if not isinstance(owner_id, str) or not 0 < len(owner_id) <= OWNER_ID_MAX_LENGTH:
+        raise _unauthorized("Invalid token")
+    return owner_id
+
+
+def get_current_owner(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(bearer_scheme)
+) -> str:
+    """Dependency lấy owner của request từ header Authorization: Bearer <token>"""
+    if credentials is None:
+        if settings.AUTH_REQUIRED:
+            raise _unauthorized("Not authenticated")
+        return settings.DEFAULT_OWNER_ID
+    return decode_access_token(credentials.credentials)
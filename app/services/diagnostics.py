@@ -0,0 +1,206 @@
+from typing import Dict, List, Optional
+import asyncio
+import logging
+import os
+import time
+
+import anyio.to_thread
+from sqlalchemy import func, select
+from sqlalchemy.engine import Connection, Engine
+
+from app.config import settings
+from app.database import engine, pool_status, probe_engine, read_engines
+from app.metrics import metrics
+from app.middleware import ConcurrencyLimiter
+from app.models import Job, JobStatus
+
+logger = logging.getLogger(__name__)
+
+
+class EventLoopMonitor:
+    """Đo độ trễ của event loop: sleep một khoảng cố định và so với thời gian thực tế đã trôi qua"""
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.lag = 0.0  # lần đo gần nhất (giây)
+        self.max_lag = 0.0  # lớn nhất kể từ lần đọc trước
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+
+    def read(self) -> dict:
+        """Độ trễ gần nhất và lớn nhất từ lần đọc trước (reset giá trị lớn nhất)"""
+        result = {"lag_seconds": self.lag, "max_lag_seconds": self.max_lag}
+        self.max_lag = self.lag
+        return result
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            started = loop.time()
+            await asyncio.sleep(self.interval)
+            self.lag = max(0.0, loop.time() - started - self.interval)
+            self.max_lag = max(self.max_lag, self.lag)
+            metrics.set_gauge("event_loop.lag_seconds", self.lag)
+
+
+loop_monitor = EventLoopMonitor(settings.DIAGNOSTICS_LOOP_INTERVAL_SECONDS)
+
+
+def _sqlite_stats(conn: Connection, db_engine: Engine) -> dict:
+    """Kích thước file WAL và page cache của SQLite.
+
+    Số lần hit/miss của page cache chỉ có qua C API (sqlite3_db_status), module sqlite3 không cung cấp.
+    """
+    pragmas = {
+        name: conn.exec_driver_sql(f"PRAGMA {name}").scalar()
+        for name in ("journal_mode", "page_size", "page_count", "freelist_count", "cache_size")
+    }
+    cache_size = pragmas["cache_size"]
+    stats = {
+        **pragmas,
+        # cache_size âm là giới hạn theo KiB, dương là số page
+        "cache_bytes": -cache_size * 1024 if cache_size < 0 else cache_size * pragmas["page_size"],
+        "wal_bytes": None,
+    }
+    path = db_engine.url.database
+    if path and path != ":memory:":
+        wal_path = path.removeprefix("file:") + "-wal"
+        stats["wal_bytes"] = os.path.getsize(wal_path) if os.path.exists(wal_path) else 0
+    return stats
+
+
+def _postgresql_stats(conn: Connection) -> dict:
+    """Tỷ lệ hit buffer cache của database hiện tại"""
+    blocks_hit, blocks_read = conn.exec_driver_sql(
+        "SELECT blks_hit, blks_read FROM pg_stat_database WHERE datname = current_database()"
+    ).one()
+    total = blocks_hit + blocks_read
+    return {
+        "blocks_hit": blocks_hit,
+        "blocks_read": blocks_read,
+        "hit_ratio": round(blocks_hit / total, 4) if total else None,
+    }
+
+
+def _job_counts(conn: Connection) -> dict:
+    """Số job đang chờ và đang chạy (toàn bộ process dùng chung database)"""
+    rows = conn.execute(
+        select(Job.status, func.count())
+        .where(Job.status.in_([JobStatus.QUEUED, JobStatus.RUNNING]))
+        .group_by(Job.status)
+    ).all()
+    counts = {status.value: count for status, count in rows}
+    return {"queued": counts.get("queued", 0), "running": counts.get("running", 0)}
+
+
+def _probe(db_engine: Engine, include_jobs: bool) -> dict:
+    """Round-trip SELECT 1 (gồm cả thời gian mở kết nối) và thống kê theo backend"""
+    started = time.perf_counter()
+    with db_engine.connect() as conn:
+        conn.exec_driver_sql("SELECT 1")
+        result = {"latency_seconds": time.perf_counter() - started}
+        if conn.dialect.name == "sqlite":
+            result["sqlite"] = _sqlite_stats(conn, db_engine)
+        elif conn.dialect.name == "postgresql":
+            result["cache"] = _postgresql_stats(conn)
+        if include_jobs:
+            result["jobs"] = _job_counts(conn)
+    return result
+
+
+# Probe đang chạy của mỗi engine
+_in_flight: Dict[Engine, asyncio.Task] = {}
+
+
+def _start_probe(db_engine: Engine, include_jobs: bool) -> asyncio.Task:
+    """Probe đang chạy của engine, hoặc probe mới nếu chưa có.
+
+    Thread của probe bị timeout vẫn chạy đến khi xong: các lần gọi sau dùng lại kết quả của nó
+    thay vì mở thêm thread, nên mỗi engine có tối đa một thread probe.
+    """
+    task = _in_flight.get(db_engine)
+    if task is not None and task.get_loop() is asyncio.get_running_loop():
+        return task
+    timeout = settings.DIAGNOSTICS_DB_TIMEOUT_SECONDS
+    task = asyncio.ensure_future(asyncio.to_thread(_probe, probe_engine(db_engine, timeout), include_jobs))
+    _in_flight[db_engine] = task
+
+    def _done(done: asyncio.Task) -> None:
+        if _in_flight.get(db_engine) is done:
+            del _in_flight[db_engine]
+        if not done.cancelled():
+            done.exception()  # lỗi đã được báo cho các request đang chờ (nếu có)
+
+    task.add_done_callback(_done)
+    return task
+
+
+async def _check_engine(db_engine: Engine, include_jobs: bool = False) -> dict:
+    result = {"pool": pool_status(db_engine)}
+    try:
+        result.update(await asyncio.wait_for(
+            asyncio.shield(_start_probe(db_engine, include_jobs)), settings.DIAGNOSTICS_DB_TIMEOUT_SECONDS
+        ))
+    except asyncio.TimeoutError:
+        result["error"] = f"timed out after {settings.DIAGNOSTICS_DB_TIMEOUT_SECONDS}s"
+    except Exception as e:
+        logger.warning(f"Database probe failed: {e}")
+        result["error"] = str(e)
+    return result
+
+
+def _saturation_reasons(name: str, check: dict) -> List[str]:
+    reasons = []
+    if "error" in check:
+        reasons.append(f"{name}: {check['error']}")
+    elif check["latency_seconds"] > settings.DIAGNOSTICS_MAX_DB_LATENCY_SECONDS:
+        reasons.append(f"{name}: latency {check['latency_seconds']:.3f}s")
+    pool = check["pool"]
+    if "max_overflow" in pool and pool["checked_out"] >= pool["size"] + pool["max_overflow"]:
+        reasons.append(f"{name}: connection pool exhausted")
+    return reasons
+
+
+async def collect_diagnostics(expensive_limiter: ConcurrencyLimiter) -> dict:
+    """Trạng thái chi tiết của worker và danh sách lý do nếu worker đang quá tải"""
+    primary, *replicas = await asyncio.gather(
+        _check_engine(engine, include_jobs=True),
+        *(_check_engine(read_engine) for read_engine in read_engines),
+    )
+    event_loop = loop_monitor.read()
+    # Endpoint sync (def) chạy trong thread pool của anyio
+    thread_limiter = anyio.to_thread.current_default_thread_limiter()
+
+    reasons = _saturation_reasons("primary", primary)
+    for index, replica in enumerate(replicas):
+        reasons += _saturation_reasons(f"replica {index}", replica)
+    if event_loop["max_lag_seconds"] > settings.DIAGNOSTICS_MAX_LOOP_LAG_SECONDS:
+        reasons.append(f"event loop lag {event_loop['max_lag_seconds']:.3f}s")
+    if thread_limiter.borrowed_tokens >= thread_limiter.total_tokens:
+        reasons.append("thread pool exhausted")
+    if expensive_limiter.in_flight >= expensive_limiter.limit:
+        reasons.append("expensive routes at concurrency limit")
+
+    jobs = primary.pop("jobs", None)
+    return {
+        "status": "saturated" if reasons else "ok",
+        "reasons": reasons,
+        "database": {"primary": primary, "replicas": replicas},
+        "event_loop": event_loop,
+        "queues": {
+            "jobs": jobs,
+            "expensive_in_flight": expensive_limiter.in_flight,
+            "expensive_limit": expensive_limiter.limit,
+            "threads_in_use": thread_limiter.borrowed_tokens,
+            "threads_limit": thread_limiter.total_tokens,
+        },
+    }
@@ -0,0 +1,137 @@
+from datetime import datetime, timedelta, timezone
+from typing import Any, Optional
+import hashlib
+import json
+import logging
+import time
+
+from fastapi import HTTPException
+from fastapi.responses import JSONResponse
+from sqlalchemy import delete, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.metrics import metrics
+from app.models import IdempotencyKey
+
+logger = logging.getLogger(__name__)
+
+REPLAYED_HEADER = "Idempotent-Replayed"
+
+_last_purge = 0.0
+
+
+def request_fingerprint(method: str, path: str, payload: Any) -> str:
+    """Hash của request để phát hiện cùng một key bị dùng cho request khác"""
+    body = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(f"{method} {path}\n{body}".encode()).hexdigest()
+
+
+def _replay(record: IdempotencyKey) -> JSONResponse:
+    metrics.increment("idempotency.replayed")
+    headers = {REPLAYED_HEADER: "true"}
+    if record.status_code == 202:
+        # Response 202 là job chạy nền: dựng lại Location từ id job đã lưu trong body
+        headers["Location"] = f"/jobs/{record.response_body['id']}"
+    return JSONResponse(
+        status_code=record.status_code,
+        content=record.response_body,
+        headers=headers,
+    )
+
+
+def get_stored_response(db: Session, owner_id: str, key: str, fingerprint: str) -> Optional[JSONResponse]:
+    """Response đã lưu cho key của owner (nếu còn hạn), None nếu đây là lần gọi đầu tiên"""
+    record = db.get(IdempotencyKey, (owner_id, key))
+    if record is None:
+        return None
+    if _utc(record.created_at) < _cutoff():
+        # Key đã hết hạn: coi như chưa từng dùng
+        db.delete(record)
+        db.flush()
+        return None
+    if record.request_fingerprint != fingerprint:
+        raise HTTPException(
+            status_code=422,
+            detail="Idempotency-Key has already been used for a different request"
+        )
+    return _replay(record)
+
+
+def commit_with_response(
+    db: Session,
+    owner_id: str,
+    key: str,
+    fingerprint: str,
+    status_code: int,
+    response_body: Any,
+) -> Optional[JSONResponse]:
+    """Lưu response cùng transaction với dữ liệu rồi commit.
+
+    Nếu một request đồng thời với cùng key đã commit trước, rollback thay đổi hiện tại
+    và trả về response của request đó.
+    """
+    db.add(IdempotencyKey(
+        owner_id=owner_id,
+        key=key,
+        request_fingerprint=fingerprint,
+        status_code=status_code,
+        response_body=response_body,
+    ))
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        stored = get_stored_response(db, owner_id, key, fingerprint)
+        if stored is None:
+            raise HTTPException(status_code=409, detail="Request with this Idempotency-Key is in progress")
+        return stored
+    metrics.increment("idempotency.stored")
+    _maybe_purge(db)
+    return None
+
+
+def _utc(value: datetime) -> datetime:
+    # SQLite trả về datetime không có timezone (giá trị lưu là UTC); PostgreSQL trả về
+    # datetime có timezone của session, giữ nguyên để không dịch thời điểm
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+def _cutoff() -> datetime:
+    return datetime.now(timezone.utc) - timedelta(seconds=settings.IDEMPOTENCY_TTL_SECONDS)
+
+
+def purge_idempotency_keys(db: Session) -> int:
+    """Xóa key hết hạn và giữ tối đa IDEMPOTENCY_MAX_KEYS key mới nhất"""
+    deleted = db.execute(
+        delete(IdempotencyKey).where(IdempotencyKey.created_at < _cutoff())
+    ).rowcount
+    oldest_kept = db.execute(
+        select(IdempotencyKey.created_at)
+        .order_by(IdempotencyKey.created_at.desc())
+        .offset(settings.IDEMPOTENCY_MAX_KEYS - 1)
+        .limit(1)
+    ).scalar()
+    if oldest_kept is not None:
+        deleted += db.execute(
+            delete(IdempotencyKey).where(IdempotencyKey.created_at < oldest_kept)
+        ).rowcount
+    db.commit()
+    return deleted
+
+
+def _maybe_purge(db: Session) -> None:
+    """Dọn bảng định kỳ (tối đa mỗi IDEMPOTENCY_PURGE_INTERVAL_SECONDS một lần)"""
+    global _last_purge
+    now = time.monotonic()
+    if now - _last_purge < settings.IDEMPOTENCY_PURGE_INTERVAL_SECONDS:
+        return
+    _last_purge = now
+    try:
+        deleted = purge_idempotency_keys(db)
+        if deleted:
+            metrics.increment("idempotency.evicted", deleted)
+    except Exception as e:
+        db.rollback()
+        logger.warning(f"Error purging idempotency keys: {e}")
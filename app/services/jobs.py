@@ -0,0 +1,288 @@
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional
+import asyncio
+import logging
+import threading
+import time
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import SessionLocal
+from app.metrics import metrics
+from app.models import Job, JobStatus, Todo
+from app.models.ids import new_id
+from app.schemas import TodoBulkCreate
+from app.services.archive import archive_completed_todos
+
+logger = logging.getLogger(__name__)
+
+JobHandler = Callable[[Session, Job], Any]
+
+_last_purge = 0.0
+
+
+def _run_archive(db: Session, job: Job) -> dict:
+    # Chạy lại an toàn: chỉ chuyển các todo còn trong bảng todos
+    archived = archive_completed_todos(
+        db, owner_id=job.owner_id, older_than_days=(job.payload or {}).get("older_than_days")
+    )
+    return {"archived": archived}
+
+
+def _run_bulk_create_todos(db: Session, job: Job) -> dict:
+    payload = job.payload or {}
+    bulk_create = TodoBulkCreate.model_validate(payload)
+    ids = payload.get("ids")
+    if ids is None:
+        # Lưu id vào payload trước khi insert: job chạy lại (process dừng sau khi đã commit todo)
+        # dùng lại đúng các id này nên không tạo todo trùng
+        ids = [new_id() for _ in bulk_create.todos]
+        job.payload = {**payload, "ids": ids}
+        db.commit()
+    
+    existing = set(db.scalars(select(Todo.id).where(Todo.id.in_(ids))))
+    db.add_all([
+        Todo(id=todo_id, owner_id=job.owner_id, **todo_data.model_dump())
+        for todo_id, todo_data in zip(ids, bulk_create.todos)
+        if todo_id not in existing
+    ])
+    db.commit()
+    return {"created": len(ids), "ids": ids}
+
+
+# Các loại job: handler(db, job) chạy trong thread riêng, phải chạy lại được an toàn
+# (job bị gián đoạn được chạy lại), trả về kết quả dạng JSON
+JOB_HANDLERS: Dict[str, JobHandler] = {
+    "archive": _run_archive,
+    "bulk_create_todos": _run_bulk_create_todos,
+}
+
+
+def add_job(db: Session, owner_id: str, kind: str, payload: Optional[dict] = None) -> Job:
+    """Thêm job vào queue trong transaction hiện tại (gọi job_queue.notify() sau khi commit)"""
+    if kind not in JOB_HANDLERS:
+        raise ValueError(f"Unknown job kind: {kind}")
+    job = Job(owner_id=owner_id, kind=kind, payload=payload or {})
+    db.add(job)
+    db.flush()
+    metrics.increment("jobs.enqueued")
+    return job
+
+
+def enqueue_job(db: Session, owner_id: str, kind: str, payload: Optional[dict] = None) -> Job:
+    """Thêm job, commit và đánh thức worker"""
+    job = add_job(db, owner_id, kind, payload)
+    db.commit()
+    db.refresh(job)
+    job_queue.notify()
+    return job
+
+
+def _utc(value: datetime) -> datetime:
+    # SQLite trả về datetime không có timezone (giá trị lưu là UTC)
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+def _claim_next_job(db: Session) -> Optional[Job]:
+    """Chuyển job đang chờ lâu nhất sang running; UPDATE có điều kiện để mỗi job chỉ một worker nhận"""
+    while True:
+        job_id = db.scalar(
+            select(Job.id)
+            .where(Job.status == JobStatus.QUEUED)
+            .order_by(Job.created_at)
+            .limit(1)
+        )
+        if job_id is None:
+            return None
+        now = datetime.now(timezone.utc)
+        claimed = db.execute(
+            update(Job)
+            .where(Job.id == job_id, Job.status == JobStatus.QUEUED)
+            .values(status=JobStatus.RUNNING, started_at=now, heartbeat_at=now, attempts=Job.attempts + 1)
+        ).rowcount
+        db.commit()
+        if claimed:
+            return db.get(Job, job_id)
+
+
+def run_next_job() -> bool:
+    """Chạy một job đang chờ (gọi trong thread), False nếu queue rỗng"""
+    with SessionLocal() as db:
+        job = _claim_next_job(db)
+        if job is None:
+            _maybe_purge(db)
+            return False
+
+        kind = job.kind
+        metrics.observe("jobs.wait_seconds", (_utc(job.started_at) - _utc(job.created_at)).total_seconds())
+        started = time.perf_counter()
+        try:
+            with _Heartbeat(job.id):
+                result = JOB_HANDLERS[kind](db, job)
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Job {job.id} ({kind}) failed: {e}")
+            job.status = JobStatus.FAILED
+            job.error = str(e)
+            metrics.increment("jobs.failed")
+        else:
+            job.status = JobStatus.SUCCEEDED
+            job.result = result
+            metrics.increment("jobs.succeeded")
+        job.finished_at = datetime.now(timezone.utc)
+        db.commit()
+        metrics.observe(f"jobs.{kind}.duration_seconds", time.perf_counter() - started)
+        return True
+
+
+class _Heartbeat:
+    """Cập nhật heartbeat_at của job đang chạy mỗi JOB_HEARTBEAT_SECONDS (thread riêng, session riêng)"""
+
+    def __init__(self, job_id: str):
+        self.job_id = job_id
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=f"job-heartbeat-{job_id}", daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stop.wait(settings.JOB_HEARTBEAT_SECONDS):
+            try:
+                with SessionLocal() as db:
+                    db.execute(
+                        update(Job)
+                        .where(Job.id == self.job_id, Job.status == JobStatus.RUNNING)
+                        .values(heartbeat_at=datetime.now(timezone.utc))
+                    )
+                    db.commit()
+            except Exception as e:
+                logger.warning(f"Error updating heartbeat of job {self.job_id}: {e}")
+
+
+def requeue_stale_jobs(db: Session) -> int:
+    """Đưa các job running không có heartbeat trong JOB_STALE_SECONDS (process chạy job đã dừng)
+    về queue; job đã chạy JOB_MAX_ATTEMPTS lần bị đánh dấu failed. Trả về số job được chạy lại.
+    """
+    now = datetime.now(timezone.utc)
+    stale = [
+        Job.status == JobStatus.RUNNING,
+        Job.heartbeat_at < now - timedelta(seconds=settings.JOB_STALE_SECONDS)
+    ]
+    failed = db.execute(
+        update(Job)
+        .where(*stale, Job.attempts >= settings.JOB_MAX_ATTEMPTS)
+        .values(
+            status=JobStatus.FAILED,
+            error=f"Job interrupted {settings.JOB_MAX_ATTEMPTS} times",
+            finished_at=now
+        )
+    ).rowcount
+    requeued = db.execute(
+        update(Job)
+        .where(*stale)
+        .values(status=JobStatus.QUEUED, started_at=None, heartbeat_at=None)
+    ).rowcount
+    db.commit()
+    if failed:
+        metrics.increment("jobs.failed", failed)
+    return requeued
+
+
+def purge_finished_jobs(db: Session) -> int:
+    """Xóa job đã chạy xong quá JOB_RETENTION_SECONDS"""
+    cutoff = datetime.now(timezone.utc) - timedelta(seconds=settings.JOB_RETENTION_SECONDS)
+    deleted = db.execute(
+        delete(Job).where(
+            Job.status.in_([JobStatus.SUCCEEDED, JobStatus.FAILED]),
+            Job.finished_at < cutoff
+        )
+    ).rowcount
+    db.commit()
+    return deleted
+
+
+def _maybe_purge(db: Session) -> None:
+    """Dọn bảng jobs khi worker rảnh (tối đa mỗi JOB_PURGE_INTERVAL_SECONDS một lần)"""
+    global _last_purge
+    now = time.monotonic()
+    if now - _last_purge < settings.JOB_PURGE_INTERVAL_SECONDS:
+        return
+    _last_purge = now
+    try:
+        purge_finished_jobs(db)
+    except Exception as e:
+        db.rollback()
+        logger.warning(f"Error purging jobs: {e}")
+
+
+class JobQueue:
+    """Worker chạy job trong process, số job chạy đồng thời tối đa `workers`.
+
+    Worker được đánh thức ngay khi có job mới trong process, và kiểm tra database mỗi
+    JOB_POLL_INTERVAL_SECONDS để nhận job từ process khác hoặc còn lại sau khi restart.
+    """
+
+    def __init__(self):
+        self._tasks: List[asyncio.Task] = []
+        self._wakeup: Optional[asyncio.Event] = None
+
+    def start(self, workers: int) -> None:
+        """Tạo worker; việc đưa job bị gián đoạn về queue chạy nền để không làm chậm khởi động"""
+        self._wakeup = asyncio.Event()
+        self._tasks = [asyncio.create_task(self._recover())]
+        self._tasks += [asyncio.create_task(self._worker()) for _ in range(workers)]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def notify(self) -> None:
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    @staticmethod
+    def _requeue_stale() -> int:
+        with SessionLocal() as db:
+            return requeue_stale_jobs(db)
+
+    async def _recover(self) -> None:
+        # Kiểm tra định kỳ: job của process khác đã dừng cũng được chạy lại
+        while True:
+            try:
+                requeued = await asyncio.to_thread(self._requeue_stale)
+            except Exception as e:
+                logger.error(f"Error requeueing stale jobs: {e}")
+            else:
+                if requeued:
+                    logger.info(f"Requeued {requeued} stale jobs")
+                    self.notify()
+            await asyncio.sleep(settings.JOB_STALE_SECONDS)
+
+    async def _worker(self) -> None:
+        while True:
+            # Xóa tín hiệu trước khi lấy job để không bỏ lỡ job thêm vào trong lúc đang chạy
+            self._wakeup.clear()
+            try:
+                ran = await asyncio.to_thread(run_next_job)
+            except Exception as e:
+                logger.error(f"Job worker error: {e}")
+                ran = False
+            if ran:
+                continue
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), settings.JOB_POLL_INTERVAL_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+
+
+job_queue = JobQueue()
@@ -0,0 +1,68 @@
+"""
+So sánh hai báo cáo JSON của benchmarks.runner và đánh dấu các workload bị chậm đi.
+
+Chạy: python -m benchmarks.compare base.json run.json --threshold 0.1
+Trả về exit code 1 nếu có regression vượt ngưỡng.
+"""
+import argparse
+import json
+import sys
+
+# (đường dẫn metric, True nếu giá trị càng cao càng tốt)
+METRICS = [
+    (("throughput_rps",), True),
+    (("latency_ms", "p50"), False),
+    (("latency_ms", "p95"), False),
+    (("latency_ms", "p99"), False),
+    (("peak_rss_mib",), False),
+]
+
+
+def get_metric(result: dict, path: tuple) -> float:
+    for key in path:
+        result = result[key]
+    return result
+
+
+def compare(base: dict, current: dict, threshold: float) -> list:
+    """Trả về danh sách (workload, metric, base, current, thay đổi tương đối, là regression)"""
+    rows = []
+    for name, current_result in current["workloads"].items():
+        base_result = base["workloads"].get(name)
+        if base_result is None:
+            continue
+        for path, higher_is_better in METRICS:
+            old, new = get_metric(base_result, path), get_metric(current_result, path)
+            change = (new - old) / old if old else 0.0
+            worse = -change if higher_is_better else change
+            rows.append((name, ".".join(path), old, new, change, worse > threshold))
+        if current_result["errors"] > base_result["errors"]:
+            rows.append((name, "errors", base_result["errors"], current_result["errors"], 0.0, True))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="So sánh hai báo cáo benchmark")
+    parser.add_argument("base")
+    parser.add_argument("current")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Ngưỡng regression (0.10 = 10%%)")
+    args = parser.parse_args()
+
+    with open(args.base) as f:
+        base = json.load(f)
+    with open(args.current) as f:
+        current = json.load(f)
+
+    rows = compare(base, current, args.threshold)
+    for name, metric, old, new, change, regressed in rows:
+        marker = "REGRESSION" if regressed else ""
+        print(f"{name:<20} {metric:<16} {old:>10} -> {new:>10} ({change:+.1%}) {marker}")
+
+    regressions = [row for row in rows if row[-1]]
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) above {args.threshold:.0%}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
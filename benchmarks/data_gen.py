@@ -0,0 +1,91 @@
+"""
+Sinh dữ liệu todo tổng hợp cho benchmark: số dòng, số lượng tag khác nhau
+và độ lệch của due_date đều cấu hình được, kết quả lặp lại được theo seed.
+"""
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Iterator, Optional
+import random
+import uuid
+
+from app.config import settings
+from app.models.todo import TodoPriority, TodoStatus
+
+TITLE_VERBS = ["Hoàn thành", "Chuẩn bị", "Kiểm tra", "Gửi", "Sửa", "Đọc", "Viết", "Cập nhật", "Họp", "Mua"]
+TITLE_OBJECTS = ["báo cáo", "presentation", "hợp đồng", "tài liệu", "email", "kế hoạch", "slide", "ngân sách", "code review", "hóa đơn"]
+DESCRIPTIONS = [
+    None,
+    "Ghi chú ngắn",
+    "Liên hệ với team để thống nhất nội dung trước khi gửi",
+    "Kiểm tra lại toàn bộ số liệu và gửi cho manager trước hạn chót",
+]
+
+# Phân bố trạng thái/ưu tiên gần với dữ liệu thực tế (đa số pending/medium)
+STATUS_WEIGHTS = {TodoStatus.PENDING: 5, TodoStatus.IN_PROGRESS: 2, TodoStatus.COMPLETED: 3}
+PRIORITY_WEIGHTS = {TodoPriority.LOW: 3, TodoPriority.MEDIUM: 5, TodoPriority.HIGH: 2}
+
+REFERENCE_TIME = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+@dataclass
+class SyntheticConfig:
+    """Tham số sinh dữ liệu"""
+    rows: int = 10_000
+    tag_cardinality: int = 50  # số tag khác nhau (phân bố Zipf)
+    tags_per_todo: int = 3  # số tag tối đa mỗi todo
+    due_date_skew: float = 0.5  # 0: phân bố đều, 1: tập trung quanh thời điểm hiện tại
+    due_date_window_days: int = 90
+    history_days: int = 365  # created_at rải trong khoảng này
+    owners: int = 1  # số owner, dữ liệu chia đều cho các owner
+    seed: int = 42
+
+
+def tag_vocabulary(cardinality: int) -> list:
+    return [f"tag-{i}" for i in range(cardinality)]
+
+
+def owner_ids(count: int) -> list:
+    """Owner đầu tiên là DEFAULT_OWNER_ID để request không có token thấy dữ liệu của owner đó"""
+    return [settings.DEFAULT_OWNER_ID] + [f"owner-{i}" for i in range(1, count)]
+
+
+def generate_todos(
+    config: SyntheticConfig,
+    id_factory: Optional[Callable[[], uuid.UUID]] = None,
+    start: int = 0,
+) -> Iterator[dict]:
+    """Sinh các dòng todo dạng dict (dùng trực tiếp cho Core insert).
+
+    `start` cho phép chia việc sinh dữ liệu thành nhiều phần độc lập (mỗi phần có seed riêng).
+    """
+    rng = random.Random(f"{config.seed}:{start}")
+    if id_factory is None:
+        id_factory = lambda: uuid.UUID(int=rng.getrandbits(128), version=4)
+    tags = tag_vocabulary(config.tag_cardinality)
+    owners = owner_ids(config.owners)
+    tag_weights = [1 / (rank + 1) for rank in range(len(tags))]
+    statuses, status_weights = list(STATUS_WEIGHTS), list(STATUS_WEIGHTS.values())
+    priorities, priority_weights = list(PRIORITY_WEIGHTS), list(PRIORITY_WEIGHTS.values())
+    exponent = 1 + config.due_date_skew * 4
+    window = timedelta(days=config.due_date_window_days)
+
+    for i in range(start, start + config.rows):
+        created_at = REFERENCE_TIME - timedelta(minutes=rng.randrange(config.history_days * 24 * 60))
+        due_date = None
+        if rng.random() < 0.8:
+            # Lũy thừa của số ngẫu nhiên đều: skew càng lớn due_date càng dồn về REFERENCE_TIME
+            offset = window * (rng.random() ** exponent)
+            due_date = REFERENCE_TIME + offset if rng.random() < 0.7 else REFERENCE_TIME - offset
+        tag_count = rng.randint(0, config.tags_per_todo)
+        yield {
+            "id": str(id_factory()),
+            "owner_id": owners[i % len(owners)],
+            "title": f"{rng.choice(TITLE_VERBS)} {rng.choice(TITLE_OBJECTS)} #{i}",
+            "description": rng.choice(DESCRIPTIONS),
+            "status": rng.choices(statuses, status_weights)[0],
+            "priority": rng.choices(priorities, priority_weights)[0],
+            "due_date": due_date,
+            "tags": sorted(set(rng.choices(tags, tag_weights, k=tag_count))),
+            "created_at": created_at,
+            "updated_at": created_at,
+        }
@@ -0,0 +1,103 @@
+"""
+So sánh UUIDv4 (ngẫu nhiên) và UUIDv7 (tăng theo thời gian) làm khóa chính khi bulk insert:
+thông lượng insert, kích thước index khóa chính và tỉ lệ lấp đầy trang B-tree.
+
+Chạy: python -m benchmarks.id_locality --rows 1000000 --output ids.json
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+import uuid
+
+import sqlalchemy as sa
+
+from app.models.ids import uuid7
+from benchmarks.data_gen import SyntheticConfig, generate_todos
+from benchmarks.storage_layout import build_table
+
+PRIMARY_KEY_INDEX = "sqlite_autoindex_todos_1"
+
+
+def load(engine: sa.Engine, table: sa.Table, rows: int, batch_size: int, seed: int, id_factory) -> float:
+    """Bulk insert, mỗi batch một transaction; trả về thời gian insert (giây, không tính sinh dữ liệu)"""
+    elapsed = 0.0
+    batch = []
+
+    def flush():
+        nonlocal elapsed
+        started = time.perf_counter()
+        with engine.begin() as conn:
+            conn.execute(table.insert(), batch)
+        elapsed += time.perf_counter() - started
+
+    for row in generate_todos(SyntheticConfig(rows=rows, seed=seed), id_factory):
+        batch.append(row)
+        if len(batch) >= batch_size:
+            flush()
+            batch = []
+    if batch:
+        flush()
+    return elapsed
+
+
+def index_stats(engine: sa.Engine, name: str) -> dict:
+    """Kích thước và mức lấp đầy trang của một index (SQLite dbstat)"""
+    with engine.connect() as conn:
+        pages, size, unused = conn.exec_driver_sql(
+            "SELECT COUNT(*), SUM(pgsize), SUM(unused) FROM dbstat WHERE name = ?", (name,)
+        ).one()
+    return {"pages": pages, "bytes": size, "fill_ratio": round(1 - unused / size, 3)}
+
+
+def run(rows: int, batch_size: int, cache_kib: int, seed: int, directory: str) -> dict:
+    results = {}
+    for name, id_factory in (("uuid4", uuid.uuid4), ("uuid7", uuid7)):
+        path = os.path.join(directory, f"{name}.db")
+        engine = sa.create_engine(f"sqlite:///{path}")
+
+        # Cache nhỏ để thể hiện chi phí khi trang cần ghi nằm ngoài bộ nhớ
+        @sa.event.listens_for(engine, "connect")
+        def _set_pragmas(dbapi_connection, connection_record):
+            cursor = dbapi_connection.cursor()
+            cursor.execute(f"PRAGMA cache_size=-{cache_kib}")
+            cursor.execute("PRAGMA synchronous=OFF")
+            cursor.close()
+
+        table = build_table(sa.MetaData(), compact=False)
+        table.create(engine)
+        load_seconds = load(engine, table, rows, batch_size, seed, id_factory)
+        results[name] = {
+            "load_seconds": round(load_seconds, 3),
+            "rows_per_second": round(rows / load_seconds),
+            "file_bytes": os.path.getsize(path),
+            "primary_key_index": index_stats(engine, PRIMARY_KEY_INDEX),
+        }
+        engine.dispose()
+        print(f"{name}: {results[name]['rows_per_second']} rows/s, "
+              f"primary key index {results[name]['primary_key_index']}")
+    return {"rows": rows, "batch_size": batch_size, "cache_kib": cache_kib, "results": results}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark UUIDv4 và UUIDv7 khi bulk insert")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--batch-size", type=int, default=10_000)
+    parser.add_argument("--cache-kib", type=int, default=8192, help="PRAGMA cache_size (KiB)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="Ghi kết quả ra file JSON")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        report = run(args.rows, args.batch_size, args.cache_kib, args.seed, directory)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
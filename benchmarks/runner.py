@@ -0,0 +1,192 @@
+"""
+Load test in-process cho todo API: seed dữ liệu tổng hợp vào một SQLite tạm,
+chạy từng workload qua ASGI app (không qua mạng) và ghi báo cáo JSON gồm
+throughput, latency p50/p95/p99 và peak RSS.
+
+Chạy: python -m benchmarks.runner --rows 100000 --requests 500 --concurrency 8 --output run.json
+So sánh: python -m benchmarks.compare base.json run.json
+"""
+from dataclasses import asdict
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import resource
+import subprocess
+import tempfile
+import time
+
+
+def percentile(sorted_values: list, fraction: float) -> float:
+    """Percentile theo nearest-rank trên danh sách đã sắp xếp"""
+    if not sorted_values:
+        return 0.0
+    index = max(0, min(len(sorted_values) - 1, round(fraction * len(sorted_values) + 0.5) - 1))
+    return sorted_values[index]
+
+
+def peak_rss_mib() -> float:
+    # ru_maxrss tính bằng KiB trên Linux, bytes trên macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if platform.system() == "Darwin":
+        peak /= 1024
+    return round(peak / 1024, 1)
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+async def run_workload(client, workload, ctx, requests: int, concurrency: int) -> dict:
+    """Gửi `requests` request với tối đa `concurrency` request đồng thời"""
+    latencies = []
+    errors = 0
+    remaining = requests
+
+    async def worker():
+        nonlocal remaining, errors
+        while remaining > 0:
+            remaining -= 1
+            started = time.perf_counter()
+            response = await workload(client, ctx)
+            latencies.append((time.perf_counter() - started) * 1000)
+            if response.status_code >= 400:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "throughput_rps": round(len(latencies) / elapsed, 1),
+        "latency_ms": {
+            "p50": round(percentile(latencies, 0.50), 3),
+            "p95": round(percentile(latencies, 0.95), 3),
+            "p99": round(percentile(latencies, 0.99), 3),
+            "max": round(latencies[-1], 3) if latencies else 0.0,
+            "mean": round(sum(latencies) / len(latencies), 3) if latencies else 0.0,
+        },
+        "peak_rss_mib": peak_rss_mib(),
+    }
+
+
+async def run_benchmark(args, config) -> dict:
+    import httpx
+    from sqlalchemy import select
+
+    from app.config import settings
+    from app.database import SessionLocal
+    from app.main import app
+    from app.models import Todo
+    from benchmarks.data_gen import tag_vocabulary
+    from benchmarks.seed import bulk_load
+    from benchmarks.workloads import WORKLOADS, WorkloadContext
+
+    selected = args.workloads.split(",") if args.workloads else list(WORKLOADS)
+    unknown = set(selected) - set(WORKLOADS)
+    if unknown:
+        raise SystemExit(f"Unknown workloads: {', '.join(sorted(unknown))}")
+
+    # Seed trước khi app mở kết nối để bulk loader có quyền truy cập độc quyền vào database
+    seed_stats = bulk_load(os.environ["DATABASE_URL"], config, workers=args.workers, progress=False)
+
+    async with app.router.lifespan_context(app):
+        with SessionLocal() as db:
+            todo_ids = db.scalars(
+                select(Todo.id).where(Todo.owner_id == settings.DEFAULT_OWNER_ID).limit(10_000)
+            ).all()
+        ctx = WorkloadContext(
+            rng=random.Random(config.seed),
+            todo_ids=list(todo_ids),
+            tags=tag_vocabulary(config.tag_cardinality),
+        )
+
+        results = {}
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+            for name in selected:
+                workload = WORKLOADS[name]
+                for _ in range(args.warmup):
+                    await workload(client, ctx)
+                results[name] = await run_workload(client, workload, ctx, args.requests, args.concurrency)
+                print(f"{name:<20} {results[name]['throughput_rps']:>9} req/s  "
+                      f"p50 {results[name]['latency_ms']['p50']:>8} ms  "
+                      f"p95 {results[name]['latency_ms']['p95']:>8} ms  "
+                      f"p99 {results[name]['latency_ms']['p99']:>8} ms  "
+                      f"errors {results[name]['errors']}")
+
+    return {
+        "meta": {
+            "git_revision": git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        },
+        "config": {
+            "data": asdict(config),
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "warmup": args.warmup,
+        },
+        "seed_seconds": seed_stats["total_seconds"],
+        "workloads": results,
+        "peak_rss_mib": peak_rss_mib(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test in-process cho todo API")
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--tag-cardinality", type=int, default=50)
+    parser.add_argument("--due-date-skew", type=float, default=0.5)
+    parser.add_argument("--owners", type=int, default=1, help="Số owner (workload chạy với owner mặc định)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--requests", type=int, default=200, help="Số request mỗi workload")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--warmup", type=int, default=5)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Số process sinh dữ liệu seed")
+    parser.add_argument("--workloads", help="Danh sách workload, phân cách bằng dấu phẩy")
+    parser.add_argument("--output", help="Ghi báo cáo ra file JSON")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        # Cấu hình database phải có trước khi import app
+        os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{os.path.join(directory, 'benchmark.db')}"
+        os.environ.setdefault("DEBUG", "False")
+        # Đo năng lực của endpoint, không đo rate limiter (mọi request đến từ cùng một client)
+        os.environ.setdefault("RATE_LIMIT_ENABLED", "False")
+
+        from benchmarks.data_gen import SyntheticConfig
+
+        config = SyntheticConfig(
+            rows=args.rows,
+            tag_cardinality=args.tag_cardinality,
+            due_date_skew=args.due_date_skew,
+            owners=args.owners,
+            seed=args.seed,
+        )
+        report = asyncio.run(run_benchmark(args, config))
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,238 @@
+"""
+Seed nhanh dữ liệu todo tổng hợp cho môi trường đo hiệu năng (hàng triệu dòng).
+
+- Sinh dữ liệu song song trên nhiều process, mỗi process trả về các dòng đã chuyển sang
+  dạng tham số của DBAPI (bind processors chạy trong worker, không chạy ở process chính)
+- Insert trong các transaction lớn: executemany của DBAPI, trên PostgreSQL (psycopg2) dùng
+  execute_values để gửi nhiều dòng trong một câu INSERT
+- SQLite: tắt journal/synchronous và bỏ các index phụ trong lúc nạp, tạo lại index sau cùng
+
+Chạy: python -m benchmarks.seed --database-url sqlite:///./bench.db --rows 1000000 --workers 4
+"""
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import replace
+import argparse
+import os
+import sqlite3
+import sys
+import time
+
+from sqlalchemy import create_engine, inspect
+from sqlalchemy.engine import make_url
+
+from app.config import settings
+from app.database import Base, get_engine_options, get_sync_url
+from app.models import Todo
+from app.models.ids import ID_GENERATORS
+from benchmarks.data_gen import SyntheticConfig, generate_todos
+
+# Số dòng mỗi câu INSERT trên PostgreSQL
+INSERT_PAGE_SIZE = 1000
+
+# Trạng thái của worker process (khởi tạo một lần mỗi process)
+_worker_processors = None
+
+
+def _init_worker(database_url: str) -> None:
+    global _worker_processors
+    dialect = make_url(database_url).get_dialect()()
+    _worker_processors = [
+        (column.name, column.type.dialect_impl(dialect).bind_processor(dialect))
+        for column in Todo.__table__.columns
+    ]
+
+
+def _generate_chunk(config: SyntheticConfig, start: int) -> list:
+    """Sinh một phần dữ liệu, trả về list tuple theo thứ tự cột của bảng"""
+    id_factory = ID_GENERATORS[settings.ID_STRATEGY]
+    rows = []
+    for todo in generate_todos(config, id_factory, start=start):
+        rows.append(tuple(
+            processor(todo[name]) if processor and todo[name] is not None else todo[name]
+            for name, processor in _worker_processors
+        ))
+    return rows
+
+
+def _row_inserter(engine):
+    """Hàm insert một chunk (list tuple theo thứ tự cột) qua cursor DBAPI"""
+    columns = ", ".join(column.name for column in Todo.__table__.columns)
+    if engine.dialect.driver == "psycopg2":
+        # executemany của psycopg2 gửi từng dòng một round-trip; execute_values gộp
+        # INSERT_PAGE_SIZE dòng vào mỗi câu INSERT ... VALUES
+        from psycopg2.extras import execute_values
+
+        sql = f"INSERT INTO {Todo.__tablename__} ({columns}) VALUES %s"
+        return lambda cursor, rows: execute_values(cursor, sql, rows, page_size=INSERT_PAGE_SIZE)
+    placeholder = "?" if engine.dialect.paramstyle == "qmark" else "%s"
+    sql = (
+        f"INSERT INTO {Todo.__tablename__} ({columns}) "
+        f"VALUES ({', '.join([placeholder] * len(Todo.__table__.columns))})"
+    )
+    return lambda cursor, rows: cursor.executemany(sql, rows)
+
+
+def _secondary_indexes(engine) -> list:
+    """Các index phụ của bảng todos đang tồn tại trong database"""
+    existing = {index["name"] for index in inspect(engine).get_indexes(Todo.__tablename__)}
+    return [index for index in Todo.__table__.indexes if index.name in existing]
+
+
+def bulk_load(
+    database_url: str,
+    config: SyntheticConfig,
+    workers: int = os.cpu_count() or 1,
+    chunk_size: int = 50_000,
+    commit_every: int = 250_000,
+    drop_indexes: bool = True,
+    progress: bool = True,
+) -> dict:
+    """Nạp `config.rows` todo vào database, trả về thống kê thời gian/thông lượng"""
+    url = get_sync_url(database_url)
+    engine = create_engine(url, **{**get_engine_options(url), "echo": False})
+    Base.metadata.create_all(bind=engine)
+
+    indexes = _secondary_indexes(engine) if drop_indexes else []
+    for index in indexes:
+        index.drop(engine)
+
+    started = time.perf_counter()
+    try:
+        loaded = _load_rows(engine, url, config, workers, chunk_size, commit_every, progress)
+        load_seconds = time.perf_counter() - started
+    finally:
+        # Tạo lại index đã bỏ kể cả khi nạp lỗi hoặc bị ngắt giữa chừng
+        index_started = time.perf_counter()
+        for index in indexes:
+            index.create(engine)
+    with engine.begin() as conn:
+        conn.exec_driver_sql("ANALYZE")
+    index_seconds = time.perf_counter() - index_started
+    engine.dispose()
+
+    total_seconds = load_seconds + index_seconds
+    if progress:
+        sys.stderr.write("\n")
+    return {
+        "rows": loaded,
+        "load_seconds": round(load_seconds, 3),
+        "index_seconds": round(index_seconds, 3),
+        "total_seconds": round(total_seconds, 3),
+        "rows_per_second": round(loaded / total_seconds) if total_seconds else 0,
+    }
+
+
+def _load_rows(engine, url, config: SyntheticConfig, workers: int, chunk_size: int, commit_every: int,
+               progress: bool) -> int:
+    """Sinh dữ liệu song song và insert qua kết nối DBAPI, trả về số dòng đã nạp"""
+    is_sqlite = engine.dialect.name == "sqlite"
+    insert_rows = _row_inserter(engine)
+    raw = engine.raw_connection()
+    cursor = raw.cursor()
+    if is_sqlite:
+        # Nới lỏng độ bền dữ liệu trong lúc nạp: không fsync, không journal
+        for pragma in ("synchronous=OFF", "temp_store=MEMORY", "cache_size=-262144"):
+            cursor.execute(f"PRAGMA {pragma}")
+        try:
+            cursor.execute("PRAGMA journal_mode=OFF")
+        except sqlite3.OperationalError:
+            # Còn kết nối khác đang mở database (WAL): giữ nguyên journal mode
+            sys.stderr.write("Database is in use, keeping current journal mode\n")
+
+    started = time.perf_counter()
+    loaded = 0
+    uncommitted = 0
+    starts = range(0, config.rows, chunk_size)
+    try:
+        with ProcessPoolExecutor(
+            max_workers=max(1, workers), initializer=_init_worker, initargs=(url.render_as_string(hide_password=False),)
+        ) as executor:
+            # Giới hạn số chunk đang chờ để bộ nhớ không tăng khi insert chậm hơn sinh dữ liệu
+            pending = []
+            for start in starts:
+                chunk_config = replace(config, rows=min(chunk_size, config.rows - start))
+                pending.append(executor.submit(_generate_chunk, chunk_config, start))
+                if len(pending) < workers * 2:
+                    continue
+                loaded, uncommitted = _insert_chunk(
+                    raw, cursor, insert_rows, pending.pop(0).result(), loaded, uncommitted, commit_every
+                )
+                _report(progress, loaded, config.rows, started)
+            for future in pending:
+                loaded, uncommitted = _insert_chunk(
+                    raw, cursor, insert_rows, future.result(), loaded, uncommitted, commit_every
+                )
+                _report(progress, loaded, config.rows, started)
+        raw.commit()
+    finally:
+        if is_sqlite:
+            cursor.execute("PRAGMA synchronous=FULL")
+            cursor.execute(f"PRAGMA journal_mode={settings.SQLITE_JOURNAL_MODE}")
+        cursor.close()
+        raw.close()
+    return loaded
+
+
+def _insert_chunk(raw, cursor, insert_rows, rows, loaded, uncommitted, commit_every):
+    insert_rows(cursor, rows)
+    loaded += len(rows)
+    uncommitted += len(rows)
+    if uncommitted >= commit_every:
+        raw.commit()
+        uncommitted = 0
+    return loaded, uncommitted
+
+
+def _report(progress: bool, loaded: int, total: int, started: float) -> None:
+    if not progress:
+        return
+    elapsed = time.perf_counter() - started
+    rate = loaded / elapsed if elapsed else 0
+    eta = (total - loaded) / rate if rate else 0
+    sys.stderr.write(f"\r{loaded:>10,}/{total:,} rows  {rate:>10,.0f} rows/s  ETA {eta:5.1f}s")
+    sys.stderr.flush()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Seed nhanh dữ liệu todo tổng hợp")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--chunk-size", type=int, default=50_000, help="Số dòng mỗi worker sinh một lần")
+    parser.add_argument("--commit-every", type=int, default=250_000, help="Số dòng mỗi transaction")
+    parser.add_argument("--keep-indexes", action="store_true", help="Không bỏ index phụ trong lúc nạp")
+    parser.add_argument("--tag-cardinality", type=int, default=50)
+    parser.add_argument("--due-date-skew", type=float, default=0.5)
+    parser.add_argument("--owners", type=int, default=1, help="Số owner, dữ liệu chia đều cho các owner")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument(
+        "--database-url", required=True, help="Database đích (thêm dữ liệu vào bảng todos, tạo lại index)"
+    )
+    parser.add_argument(
+        "--allow-app-database", action="store_true", help="Cho phép nạp vào DATABASE_URL của app"
+    )
+    args = parser.parse_args()
+    if get_sync_url(args.database_url) == get_sync_url(settings.DATABASE_URL) and not args.allow_app_database:
+        parser.error("--database-url is the app's DATABASE_URL; pass --allow-app-database to seed it anyway")
+
+    config = SyntheticConfig(
+        rows=args.rows,
+        tag_cardinality=args.tag_cardinality,
+        due_date_skew=args.due_date_skew,
+        owners=args.owners,
+        seed=args.seed,
+    )
+    stats = bulk_load(
+        args.database_url,
+        config,
+        workers=args.workers,
+        chunk_size=args.chunk_size,
+        commit_every=args.commit_every,
+        drop_indexes=not args.keep_indexes,
+    )
+    print(f"Loaded {stats['rows']:,} todos in {stats['total_seconds']}s "
+          f"({stats['load_seconds']}s insert + {stats['index_seconds']}s index), "
+          f"{stats['rows_per_second']:,} rows/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+"""
+Đo thời gian khởi động của app:
+
+- Thời gian import theo package (tổng self time từ python -X importtime), lấy lần chạy nhanh nhất
+- Time-to-first-request: từ lúc chạy uvicorn đến khi /health trả về 200
+- Time-to-ready: đến khi /ready trả về 200 (pool kết nối database đã mở sẵn)
+
+Chạy: python -m benchmarks.startup --repeat 5 --output startup.json
+"""
+import argparse
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.request
+
+from benchmarks.runner import git_revision
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _environment(directory: str) -> dict:
+    env = dict(os.environ)
+    env.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(directory, 'startup.db')}")
+    env.setdefault("DEBUG", "False")
+    env["PYTHONPATH"] = PROJECT_ROOT + os.pathsep + env.get("PYTHONPATH", "")
+    return env
+
+
+def parse_importtime(stderr: str) -> list:
+    """Danh sách (module, self µs, cumulative µs, độ sâu) từ output của -X importtime"""
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        if not self_us.strip().isdigit():
+            continue  # dòng tiêu đề
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        entries.append((name.strip(), int(self_us), int(cumulative_us), depth))
+    return entries
+
+
+def measure_imports(directory: str, module: str, repeat: int, top: int) -> dict:
+    """Thời gian import `module`, lấy lần chạy có tổng thời gian nhỏ nhất"""
+    best = None
+    for _ in range(repeat):
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            cwd=directory, env=_environment(directory), capture_output=True, text=True, check=True,
+        )
+        entries = parse_importtime(result.stderr)
+        total = sum(cumulative for _, _, cumulative, depth in entries if depth == 0)
+        if best is None or total < best[0]:
+            best = (total, entries)
+
+    total, entries = best
+    packages = {}
+    for name, self_us, _, _ in entries:
+        package = name.split(".")[0]
+        packages[package] = packages.get(package, 0) + self_us
+    top_packages = sorted(packages.items(), key=lambda item: item[1], reverse=True)
+    app_modules = sorted(
+        ((name, self_us) for name, self_us, _, _ in entries if name.split(".")[0] in ("app", "benchmarks")),
+        key=lambda item: item[1], reverse=True,
+    )
+    return {
+        "total_ms": round(total / 1000, 1),
+        "packages_ms": {name: round(us / 1000, 1) for name, us in top_packages[:top]},
+        "app_modules_self_ms": {name: round(us / 1000, 1) for name, us in app_modules[:top]},
+    }
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _wait_for(url: str, started: float, timeout: float) -> float:
+    """Số giây từ `started` đến khi `url` trả về 200"""
+    while time.perf_counter() - started < timeout:
+        try:
+            with urllib.request.urlopen(url, timeout=1) as response:
+                if response.status == 200:
+                    return time.perf_counter() - started
+        except (urllib.error.URLError, ConnectionError, OSError):
+            pass
+        time.sleep(0.01)
+    raise TimeoutError(f"{url} not ready after {timeout}s")
+
+
+def measure_server(directory: str, timeout: float) -> dict:
+    """Khởi động uvicorn một lần, đo thời gian đến request đầu tiên và đến khi ready"""
+    port = _free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=directory, env=_environment(directory), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        first_request = _wait_for(f"{base_url}/health", started, timeout)
+        ready = _wait_for(f"{base_url}/ready", started, timeout)
+    finally:
+        process.terminate()
+        process.wait()
+    return {"first_request_s": round(first_request, 3), "ready_s": round(ready, 3)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Đo thời gian khởi động app")
+    parser.add_argument("--repeat", type=int, default=5, help="Số lần đo (lấy lần nhanh nhất)")
+    parser.add_argument("--top", type=int, default=15, help="Số module hiển thị trong breakdown")
+    parser.add_argument("--module", default="app.main")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--output", help="Ghi báo cáo ra file JSON")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        imports = measure_imports(directory, args.module, args.repeat, args.top)
+        runs = [measure_server(directory, args.timeout) for _ in range(args.repeat)]
+
+    report = {
+        "meta": {
+            "git_revision": git_revision(),
+            "python": sys.version.split()[0],
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        },
+        "imports": imports,
+        "server": {
+            "first_request_s": min(run["first_request_s"] for run in runs),
+            "ready_s": min(run["ready_s"] for run in runs),
+            "runs": runs,
+        },
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""
+So sánh layout lưu trữ mặc định và compact (COMPACT_STORAGE) trên SQLite:
+kích thước file database, kích thước từng index và tốc độ range scan.
+
+Chạy: python -m benchmarks.storage_layout --rows 1000000 --output storage.json
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+from datetime import timedelta
+
+import sqlalchemy as sa
+
+from app.config import settings
+from app.models.todo import TodoStatus, todo_column_types
+from app.models.types import TagList
+from benchmarks.data_gen import REFERENCE_TIME, SyntheticConfig, generate_todos
+
+
+def build_table(metadata: sa.MetaData, compact: bool) -> sa.Table:
+    """Bảng todos với index giống model"""
+    column_types = todo_column_types(compact)
+    return sa.Table(
+        "todos",
+        metadata,
+        sa.Column("id", column_types["id"], primary_key=True),
+        sa.Column("owner_id", sa.String(64), nullable=False),
+        sa.Column("title", sa.String(200), nullable=False),
+        sa.Column("description", sa.Text()),
+        sa.Column("status", column_types["status"], nullable=False),
+        sa.Column("priority", column_types["priority"], nullable=False),
+        sa.Column("due_date", sa.DateTime(timezone=True)),
+        sa.Column("tags", TagList()),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Index("ix_todos_owner_created_at", "owner_id", "created_at"),
+        sa.Index("ix_todos_owner_status", "owner_id", "status", "created_at"),
+        sa.Index("ix_todos_owner_priority", "owner_id", "priority", "created_at"),
+        sa.Index("ix_todos_owner_due_date", "owner_id", "due_date"),
+        sa.Index("ix_todos_owner_title", "owner_id", "title"),
+    )
+
+
+def load(engine: sa.Engine, table: sa.Table, rows: int, batch_size: int, seed: int) -> float:
+    """Nạp dữ liệu, trả về thời gian nạp (giây)"""
+    started = time.perf_counter()
+    with engine.begin() as conn:
+        conn.exec_driver_sql("PRAGMA synchronous=OFF")
+        batch = []
+        for row in generate_todos(SyntheticConfig(rows=rows, seed=seed)):
+            batch.append(row)
+            if len(batch) >= batch_size:
+                conn.execute(table.insert(), batch)
+                batch = []
+        if batch:
+            conn.execute(table.insert(), batch)
+    with engine.connect() as conn:
+        conn.exec_driver_sql("ANALYZE")
+    return time.perf_counter() - started
+
+
+def best_of(conn, statement, repeat: int) -> float:
+    """Thời gian nhỏ nhất (ms) qua nhiều lần chạy, bao gồm cả chuyển đổi kiểu kết quả"""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        conn.execute(statement).all()
+        timings.append((time.perf_counter() - started) * 1000)
+    return round(min(timings), 3)
+
+
+def measure(path: str, engine: sa.Engine, table: sa.Table, repeat: int) -> dict:
+    """Đo kích thước file, index và tốc độ range scan"""
+    window_start = REFERENCE_TIME
+    owned = table.c.owner_id == settings.DEFAULT_OWNER_ID
+    with engine.connect() as conn:
+        sizes = dict(conn.exec_driver_sql(
+            "SELECT name, SUM(pgsize) FROM dbstat GROUP BY name"
+        ).all())
+        first_id = conn.execute(sa.select(table.c.id).order_by(table.c.id).limit(1)).scalar()
+        scans = {
+            "due_date_range": best_of(conn, sa.select(table.c.id, table.c.status, table.c.priority).where(
+                owned, table.c.due_date.between(window_start, window_start + timedelta(days=7))
+            ), repeat),
+            "status_count": best_of(conn, sa.select(sa.func.count()).where(
+                owned, table.c.status == TodoStatus.COMPLETED
+            ), repeat),
+            "primary_key_range": best_of(conn, sa.select(table.c.id).where(
+                table.c.id >= first_id
+            ).order_by(table.c.id).limit(10000), repeat),
+        }
+    return {
+        "file_bytes": os.path.getsize(path),
+        "table_bytes": sizes.pop("todos", 0),
+        "index_bytes": {name: size for name, size in sizes.items() if name != "sqlite_schema"},
+        "range_scan_ms": scans,
+    }
+
+
+def run(rows: int, batch_size: int, repeat: int, seed: int, directory: str) -> dict:
+    results = {}
+    for layout, compact in (("default", False), ("compact", True)):
+        path = os.path.join(directory, f"{layout}.db")
+        engine = sa.create_engine(f"sqlite:///{path}")
+        table = build_table(sa.MetaData(), compact)
+        table.create(engine)
+        load_seconds = load(engine, table, rows, batch_size, seed)
+        results[layout] = {"load_seconds": round(load_seconds, 3), **measure(path, engine, table, repeat)}
+        engine.dispose()
+        print(f"{layout}: {results[layout]['file_bytes'] / 1024 / 1024:.1f} MiB, "
+              f"range scans {results[layout]['range_scan_ms']}")
+    return {"rows": rows, "seed": seed, "layouts": results}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark layout lưu trữ todos")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--batch-size", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="Ghi kết quả ra file JSON")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        report = run(args.rows, args.batch_size, args.repeat, args.seed, directory)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
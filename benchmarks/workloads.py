@@ -0,0 +1,140 @@
+"""
+Kịch bản request cho từng endpoint trong app/routers/todo.py.
+
+Mỗi workload là một coroutine nhận (client, ctx) và gửi đúng một request.
+"""
+from dataclasses import dataclass, field
+from datetime import timedelta
+from typing import Awaitable, Callable, Dict, List
+import random
+
+import httpx
+
+from benchmarks.data_gen import REFERENCE_TIME, TITLE_OBJECTS
+
+
+@dataclass
+class WorkloadContext:
+    """Trạng thái dùng chung giữa các workload"""
+    rng: random.Random
+    todo_ids: List[str]  # id có sẵn sau khi seed
+    tags: List[str]
+    created_ids: List[str] = field(default_factory=list)  # id tạo ra trong lúc benchmark
+
+
+Workload = Callable[[httpx.AsyncClient, WorkloadContext], Awaitable[httpx.Response]]
+
+
+def _new_todo(ctx: WorkloadContext) -> dict:
+    return {
+        "title": f"Benchmark {ctx.rng.choice(TITLE_OBJECTS)}",
+        "description": "Tạo bởi benchmark",
+        "priority": ctx.rng.choice(["low", "medium", "high"]),
+        "due_date": (REFERENCE_TIME + timedelta(days=ctx.rng.randint(1, 30))).isoformat(),
+        "tags": ctx.rng.sample(ctx.tags, 2),
+    }
+
+
+async def list_todos(client: httpx.AsyncClient, ctx: WorkloadContext) -> httpx.Response:
+    params = {"page": ctx.rng.randint(1, 5), "size": 100}
+    if ctx.rng.random() < 0.5:
+        params["status"] = ctx.rng.choice(["pending", "in_progress", "completed"])
+    return await client.get("/todos", params=params)
+
+
+async def list_todos_by_tag(client: httpx.AsyncClient, ctx: WorkloadContext) -> httpx.Response:
+    return await client.get("/todos", params={"tag": ctx.rng.choice(ctx.tags[:10]), "size": 20})
+
+
+async def get_todo(client: httpx.AsyncClient, ctx: WorkloadContext) -> httpx.Response:
+    return await client.get(f"/todos/{ctx.rng.choice(ctx.todo_ids)}")
+
+
+async def batch_get_todos(client: httpx.AsyncClient, ctx: WorkloadContext) -> httpx.Response:
+    # Hydrate 50 todo bằng một request thay vì 50 lần GET /todos/{id}
+    ids = ctx.rng.sample(ctx.todo_ids, min(50, len(ctx.todo_ids)))
+    return await client.post("/todos/batch-get", json={"ids": ids})
+
+
+async def search_todos(client: httpx.AsyncClient, ctx: WorkloadContext) -> httpx.Response:
+    return await client.post(
+        "/todos/search",
+        params={"size": 20},
+        json={"query": ctx.rng.choice(TITLE_OBJECTS), "priority": "high"},
+    )
+
+
+async def get_todo_stats(client: httpx.AsyncClient, ctx: WorkloadContext) -> httpx.Response:
+    return await client.get("/todos/stats")
+
+
+async def create_todo(client: httpx.AsyncClient, ctx: WorkloadContext) -> httpx.Response:
+    response = await client.post("/todos", json=_new_todo(ctx))
+    if response.status_code == 201:
+        ctx.created_ids.append(response.json()["id"])
+    return response
+
+
+async def create_todo_retry(client: httpx.AsyncClient, ctx: WorkloadContext) -> httpx.Response:
+    # Client retry với Idempotency-Key: phần lớn request là replay response đã lưu
+    key = f"benchmark-{ctx.rng.randrange(20)}"
+    return await client.post("/todos", json={"title": key}, headers={"Idempotency-Key": key})
+
+
+async def update_todo(client: httpx.AsyncClient, ctx: WorkloadContext) -> httpx.Response:
+    return await client.put(
+        f"/todos/{ctx.rng.choice(ctx.todo_ids)}",
+        json={"priority": ctx.rng.choice(["low", "medium", "high"])},
+    )
+
+
+async def update_todo_status(client: httpx.AsyncClient, ctx: WorkloadContext) -> httpx.Response:
+    return await client.patch(
+        f"/todos/{ctx.rng.choice(ctx.todo_ids)}/status",
+        json={"status": ctx.rng.choice(["pending", "in_progress", "completed"])},
+    )
+
+
+async def create_bulk_todos(client: httpx.AsyncClient, ctx: WorkloadContext) -> httpx.Response:
+    response = await client.post("/todos/bulk", json={"todos": [_new_todo(ctx) for _ in range(50)]})
+    if response.status_code == 201:
+        ctx.created_ids.extend(todo["id"] for todo in response.json())
+    return response
+
+
+async def create_bulk_todos_background(client: httpx.AsyncClient, ctx: WorkloadContext) -> httpx.Response:
+    # Chỉ đo thời gian nhận request (202), job tạo todo chạy nền trong process
+    return await client.post(
+        "/todos/bulk", params={"background": True}, json={"todos": [_new_todo(ctx) for _ in range(50)]}
+    )
+
+
+async def update_bulk_todos(client: httpx.AsyncClient, ctx: WorkloadContext) -> httpx.Response:
+    ids = ctx.rng.sample(ctx.todo_ids, min(20, len(ctx.todo_ids)))
+    return await client.put("/todos/bulk", json={"updates": {todo_id: {"priority": "high"} for todo_id in ids}})
+
+
+async def delete_todo(client: httpx.AsyncClient, ctx: WorkloadContext) -> httpx.Response:
+    # Chỉ xóa các todo do benchmark tạo ra để dữ liệu seed không đổi giữa các lần chạy
+    if not ctx.created_ids:
+        await create_todo(client, ctx)
+    return await client.delete(f"/todos/{ctx.created_ids.pop()}")
+
+
+# Thứ tự chạy: đọc trước, ghi sau, xóa cuối cùng
+WORKLOADS: Dict[str, Workload] = {
+    "list_todos": list_todos,
+    "list_todos_by_tag": list_todos_by_tag,
+    "get_todo": get_todo,
+    "batch_get_todos": batch_get_todos,
+    "search_todos": search_todos,
+    "get_todo_stats": get_todo_stats,
+    "create_todo": create_todo,
+    "create_todo_retry": create_todo_retry,
+    "update_todo": update_todo,
+    "update_todo_status": update_todo_status,
+    "create_bulk_todos": create_bulk_todos,
+    "create_bulk_todos_background": create_bulk_todos_background,
+    "update_bulk_todos": update_bulk_todos,
+    "delete_todo": delete_todo,
+}
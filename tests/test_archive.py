@@ -0,0 +1,70 @@
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import update
+
+from app.models import Todo, TodoArchive
+from app.services.archive import archive_completed_todos, get_archive_totals
+from app.services.jobs import run_next_job
+
+
+def _complete(client, title, tags=(), priority="medium", headers=None):
+    todo = client.post("/todos", json={"title": title, "tags": list(tags), "priority": priority}, headers=headers).json()
+    client.patch(f"/todos/{todo['id']}/status", json={"status": "completed"}, headers=headers)
+    return todo
+
+
+def _age(db, days):
+    db.execute(update(Todo).values(updated_at=datetime.now(timezone.utc) - timedelta(days=days)))
+    db.commit()
+
+
+def test_archive_moves_old_completed_todos(client, db):
+    old = _complete(client, "cũ", tags=["x"], priority="high")
+    client.post("/todos", json={"title": "chưa xong", "tags": ["x"]})
+    _age(db, 60)
+    recent = _complete(client, "mới")
+
+    assert archive_completed_todos(db, older_than_days=30, batch_size=1) == 1
+    assert db.query(TodoArchive).count() == 1
+    assert old["id"] not in {todo.id for todo in db.query(Todo)}
+    assert client.get(f"/todos/{recent['id']}").status_code == 200
+
+    # Todo đã lưu trữ vẫn đọc được và được tính vào thống kê
+    assert client.get(f"/todos/{old['id']}").json()["title"] == "cũ"
+    assert client.get("/todos", params={"include_archived": True}).json()["total"] == 3
+    assert client.get("/todos").json()["total"] == 2
+    stats = client.get("/todos/stats").json()
+    assert stats["total_todos"] == 3
+    assert stats["completed_todos"] == 2
+    assert stats["todos_by_tag"] == {"x": 2}
+    assert stats["todos_by_priority"] == {"high": 1, "medium": 2}
+    assert client.get("/todos/stats", params={"include_archived": False}).json()["total_todos"] == 2
+
+
+def test_archive_totals_accumulate(client, db):
+    _complete(client, "a", tags=["x", "y"])
+    _age(db, 60)
+    archive_completed_todos(db, older_than_days=30)
+    _complete(client, "b", tags=["x"])
+    _age(db, 60)
+    archive_completed_todos(db, older_than_days=30)
+
+    totals = get_archive_totals(db, "default")
+    assert totals.total == 2
+    assert totals.by_tag == {"x": 2, "y": 1}
+
+
+def test_archive_endpoint_runs_as_job(client, db, auth_headers):
+    alice = auth_headers("alice")
+    _complete(client, "của alice", headers=alice)
+    _complete(client, "của default")
+    _age(db, 60)
+
+    response = client.post("/todos/archive", params={"older_than_days": 30}, headers=alice)
+    assert response.status_code == 202
+    assert run_next_job()
+
+    job = client.get(response.headers["location"], headers=alice).json()
+    assert job["status"] == "succeeded"
+    assert job["result"] == {"archived": 1}
+    assert db.query(TodoArchive).one().owner_id == "alice"
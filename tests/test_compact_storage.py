@@ -0,0 +1,34 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+from app.config import settings
+from app.models.todo import detect_compact_storage
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_database_uses_compact_layout(db_engine):
+    if not settings.COMPACT_STORAGE:
+        pytest.skip("chỉ chạy với COMPACT_STORAGE=True")
+    with db_engine.connect() as connection:
+        assert detect_compact_storage(connection) is True
+
+
+def test_api_with_compact_storage():
+    if settings.COMPACT_STORAGE:
+        pytest.skip("process hiện tại đã dùng COMPACT_STORAGE=True")
+    # Kiểu cột của model được chọn lúc import: chạy test API trong process riêng
+    result = subprocess.run(
+        [
+            sys.executable, "-m", "pytest", "-q", "-p", "no:cacheprovider",
+            "tests/test_todos.py", "tests/test_tenancy.py", "tests/test_archive.py", __file__,
+        ],
+        cwd=ROOT,
+        env={**os.environ, "COMPACT_STORAGE": "True"},
+        capture_output=True,
+        text=True,
+    )
+    assert result.returncode == 0, result.stdout + result.stderr
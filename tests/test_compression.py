@@ -0,0 +1,107 @@
+import os
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse, Response, StreamingResponse
+from fastapi.testclient import TestClient
+
+from app.metrics import metrics
+from app.middleware import compression
+from app.middleware.compression import CompressionMiddleware, parse_accept_encoding
+
+BODY = "todo " * 1000
+
+
+@pytest.fixture
+def client() -> TestClient:
+    app = FastAPI()
+
+    @app.get("/text")
+    async def text(size: int = len(BODY)):
+        return PlainTextResponse(BODY[:size])
+
+    @app.get("/random")
+    async def random():
+        # Dữ liệu ngẫu nhiên: nén không nhỏ đi
+        return Response(os.urandom(4096), media_type="application/json")
+
+    @app.get("/image")
+    async def image():
+        return Response(BODY.encode(), media_type="image/png")
+
+    @app.get("/stream")
+    async def stream():
+        return StreamingResponse(iter([BODY, BODY]), media_type="text/plain")
+
+    app.add_middleware(CompressionMiddleware, minimum_size=100)
+    return TestClient(app)
+
+
+def _skipped(reason: str) -> float:
+    return metrics.snapshot()["counters"].get(f"compression.skipped.{reason}", 0)
+
+
+def test_parse_accept_encoding():
+    assert parse_accept_encoding("gzip, br;q=0.5, *;q=0, deflate;q=x") == {
+        "gzip": 1.0, "br": 0.5, "*": 0.0, "deflate": 0.0
+    }
+
+
+@pytest.mark.parametrize("accept_encoding, expected", [
+    ("gzip, br", "br"),
+    ("gzip, br;q=0.5", "gzip"),
+    ("br;q=0, gzip", "gzip"),
+    ("*", "br"),
+    ("*;q=0", None),
+    ("identity", None),
+    ("", None),
+])
+def test_choose_encoding(accept_encoding, expected, monkeypatch):
+    # Chỉ kiểm tra lựa chọn: không cần cài brotli
+    monkeypatch.setattr(compression, "brotli", compression.brotli or object())
+    assert CompressionMiddleware(None).choose_encoding(accept_encoding) == expected
+
+
+def test_choose_encoding_without_brotli(monkeypatch):
+    monkeypatch.setattr(compression, "brotli", None)
+    assert CompressionMiddleware(None).choose_encoding("br, gzip;q=0.1") == "gzip"
+
+
+@pytest.mark.parametrize("encoding", ["gzip", "br"])
+def test_compresses_negotiated_encoding(client, encoding):
+    if encoding == "br" and compression.brotli is None:
+        pytest.skip("brotli chưa được cài")
+    response = client.get("/text", headers={"Accept-Encoding": encoding})
+    assert response.headers["content-encoding"] == encoding
+    assert int(response.headers["content-length"]) < len(BODY)
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert response.text == BODY
+
+
+def test_no_accepted_encoding_is_sent_as_is(client):
+    response = client.get("/text", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in response.headers
+    assert response.text == BODY
+
+
+def test_small_response_is_not_compressed(client):
+    before = _skipped("small")
+    response = client.get("/text", params={"size": 99}, headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in response.headers
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert _skipped("small") == before + 1
+
+
+def test_response_without_gain_is_sent_as_is(client):
+    before = _skipped("no_gain")
+    response = client.get("/random", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in response.headers
+    assert len(response.content) == 4096
+    assert _skipped("no_gain") == before + 1
+
+
+def test_binary_and_streaming_responses_are_not_compressed(client):
+    assert "content-encoding" not in client.get("/image", headers={"Accept-Encoding": "gzip"}).headers
+    response = client.get("/stream", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in response.headers
+    assert response.text == BODY * 2
@@ -0,0 +1,98 @@
+import asyncio
+import threading
+
+import pytest
+
+from app import main
+from app.config import settings
+from app.database import probe_engine
+from app.services import diagnostics
+
+
+@pytest.fixture
+def deep(db_engine, monkeypatch):
+    """/health/deep trên database test, không có read replica"""
+    monkeypatch.setattr(diagnostics, "engine", db_engine)
+    monkeypatch.setattr(diagnostics, "read_engines", [])
+    monkeypatch.setattr(diagnostics.loop_monitor, "max_lag", 0.0)
+
+
+def test_deep_health_ok(client, deep, db):
+    response = client.get("/health/deep")
+    assert response.status_code == 200
+    body = response.json()
+    assert (body["status"], body["reasons"]) == ("ok", [])
+    assert body["queues"]["jobs"] == {"queued": 0, "running": 0}
+    assert body["database"]["replicas"] == []
+
+
+def test_deep_health_reports_saturation_reasons(client, deep, monkeypatch):
+    monkeypatch.setattr(settings, "DIAGNOSTICS_MAX_DB_LATENCY_SECONDS", -1.0)
+    monkeypatch.setattr(diagnostics.loop_monitor, "max_lag", settings.DIAGNOSTICS_MAX_LOOP_LAG_SECONDS + 1)
+    monkeypatch.setattr(main.expensive_limiter, "in_flight", main.expensive_limiter.limit)
+
+    response = client.get("/health/deep")
+    assert response.status_code == 503
+    body = response.json()
+    assert body["status"] == "saturated"
+    reasons = body["reasons"]
+    assert len(reasons) == 3
+    assert reasons[0].startswith("primary: latency ")
+    assert reasons[1].startswith("event loop lag ")
+    assert reasons[2] == "expensive routes at concurrency limit"
+
+
+def test_deep_health_reports_probe_error(client, deep, monkeypatch):
+    def failing_probe(db_engine, include_jobs):
+        raise RuntimeError("connection refused")
+
+    monkeypatch.setattr(diagnostics, "_probe", failing_probe)
+    response = client.get("/health/deep")
+    assert response.status_code == 503
+    assert response.json()["reasons"] == ["primary: connection refused"]
+    assert response.json()["queues"]["jobs"] is None
+
+
+def test_exhausted_pool_is_a_reason():
+    check = {"latency_seconds": 0.0, "pool": {"size": 5, "checked_out": 15, "overflow": 10, "max_overflow": 10}}
+    assert diagnostics._saturation_reasons("replica 0", check) == ["replica 0: connection pool exhausted"]
+    check["pool"]["checked_out"] = 14
+    assert diagnostics._saturation_reasons("replica 0", check) == []
+
+
+def test_probe_uses_own_short_timeout_pool(db_engine):
+    probe = probe_engine(db_engine, 0.25)
+    try:
+        assert probe is not db_engine
+        assert probe_engine(db_engine, 0.25) is probe
+        assert (probe.pool.size(), probe.pool.timeout()) == (1, 0.25)
+        assert "error" not in asyncio.run(diagnostics._check_engine(db_engine, include_jobs=True))
+    finally:
+        probe.dispose()
+
+
+def test_timed_out_probe_is_reused(db_engine, monkeypatch):
+    release = threading.Event()
+    calls = []
+
+    def slow_probe(db_engine, include_jobs):
+        calls.append(db_engine)
+        release.wait(5)
+        return {"latency_seconds": 0.0}
+
+    monkeypatch.setattr(diagnostics, "_probe", slow_probe)
+    monkeypatch.setattr(settings, "DIAGNOSTICS_DB_TIMEOUT_SECONDS", 0.05)
+
+    async def run():
+        # Probe đầu bị timeout vẫn chạy: lần gọi sau chờ chính probe đó, không mở thêm thread
+        timed_out = [await diagnostics._check_engine(db_engine) for _ in range(3)]
+        assert len(calls) == 1
+        release.set()
+        while db_engine in diagnostics._in_flight:
+            await asyncio.sleep(0.01)
+        return timed_out, await diagnostics._check_engine(db_engine)
+
+    timed_out, after = asyncio.run(run())
+    assert all(check["error"] == "timed out after 0.05s" for check in timed_out)
+    assert "error" not in after
+    assert len(calls) == 2
@@ -0,0 +1,78 @@
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import text
+
+from app.config import settings
+from app.models import IdempotencyKey, Todo
+from app.services.idempotency import REPLAYED_HEADER, get_stored_response, request_fingerprint
+
+
+def test_retry_returns_stored_response(client, db):
+    headers = {"Idempotency-Key": "create-1"}
+    first = client.post("/todos", json={"title": "một lần"}, headers=headers)
+    retry = client.post("/todos", json={"title": "một lần"}, headers=headers)
+
+    assert first.status_code == retry.status_code == 201
+    assert retry.json() == first.json()
+    assert retry.headers[REPLAYED_HEADER] == "true"
+    assert REPLAYED_HEADER not in first.headers
+    assert db.query(Todo).count() == 1
+
+
+def test_key_reused_for_different_request(client):
+    headers = {"Idempotency-Key": "create-2"}
+    client.post("/todos", json={"title": "a"}, headers=headers)
+    assert client.post("/todos", json={"title": "b"}, headers=headers).status_code == 422
+
+
+def test_keys_are_scoped_per_owner(client, auth_headers, db):
+    for owner in ("alice", "bob"):
+        headers = {**auth_headers(owner), "Idempotency-Key": "same"}
+        assert client.post("/todos", json={"title": "x"}, headers=headers).status_code == 201
+    assert db.query(Todo).count() == 2
+    assert db.query(IdempotencyKey).count() == 2
+
+
+def test_bulk_create_retry(client, db):
+    headers = {"Idempotency-Key": "bulk-1"}
+    payload = {"todos": [{"title": "a"}, {"title": "b"}]}
+    first = client.post("/todos/bulk", json=payload, headers=headers)
+    retry = client.post("/todos/bulk", json=payload, headers=headers)
+
+    assert retry.json() == first.json()
+    assert db.query(Todo).count() == 2
+    # Cùng key nhưng tạo nền là request khác
+    assert client.post("/todos/bulk?background=true", json=payload, headers=headers).status_code == 422
+
+
+def test_background_retry_keeps_job_location(client, db):
+    headers = {"Idempotency-Key": "bulk-background"}
+    payload = {"todos": [{"title": "nền"}]}
+    first = client.post("/todos/bulk?background=true", json=payload, headers=headers)
+    retry = client.post("/todos/bulk?background=true", json=payload, headers=headers)
+
+    assert first.status_code == retry.status_code == 202
+    assert retry.headers[REPLAYED_HEADER] == "true"
+    assert retry.headers["location"] == first.headers["location"] == f"/jobs/{first.json()['id']}"
+    assert client.get(retry.headers["location"]).status_code == 200
+
+
+def test_expiry_does_not_depend_on_session_timezone(db, monkeypatch):
+    monkeypatch.setattr(settings, "IDEMPOTENCY_TTL_SECONDS", 3600)
+    if db.get_bind().dialect.name == "postgresql":
+        # timestamptz được trả về theo timezone của session
+        db.execute(text("SET TIME ZONE 'Asia/Tokyo'"))
+    fingerprint = request_fingerprint("POST", "/todos", {"title": "x"})
+    for key, age in (("fresh", timedelta(minutes=5)), ("expired", timedelta(hours=2))):
+        db.add(IdempotencyKey(
+            owner_id="default",
+            key=key,
+            request_fingerprint=fingerprint,
+            status_code=201,
+            response_body={},
+            created_at=datetime.now(timezone.utc) - age,
+        ))
+    db.commit()
+
+    assert get_stored_response(db, "default", "fresh", fingerprint) is not None
+    assert get_stored_response(db, "default", "expired", fingerprint) is None
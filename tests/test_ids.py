@@ -0,0 +1,48 @@
+import uuid
+
+from app.models import ids
+
+
+def _fields(value: uuid.UUID) -> tuple:
+    """(timestamp ms, bộ đếm 12 bit) của UUIDv7"""
+    return value.int >> 80, (value.int >> 64) & 0xFFF
+
+
+def test_uuid7_layout():
+    value = ids.uuid7()
+    assert value.version == 7
+    assert value.variant == uuid.RFC_4122
+
+
+def test_uuid7_is_monotonic_within_a_millisecond(monkeypatch):
+    now_ms = 1_700_000_000_000
+    monkeypatch.setattr(ids, "_last_ms", 0)
+    monkeypatch.setattr(ids.time, "time_ns", lambda: now_ms * 1_000_000 + 123)
+
+    values = [ids.uuid7() for _ in range(1000)]
+    assert values == sorted(values)
+    assert len(set(values)) == len(values)
+    assert {_fields(value)[0] for value in values} == {now_ms}
+
+
+def test_uuid7_counter_overflow_borrows_next_millisecond(monkeypatch):
+    now_ms = 1_700_000_000_000
+    monkeypatch.setattr(ids, "_last_ms", now_ms)
+    monkeypatch.setattr(ids, "_counter", ids._COUNTER_MAX)
+    monkeypatch.setattr(ids.time, "time_ns", lambda: now_ms * 1_000_000)
+
+    first, second = ids.uuid7(), ids.uuid7()
+    assert _fields(first) == (now_ms + 1, 0)
+    assert _fields(second) == (now_ms + 1, 1)
+    assert first < second
+
+    # Đồng hồ bắt kịp millisecond đã mượn: vẫn tăng dần
+    monkeypatch.setattr(ids.time, "time_ns", lambda: (now_ms + 1) * 1_000_000)
+    assert ids.uuid7() > second
+
+
+def test_new_id_follows_id_strategy(monkeypatch):
+    monkeypatch.setattr(ids.settings, "ID_STRATEGY", "uuid4")
+    assert uuid.UUID(ids.new_id()).version == 4
+    monkeypatch.setattr(ids.settings, "ID_STRATEGY", "uuid7")
+    assert uuid.UUID(ids.new_id()).version == 7
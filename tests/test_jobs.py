@@ -0,0 +1,119 @@
+from datetime import datetime, timedelta, timezone
+import time
+
+import pytest
+
+from app.config import settings
+from app.database import SessionLocal
+from app.models import Job, JobStatus, Todo
+from app.services.jobs import JOB_HANDLERS, add_job, requeue_stale_jobs, run_next_job
+
+
+def test_background_bulk_create(client, db):
+    payload = {"todos": [{"title": f"nền {i}"} for i in range(3)]}
+    response = client.post("/todos/bulk", params={"background": True}, json=payload)
+    assert response.status_code == 202
+    assert response.json()["status"] == "queued"
+
+    assert run_next_job()
+    assert not run_next_job()
+
+    job = client.get(response.headers["location"]).json()
+    assert job["status"] == "succeeded"
+    assert job["result"]["created"] == 3
+    assert sorted(job["result"]["ids"]) == sorted(todo.id for todo in db.query(Todo))
+
+
+def test_failed_job_records_error(client, db):
+    job = add_job(db, "default", "bulk_create_todos", {"todos": []})
+    db.commit()
+
+    assert run_next_job()
+    db.refresh(job)
+    assert job.status == JobStatus.FAILED
+    assert job.error
+    assert job.finished_at is not None
+
+
+def test_jobs_are_scoped_per_owner(client, auth_headers):
+    response = client.post("/todos/archive", headers=auth_headers("alice"))
+    location = response.headers["location"]
+    assert client.get(location, headers=auth_headers("alice")).status_code == 200
+    assert client.get(location, headers=auth_headers("bob")).status_code == 404
+
+
+def test_unknown_job_kind(db):
+    with pytest.raises(ValueError):
+        add_job(db, "default", "nope")
+
+
+def _interrupt(db, job, seconds_ago: int) -> None:
+    """Giả lập process dừng khi job đang chạy: running, heartbeat cuối cách đây `seconds_ago` giây"""
+    job.status = JobStatus.RUNNING
+    job.attempts += 1
+    job.started_at = job.heartbeat_at = datetime.now(timezone.utc) - timedelta(seconds=seconds_ago)
+    db.commit()
+
+
+def test_requeue_only_jobs_without_recent_heartbeat(db):
+    stale = add_job(db, "default", "archive")
+    alive = add_job(db, "default", "archive")
+    db.commit()
+    _interrupt(db, stale, settings.JOB_STALE_SECONDS + 60)
+    # Job chạy lâu nhưng vẫn có heartbeat không bị chạy lại
+    _interrupt(db, alive, 1)
+
+    assert requeue_stale_jobs(db) == 1
+    db.refresh(stale)
+    db.refresh(alive)
+    assert stale.status == JobStatus.QUEUED
+    assert alive.status == JobStatus.RUNNING
+
+
+def test_job_fails_after_max_attempts(db, monkeypatch):
+    monkeypatch.setattr(settings, "JOB_MAX_ATTEMPTS", 2)
+    job = add_job(db, "default", "archive")
+    db.commit()
+    for _ in range(2):
+        _interrupt(db, job, settings.JOB_STALE_SECONDS + 60)
+        requeue_stale_jobs(db)
+        db.refresh(job)
+
+    assert job.status == JobStatus.FAILED
+    assert job.attempts == 2
+    assert not run_next_job()
+
+
+def test_bulk_create_rerun_does_not_duplicate(client, db):
+    response = client.post("/todos/bulk", params={"background": True}, json={"todos": [{"title": "a"}, {"title": "b"}]})
+    assert run_next_job()
+    job = db.get(Job, response.json()["id"])
+    ids = job.payload["ids"]
+
+    # Process dừng sau khi đã commit các todo nhưng trước khi ghi kết quả job: chạy lại dùng cùng id
+    _interrupt(db, job, settings.JOB_STALE_SECONDS + 60)
+    assert requeue_stale_jobs(db) == 1
+    assert run_next_job()
+
+    db.refresh(job)
+    assert job.status == JobStatus.SUCCEEDED
+    assert job.result["ids"] == ids
+    assert sorted(todo.id for todo in db.query(Todo)) == sorted(ids)
+
+
+def test_heartbeat_is_updated_while_job_runs(db, monkeypatch):
+    monkeypatch.setattr(settings, "JOB_HEARTBEAT_SECONDS", 0.01)
+    heartbeats = []
+
+    def slow_job(session, job):
+        claimed_at = job.heartbeat_at
+        time.sleep(0.2)
+        with SessionLocal() as other:
+            heartbeats.extend([claimed_at, other.get(Job, job.id).heartbeat_at])
+        return {}
+
+    monkeypatch.setitem(JOB_HANDLERS, "archive", slow_job)
+    add_job(db, "default", "archive")
+    db.commit()
+    assert run_next_job()
+    assert heartbeats[1] > heartbeats[0]
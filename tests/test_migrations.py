@@ -0,0 +1,128 @@
+import io
+import os
+
+import pytest
+from alembic import command
+from alembic.autogenerate import compare_metadata
+from alembic.config import Config
+from alembic.migration import MigrationContext
+from sqlalchemy import inspect, text
+from sqlalchemy.exc import IntegrityError
+
+from app.config import settings
+from app.database import Base
+from app.models.todo import check_storage_layout, detect_compact_storage
+from tests.conftest import BACKENDS, backend_url, create_test_engine
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def alembic_config(**attributes) -> Config:
+    # Không đọc alembic.ini để không cấu hình lại logging của test
+    cfg = Config(output_buffer=attributes.pop("output_buffer", None))
+    cfg.set_main_option("script_location", os.path.join(ROOT, "alembic"))
+    cfg.attributes.update(attributes)
+    return cfg
+
+
+@pytest.fixture(params=BACKENDS)
+def empty_engine(request, tmp_path):
+    test_engine = create_test_engine(backend_url(request.param, str(tmp_path)))
+    Base.metadata.drop_all(test_engine)
+    try:
+        yield test_engine
+    finally:
+        with test_engine.begin() as connection:
+            command.downgrade(alembic_config(connection=connection), "base")
+            connection.execute(text("DROP TABLE IF EXISTS alembic_version"))
+        test_engine.dispose()
+
+
+def _schema_diff(connection) -> list:
+    diff = compare_metadata(MigrationContext.configure(connection), Base.metadata)
+    if connection.dialect.name == "sqlite":
+        # GIN index chỉ tồn tại trên PostgreSQL
+        diff = [d for d in diff if not (d[0] == "add_index" and d[1].name == "ix_todos_tags_gin")]
+    return diff
+
+
+def test_upgrade_matches_models_and_downgrade_is_reversible(empty_engine):
+    with empty_engine.begin() as connection:
+        cfg = alembic_config(connection=connection)
+        command.upgrade(cfg, "head")
+        assert _schema_diff(connection) == []
+
+        command.downgrade(cfg, "base")
+        assert set(inspect(connection).get_table_names()) <= {"alembic_version"}
+
+        # Downgrade phải dọn hết (kể cả enum type trên PostgreSQL) để upgrade lại được
+        command.upgrade(cfg, "head")
+        assert _schema_diff(connection) == []
+
+
+def test_compact_storage_layout_is_read_from_database(empty_engine, monkeypatch):
+    todo_id = "0192a3b4-c5d6-7e8f-9012-3456789abcde"
+    with empty_engine.begin() as connection:
+        cfg = alembic_config(connection=connection)
+        command.upgrade(cfg, "3f1c9d2e7a41")
+        connection.execute(text(
+            "INSERT INTO todos (id, title, status, priority) VALUES (:id, 'cũ', 'COMPLETED', 'HIGH')"
+        ), {"id": todo_id})
+
+        # Layout chỉ được chọn khi chạy revision chuyển đổi
+        monkeypatch.setattr(settings, "COMPACT_STORAGE", True)
+        command.upgrade(cfg, "8b2e4f6a1c93")
+        monkeypatch.setattr(settings, "COMPACT_STORAGE", False)
+        command.upgrade(cfg, "head")
+        assert detect_compact_storage(connection) is True
+        assert connection.execute(text("SELECT status, priority FROM todos")).one() == (2, 2)
+        assert connection.execute(text("SELECT status FROM todos_archive")).all() == []
+        archive_status = next(c for c in inspect(connection).get_columns("todos_archive") if c["name"] == "status")
+        assert str(archive_status["type"]) == "SMALLINT"
+
+        # App với cấu hình khác layout của database không được khởi động
+        with pytest.raises(RuntimeError, match="compact storage layout"):
+            check_storage_layout(connection)
+        monkeypatch.setattr(settings, "COMPACT_STORAGE", True)
+        check_storage_layout(connection)
+
+        # Downgrade chuyển ngược theo layout của database, không theo cấu hình
+        monkeypatch.setattr(settings, "COMPACT_STORAGE", False)
+        command.downgrade(cfg, "3f1c9d2e7a41")
+        assert detect_compact_storage(connection) is False
+        row = connection.execute(text("SELECT id, status, priority FROM todos")).one()
+        assert (str(row.id), row.status, row.priority) == (todo_id, "COMPLETED", "HIGH")
+
+
+def test_existing_todos_are_backfilled_to_default_owner(empty_engine, monkeypatch):
+    # Dữ liệu mẫu dùng layout mặc định
+    monkeypatch.setattr(settings, "COMPACT_STORAGE", False)
+    with empty_engine.begin() as connection:
+        cfg = alembic_config(connection=connection)
+        command.upgrade(cfg, "c47d1e9b5f28")
+        connection.execute(text(
+            "INSERT INTO todos (id, title, status, priority) "
+            "VALUES ('0192a3b4-c5d6-7e8f-9012-3456789abcde', 'cũ', 'PENDING', 'LOW')"
+        ))
+        command.upgrade(cfg, "head")
+        assert connection.execute(text("SELECT owner_id FROM todos")).scalar_one() == settings.DEFAULT_OWNER_ID
+
+        # Giá trị mặc định chỉ dùng cho backfill: insert mới không có owner phải lỗi
+        owner = next(c for c in inspect(connection).get_columns("todos") if c["name"] == "owner_id")
+        assert owner["default"] is None
+        with pytest.raises(IntegrityError), connection.begin_nested():
+            connection.execute(text(
+                "INSERT INTO todos (id, title, status, priority) "
+                "VALUES ('0192a3b4-c5d6-7e8f-9012-3456789abcdf', 'mới', 'PENDING', 'LOW')"
+            ))
+
+
+def test_offline_sql_does_not_recreate_enum_types(monkeypatch):
+    # Chuyển sang layout compact cần chép dữ liệu, không sinh được SQL offline
+    monkeypatch.setattr(settings, "COMPACT_STORAGE", False)
+    buffer = io.StringIO()
+    cfg = alembic_config(url="postgresql://localhost/offline", output_buffer=buffer)
+    command.upgrade(cfg, "base:head", sql=True)
+    sql = buffer.getvalue()
+    assert sql.count("CREATE TYPE todostatus") == 1
+    assert sql.count("CREATE TYPE todopriority") == 1
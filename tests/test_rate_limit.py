@@ -0,0 +1,120 @@
+import asyncio
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.middleware.rate_limit import ConcurrencyLimiter, InMemoryRateLimitStore, RateLimitMiddleware
+
+
+def make_client(**options) -> TestClient:
+    """App nhỏ chỉ có middleware rate limit, không cần database"""
+    app = FastAPI()
+
+    @app.get("/items/{item_id}")
+    async def get_item(item_id: int):
+        return {"id": item_id}
+
+    @app.get("/report")
+    async def report():
+        return {}
+
+    @app.get("/health")
+    async def health():
+        return {}
+
+    options = {"store": InMemoryRateLimitStore(), "rate": 0.001, "burst": 2, **options}
+    app.add_middleware(RateLimitMiddleware, **options)
+    return TestClient(app)
+
+
+def test_burst_then_429_with_retry_after():
+    client = make_client()
+    assert client.get("/items/1").status_code == 200
+    # Bucket theo route template: id khác nhau vẫn dùng chung bucket
+    assert client.get("/items/2").status_code == 200
+    response = client.get("/items/3")
+    assert response.status_code == 429
+    assert int(response.headers["retry-after"]) >= 1
+    # Route khác có bucket riêng
+    assert client.get("/report").status_code == 200
+
+
+def test_exempt_and_unknown_paths_are_not_limited():
+    client = make_client(burst=1, exempt_paths=["/health"])
+    for _ in range(3):
+        assert client.get("/health").status_code == 200
+        assert client.get("/missing").status_code == 404
+
+
+def test_expensive_routes_use_own_limits():
+    client = make_client(burst=5, expensive_routes=["GET /report"], expensive_burst=1)
+    assert client.get("/report").status_code == 200
+    assert client.get("/report").status_code == 429
+    assert client.get("/items/1").status_code == 200
+
+
+def test_expensive_routes_shed_load_when_busy():
+    limiter = ConcurrencyLimiter(1)
+    client = make_client(expensive_routes=["GET /report"], concurrency_limiter=limiter, busy_retry_after=3)
+    assert limiter.try_acquire()
+    response = client.get("/report")
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "3"
+    limiter.release()
+    assert client.get("/report").status_code == 200
+    assert limiter.in_flight == 0
+
+
+def test_store_refills_over_time(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("app.middleware.rate_limit.time.monotonic", lambda: now[0])
+    store = InMemoryRateLimitStore()
+
+    assert asyncio.run(store.consume("k", rate=1, burst=1)) == 0
+    assert asyncio.run(store.consume("k", rate=1, burst=1)) == 1
+    now[0] += 1
+    assert asyncio.run(store.consume("k", rate=1, burst=1)) == 0
+
+
+def test_client_header_does_not_bypass_limit():
+    client = make_client(burst=1)
+    assert client.get("/items/1", headers={"X-Client-Id": "a"}).status_code == 200
+    assert client.get("/items/1", headers={"X-Client-Id": "b"}).status_code == 429
+
+
+def test_authenticated_owners_have_separate_buckets(auth_headers):
+    client = make_client(burst=1)
+    assert client.get("/items/1", headers=auth_headers("alice")).status_code == 200
+    assert client.get("/items/1", headers=auth_headers("alice")).status_code == 429
+    assert client.get("/items/1", headers=auth_headers("bob")).status_code == 200
+    # Token không hợp lệ tính theo địa chỉ peer
+    assert client.get("/items/1", headers={"Authorization": "Bearer x"}).status_code == 200
+    assert client.get("/items/1", headers={"Authorization": "Bearer y"}).status_code == 429
+
+
+def test_store_is_capped_and_evicts_least_recently_used(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("app.middleware.rate_limit.time.monotonic", lambda: now[0])
+    store = InMemoryRateLimitStore(max_keys=2)
+
+    asyncio.run(store.consume("a", rate=1, burst=1))
+    asyncio.run(store.consume("b", rate=1, burst=1))
+    assert asyncio.run(store.consume("a", rate=1, burst=1)) > 0
+    # Đủ max_keys: "b" là bucket ít dùng nhất bị bỏ dù chưa đầy lại
+    asyncio.run(store.consume("c", rate=1, burst=1))
+    assert len(store) == 2
+    assert asyncio.run(store.consume("b", rate=1, burst=1)) == 0
+    assert list(store._buckets) == ["c", "b"]
+
+
+def test_store_drops_buckets_by_their_own_refill_time(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("app.middleware.rate_limit.time.monotonic", lambda: now[0])
+    store = InMemoryRateLimitStore()
+
+    asyncio.run(store.consume("slow", rate=0.01, burst=1))
+    asyncio.run(store.consume("fast", rate=100, burst=1))
+    now[0] += 1
+    # "fast" đã đầy lại, "slow" cần 100 giây: không bị bỏ theo rate của request hiện tại
+    asyncio.run(store.consume("other", rate=100, burst=1))
+    assert asyncio.run(store.consume("slow", rate=0.01, burst=1)) > 0
@@ -0,0 +1,63 @@
+import time
+
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.responses import JSONResponse
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import sessionmaker
+
+import app.database as database
+from app.config import settings
+from app.database import get_read_db, get_write_db
+from app.middleware import ReadYourWritesMiddleware
+
+
+def make_worker() -> TestClient:
+    """App nhỏ đóng vai một worker: endpoint ghi và endpoint đọc báo session đang dùng"""
+    app = FastAPI()
+
+    @app.post("/write")
+    async def write(db=Depends(get_write_db)):
+        # Trả về Response trực tiếp như các endpoint có Idempotency-Key
+        return JSONResponse(status_code=201, content={})
+
+    @app.get("/read")
+    async def read(db=Depends(get_read_db)):
+        return {"replica": db.info.get("replica", False)}
+
+    app.add_middleware(ReadYourWritesMiddleware, cookie_name=settings.READ_YOUR_WRITES_COOKIE, max_age=5)
+    return TestClient(app)
+
+
+@pytest.fixture(autouse=True)
+def replica(monkeypatch):
+    replica_session = sessionmaker(info={"replica": True})
+    monkeypatch.setattr(database, "ReadSessionLocals", [replica_session])
+    monkeypatch.setattr(database, "_read_session_cycle", iter(lambda: replica_session, None))
+
+
+def test_reads_after_write_use_primary_on_any_worker():
+    first, second = make_worker(), make_worker()
+    assert first.get("/read").json() == {"replica": True}
+
+    response = first.post("/write")
+    assert settings.READ_YOUR_WRITES_COOKIE in response.cookies
+
+    assert first.get("/read").json() == {"replica": False}
+    # Worker khác nhận cookie của client: cũng đọc từ database chính
+    second.cookies = first.cookies
+    assert second.get("/read").json() == {"replica": False}
+
+
+def test_expired_or_invalid_cookie_reads_from_replica():
+    worker = make_worker()
+    worker.cookies.set(settings.READ_YOUR_WRITES_COOKIE, str(time.time() - settings.READ_YOUR_WRITES_SECONDS - 1))
+    assert worker.get("/read").json() == {"replica": True}
+
+    worker.cookies.set(settings.READ_YOUR_WRITES_COOKIE, "nope")
+    assert worker.get("/read").json() == {"replica": True}
+
+    # Thời điểm trong tương lai không giữ client ở database chính mãi
+    for future in (str(time.time() + 3600), "inf"):
+        worker.cookies.set(settings.READ_YOUR_WRITES_COOKIE, future)
+        assert worker.get("/read").json() == {"replica": True}
@@ -0,0 +1,63 @@
+import asyncio
+
+import pytest
+from sqlalchemy import create_engine
+
+import app.database as database
+from app.config import settings
+from app.models.todo import check_storage_layout
+
+
+@pytest.fixture
+def startup_state(monkeypatch):
+    """Trạng thái /ready của process, khôi phục sau mỗi test"""
+    monkeypatch.setattr(database, "_pools_warmed", False)
+    monkeypatch.setattr(database, "_startup_error", None)
+    monkeypatch.setattr(database, "_WARM_UP_RETRY_SECONDS", 0.01)
+    monkeypatch.setattr(database, "read_engines", [])
+
+
+def test_ready_after_pools_are_warmed(client, db_engine, monkeypatch, startup_state):
+    monkeypatch.setattr(database, "engine", db_engine)
+    response = client.get("/ready")
+    assert response.status_code == 503
+    assert response.json() == {"status": "starting"}
+
+    asyncio.run(database.warm_up_pools(check=check_storage_layout))
+
+    response = client.get("/ready")
+    assert response.status_code == 200
+    assert response.json()["status"] == "ready"
+    assert response.json()["pools"]["replicas"] == []
+    assert database.pool_status(db_engine)["checked_in"] == settings.DB_POOL_WARM_CONNECTIONS
+    # /health (liveness) không phụ thuộc database
+    assert client.get("/health").status_code == 200
+
+
+def test_layout_mismatch_fails_readiness(client, db_engine, monkeypatch, startup_state):
+    monkeypatch.setattr(database, "engine", db_engine)
+    monkeypatch.setattr(settings, "COMPACT_STORAGE", not settings.COMPACT_STORAGE)
+
+    asyncio.run(database.warm_up_pools(check=check_storage_layout))
+
+    response = client.get("/ready")
+    assert response.status_code == 503
+    assert response.json()["status"] == "error"
+    assert "storage layout" in response.json()["detail"]
+
+
+def test_unreachable_database_does_not_block_startup(monkeypatch, startup_state, tmp_path):
+    # Thư mục không tồn tại: mọi lần kết nối đều lỗi
+    monkeypatch.setattr(database, "engine", create_engine(f"sqlite:///{tmp_path}/missing/app.db"))
+    checked = []
+
+    async def run():
+        task = asyncio.create_task(database.warm_up_pools(check=checked.append))
+        await asyncio.sleep(0.1)
+        assert not task.done()
+        task.cancel()
+
+    asyncio.run(run())
+    assert not database.pools_warmed()
+    assert database.startup_error() is None
+    assert checked == []
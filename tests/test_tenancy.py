@@ -0,0 +1,62 @@
+from datetime import datetime, timedelta, timezone
+
+import jwt
+import pytest
+
+from app.config import DEFAULT_SECRET_KEY, settings
+from app.services.auth import create_access_token
+
+
+def test_owners_only_see_their_todos(client, auth_headers):
+    alice, bob = auth_headers("alice"), auth_headers("bob")
+    todo = client.post("/todos", json={"title": "của alice", "tags": ["a"]}, headers=alice).json()
+    client.post("/todos", json={"title": "của bob"}, headers=bob)
+
+    assert client.get("/todos", headers=alice).json()["total"] == 1
+    assert client.get("/todos/stats", headers=bob).json()["todos_by_tag"] == {}
+    assert client.get(f"/todos/{todo['id']}", headers=bob).status_code == 404
+    assert client.delete(f"/todos/{todo['id']}", headers=bob).status_code == 404
+    assert client.post("/todos/batch-get", json={"ids": [todo["id"]]}, headers=bob).json()["missing_ids"] == [
+        todo["id"]
+    ]
+
+
+def test_requests_without_token_use_default_owner(client, auth_headers):
+    client.post("/todos", json={"title": "mặc định"})
+    assert client.get("/todos", headers=auth_headers(settings.DEFAULT_OWNER_ID)).json()["total"] == 1
+    assert client.get("/todos", headers=auth_headers("someone")).json()["total"] == 0
+
+
+def test_invalid_and_expired_tokens_are_rejected(client):
+    assert client.get("/todos", headers={"Authorization": "Bearer not-a-jwt"}).status_code == 401
+    expired = create_access_token("alice", expires_delta=timedelta(seconds=-1))
+    response = client.get("/todos", headers={"Authorization": f"Bearer {expired}"})
+    assert response.status_code == 401
+    assert response.headers["www-authenticate"] == "Bearer"
+
+
+def test_auth_required(client, monkeypatch):
+    monkeypatch.setattr(settings, "AUTH_REQUIRED", True)
+    assert client.get("/todos").status_code == 401
+
+
+def test_tokens_must_have_expiry_and_owner(client):
+    expires = datetime.now(timezone.utc) + timedelta(minutes=5)
+    for payload in ({settings.OWNER_CLAIM: "alice"}, {"exp": expires}, {"other": "alice", "exp": expires}):
+        token = jwt.encode(payload, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+        assert client.get("/todos", headers={"Authorization": f"Bearer {token}"}).status_code == 401
+
+
+def test_tokens_rejected_while_secret_key_is_placeholder(client, monkeypatch):
+    monkeypatch.setattr(settings, "SECRET_KEY", DEFAULT_SECRET_KEY)
+    # Token hợp lệ ký bằng key mẫu công khai: ai cũng tạo được cho owner bất kỳ
+    token = jwt.encode(
+        {settings.OWNER_CLAIM: "alice", "exp": datetime.now(timezone.utc) + timedelta(minutes=5)},
+        DEFAULT_SECRET_KEY,
+        algorithm=settings.ALGORITHM
+    )
+    response = client.get("/todos", headers={"Authorization": f"Bearer {token}"})
+    assert response.status_code == 401
+    assert response.json()["detail"] == "Token authentication is not configured"
+    with pytest.raises(RuntimeError):
+        create_access_token("alice")
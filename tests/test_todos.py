@@ -0,0 +1,111 @@
+from datetime import datetime, timedelta, timezone
+
+
+def test_create_get_update_delete(client):
+    response = client.post("/todos", json={"title": "Viết test", "priority": "high", "tags": ["work"]})
+    assert response.status_code == 201
+    todo = response.json()
+    assert todo["status"] == "pending"
+    assert todo["tags"] == ["work"]
+
+    assert client.get(f"/todos/{todo['id']}").json()["title"] == "Viết test"
+
+    response = client.put(f"/todos/{todo['id']}", json={"title": "Viết thêm test"})
+    assert response.status_code == 200
+    assert response.json()["title"] == "Viết thêm test"
+
+    response = client.patch(f"/todos/{todo['id']}/status", json={"status": "completed"})
+    assert response.json()["status"] == "completed"
+
+    assert client.delete(f"/todos/{todo['id']}").status_code == 204
+    assert client.get(f"/todos/{todo['id']}").status_code == 404
+
+
+def test_invalid_ids_are_not_found(client):
+    # Trên PostgreSQL id là kiểu UUID: id không hợp lệ phải trả về 404 thay vì lỗi database
+    assert client.get("/todos/nope").status_code == 404
+    assert client.put("/todos/nope", json={"title": "x"}).status_code == 404
+    assert client.patch("/todos/nope/status", json={"status": "completed"}).status_code == 404
+    assert client.delete("/todos/nope").status_code == 404
+    assert client.put("/todos/bulk", json={"updates": {"nope": {"title": "x"}}}).status_code == 404
+
+
+def test_list_filters_and_pagination(client):
+    due = datetime.now(timezone.utc) + timedelta(days=3)
+    for i in range(5):
+        client.post("/todos", json={
+            "title": f"Task {i}",
+            "priority": "high" if i % 2 else "low",
+            "tags": ["even"] if i % 2 == 0 else ["odd"],
+            "due_date": due.isoformat() if i == 0 else None,
+        })
+
+    page = client.get("/todos", params={"size": 2, "page": 2}).json()
+    assert page["total"] == 5
+    assert page["total_pages"] == 3
+    assert len(page["todos"]) == 2
+
+    assert client.get("/todos", params={"priority": "high"}).json()["total"] == 2
+    assert client.get("/todos", params={"tag": "even"}).json()["total"] == 3
+    assert client.get("/todos", params={"search": "Task 3"}).json()["total"] == 1
+    before = (due + timedelta(days=1)).isoformat()
+    assert client.get("/todos", params={"due_before": before}).json()["total"] == 1
+
+
+def test_search(client):
+    client.post("/todos", json={"title": "Mua sữa", "priority": "high", "tags": ["home", "shop"]})
+    client.post("/todos", json={"title": "Mua bánh", "priority": "low", "tags": ["shop"]})
+
+    response = client.post("/todos/search", json={"query": "Mua", "tags": ["home", "shop"]})
+    assert [todo["title"] for todo in response.json()["todos"]] == ["Mua sữa"]
+
+
+def test_stats(client):
+    client.post("/todos", json={"title": "a", "priority": "high", "tags": ["x", "y"]})
+    todo = client.post("/todos", json={"title": "b", "tags": ["x"]}).json()
+    client.patch(f"/todos/{todo['id']}/status", json={"status": "completed"})
+
+    stats = client.get("/todos/stats").json()
+    assert stats["total_todos"] == 2
+    assert stats["completed_todos"] == 1
+    assert stats["completion_rate"] == 50
+    assert stats["todos_by_tag"] == {"x": 2, "y": 1}
+    assert stats["todos_by_priority"] == {"high": 1, "medium": 1}
+
+
+def test_bulk_create_and_update(client):
+    response = client.post("/todos/bulk", json={"todos": [{"title": f"Bulk {i}"} for i in range(3)]})
+    assert response.status_code == 201
+    ids = [todo["id"] for todo in response.json()]
+
+    response = client.put("/todos/bulk", json={"updates": {todo_id: {"priority": "high"} for todo_id in ids}})
+    assert response.status_code == 200
+    assert {todo["priority"] for todo in response.json()} == {"high"}
+
+
+def test_batch_get_preserves_order_and_reports_missing(client):
+    ids = [client.post("/todos", json={"title": f"t{i}"}).json()["id"] for i in range(3)]
+
+    response = client.post("/todos/batch-get", json={"ids": [ids[2], "nope", ids[0], ids[2]]})
+    assert response.status_code == 200
+    body = response.json()
+    assert [todo["id"] for todo in body["todos"]] == [ids[2], ids[0]]
+    assert body["missing_ids"] == ["nope"]
+
+
+def test_batch_get_limit(client):
+    assert client.post("/todos/batch-get", json={"ids": []}).status_code == 422
+    assert client.post("/todos/batch-get", json={"ids": ["x"] * 101}).status_code == 422
+
+
+def test_batch_ids_are_matched_case_insensitively(client):
+    ids = [client.post("/todos", json={"title": f"t{i}"}).json()["id"] for i in range(2)]
+
+    response = client.post("/todos/batch-get", json={"ids": [ids[1].upper(), ids[0], ids[1], "nope"]})
+    body = response.json()
+    assert [todo["id"] for todo in body["todos"]] == [ids[1], ids[0]]
+    assert body["missing_ids"] == ["nope"]
+
+    response = client.put("/todos/bulk", json={"updates": {todo_id.upper(): {"priority": "high"} for todo_id in ids}})
+    assert response.status_code == 200
+    assert sorted(todo["id"] for todo in response.json()) == sorted(ids)